@@ -0,0 +1,196 @@
+import math
+import os
+import random
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from simulation import TournamentResult, make_game_seeds, play_game, play_games
+
+# Confidence sequences: intervals that hold for every number of games at once, so a rule may
+# look after each game and stop at the first separation without inflating its error rate.
+# Normal-mixture bound (Robbins; Howard et al. 2021): for i.i.d. steps in an interval of width 2,
+# |sum of (step - mean)| < sqrt((n + rho) * log((n + rho) / (rho * error^2))) for all n, with
+# probability 1 - error. rho sets where the bound is tightest; 20 suits tens to hundreds of games.
+DEFAULT_RHO = 20.0
+
+def get_confidence_radius(games, error, rho=DEFAULT_RHO):
+    # Radius around the mean of `games` steps in [-1, 1]
+    return math.sqrt((games + rho) * math.log((games + rho) / (rho * error * error))) / games
+
+def confidence_sequence(wins, games, confidence=0.95, rho=DEFAULT_RHO):
+    # Winrate interval; a win is a step in [0, 1], half the width of the radius above
+    if games == 0:
+        return 0.0, 1.0
+    p = wins / games
+    radius = get_confidence_radius(games, 1 - confidence, rho) / 2
+    return max(0.0, p - radius), min(1.0, p + radius)
+
+# Stopping rules: each one looks at the tournament so far and returns a decision or None.
+# Games without a winner (stalemate or turn cap) count as losses for every strategy.
+class BestStrategyRule:
+    # Stops when the leader beats every other strategy: per game, the step is +1 when the
+    # leader wins, -1 when the other one wins, 0 otherwise, and the confidence sequence of its
+    # mean must lie above zero. A wrong "best" needs one of the k-1 comparisons against the true
+    # best to fail, so each comparison gets (1 - confidence) / (k - 1) of the error.
+    def __init__(self, strategies, confidence=0.95, rho=DEFAULT_RHO):
+        self.strategies = sorted(set(strategies))
+        if len(self.strategies) < 2:
+            raise ValueError("need at least two strategies to pick the best one")
+        self.confidence = confidence
+        self.rho = rho
+
+    def get_error(self):
+        return (1 - self.confidence) / (len(self.strategies) - 1)
+
+    def check(self, result, games):
+        leader = max(self.strategies, key=lambda strat: result.wins[strat])
+        radius = get_confidence_radius(games, self.get_error(), self.rho)
+        if all((result.wins[leader] - result.wins[strat]) / games > radius for strat in self.strategies if strat != leader):
+            return {'best': leader}
+        return None
+
+class PairRule:
+    # SPRT on head-to-head wins of two strategies: among games won by either, does
+    # `first` win with probability 0.5 + margin (first is better) or 0.5 - margin (second is)?
+    # Wald's error bounds already hold with a look after every game.
+    def __init__(self, first, second, confidence=0.95, margin=0.05):
+        if first == second:
+            raise ValueError("a pair needs two different strategies")
+        self.strategies = [first, second]
+        self.first = first
+        self.second = second
+        self.confidence = confidence
+        self.margin = margin
+        error = 1 - confidence
+        self.upper = math.log((1 - error) / error)
+        self.lower = math.log(error / (1 - error))
+        self.step = math.log((0.5 + margin) / (0.5 - margin))
+
+    def get_log_likelihood_ratio(self, result):
+        return (result.wins[self.first] - result.wins[self.second]) * self.step
+
+    def check(self, result, games):
+        ratio = self.get_log_likelihood_ratio(result)
+        if ratio >= self.upper:
+            return {'better': self.first, 'worse': self.second}
+        if ratio <= self.lower:
+            return {'better': self.second, 'worse': self.first}
+        return None
+
+class GameFeed:
+    # Yields game records in seed order. With several workers one pool serves the whole run:
+    # chunks of chunk_size games are submitted ahead until about batch_size games are in flight,
+    # and each finished chunk is topped up with the next one. close() cancels the queued chunks;
+    # `played` counts the games that were or are being played, dropped ones included.
+    def __init__(self, game_seeds, strategies, workers=1, batch_size=1, chunk_size=1, mcts_options=None):
+        self.game_seeds = game_seeds
+        self.strategies = strategies
+        self.workers = workers
+        self.chunk_size = max(1, chunk_size)
+        self.window = max(1, batch_size // self.chunk_size)
+        self.mcts_options = mcts_options
+        self.played = 0
+        self.executor = None
+        self.pending = deque()
+
+    def __iter__(self):
+        if self.workers <= 1:
+            for game_seed in self.game_seeds:
+                self.played += 1
+                yield play_game(game_seed, self.strategies, self.mcts_options)
+            return
+        self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        play = partial(play_games, strategies=self.strategies, mcts_options=self.mcts_options)
+        chunks = (self.game_seeds[start:start + self.chunk_size] for start in range(0, len(self.game_seeds), self.chunk_size))
+        for chunk in chunks:
+            self.submit(play, chunk)
+            if len(self.pending) >= self.window:
+                yield from self.pending.popleft()[1].result()
+        while self.pending:
+            yield from self.pending.popleft()[1].result()
+
+    def submit(self, play, chunk):
+        self.played += len(chunk)
+        self.pending.append((len(chunk), self.executor.submit(play, chunk)))
+
+    def close(self):
+        if self.executor is None:
+            return
+        for size, future in self.pending:
+            if future.cancel():
+                self.played -= size
+        self.pending.clear()
+        self.executor.shutdown(wait=True)
+        self.executor = None
+
+def run_adaptive_trials(max_games=1000, strategies=(1, 2, 3, 4), rule=None, seed=None, workers=1,
+                        min_games=30, batch_size=None, chunk_size=None, mcts_options=None, output=None, output_format=None):
+    # Plays games in seed order until `rule` answers its question or max_games is reached.
+    # The rule is checked after every game, so the serial and the parallel runner stop
+    # after the same game. The parallel runner keeps one pool for the whole run with about
+    # batch_size games in flight, takes records in seed order as they arrive, and cancels
+    # the queued games once the rule stops; games already running are played and dropped.
+    from results import ResultsWriter
+    strategies = list(strategies)
+    if rule is None:
+        rule = BestStrategyRule(strategies)
+    missing = [strat for strat in rule.strategies if strat not in strategies]
+    if missing:
+        raise ValueError(f"strategies {missing} are not in the lineup {strategies}")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(64)
+    game_seeds = make_game_seeds(max_games, seed)
+    result = TournamentResult(strategies, seed, game_seeds, keep_games=output is None)
+    if chunk_size is None:
+        chunk_size = 1
+    if batch_size is None:
+        batch_size = 4 * workers * chunk_size
+
+    writer = ResultsWriter(output, output_format) if output is not None else None
+    games = 0
+    decision = None
+    feed = GameFeed(game_seeds, strategies, workers, batch_size, chunk_size, mcts_options)
+    try:
+        for record in feed:
+            result.add_game(games, record['winner'], record['outcome'], record['turns_saved'])
+            if writer is not None:
+                writer.write(record)
+            games += 1
+            if games >= min_games:
+                decision = rule.check(result, games)
+                if decision is not None:
+                    break
+    finally:
+        feed.close()
+        if writer is not None:
+            writer.close()
+    result.num_games = games
+    result.game_seeds = game_seeds[:games]
+    return {
+        'result': result,
+        'decision': decision,
+        'games': games,
+        'games_played': feed.played,
+        'max_games': max_games,
+        'games_saved': max_games - games,
+        'intervals': {strat: confidence_sequence(result.wins[strat], games, getattr(rule, 'confidence', 0.95))
+                      for strat in sorted(set(strategies))},
+    }
+
+def print_report(report):
+    result = report['result']
+    print(f"Games: {report['games']} of at most {report['max_games']}, saved {report['games_saved']}"
+          f" (played {report['games_played']})")
+    for strat, (low, high) in report['intervals'].items():
+        print(f"Strategy {strat}: {result.wins[strat]} wins, winrate {low:.1%} - {high:.1%}")
+    if report['decision'] is None:
+        print("No decision before the game cap")
+    else:
+        print("Decision:", report['decision'])
+
+if __name__ == "__main__":
+    report = run_adaptive_trials(1000, (1, 2, 3, 4), seed=1)
+    print_report(report)
@@ -0,0 +1,459 @@
+import numpy as np
+
+from diceville_game import (Game, GameRules, MainBase, BuildingsObjectStorage, BuildingType, SurfaceType, Floor,
+                            Sawmill, Bathyscaphe, DevastationSphere, Mines, ExploitationSphere,
+                            ProfitMakingSphere, TransformationSphere)
+from simulation import (TournamentResult, make_game_seeds, STALEMATE_ROUNDS, OUTCOME_WIN, OUTCOME_STALEMATE, OUTCOME_TIMEOUT,
+                        INCOME_THRESHOLD)
+
+# Batch engine: N games stored as NumPy arrays and played in lockstep.
+# It mirrors the rules as the simulation bots play them: every roll is a single die,
+# so the two-dice branches (Casino multiplier, sphere bonuses, ControlCenter and
+# TransformationSphere activations) never fire and are not modelled.
+
+HAND_SIZE = 6
+FIRST_ENTRY_INCOME = 2
+MAX_DICE_VALUE = 12
+SURFACES = [s for s in SurfaceType if s != SurfaceType.ANY]
+
+# Card tables, taken from the card classes so both engines share one source of truth.
+# Prices and the other rule constants come from the GameRules given to each BatchEngine.
+_storage = BuildingsObjectStorage()
+CARD_COUNT = _storage.get_buildings_count() + 1  # index 0 is "no card"
+_cards = [None] + [_storage.get_building(i) for i in range(1, CARD_COUNT)]
+_probe_game = Game(num_players=1, seed=0)
+
+CARD_TYPE = np.array([BuildingType.MAIN_BASE.value] + [c.type.value for c in _cards[1:]], dtype=np.int8)
+CARD_SURFACE = np.array([0] + [c.requirement_tile_surface.value for c in _cards[1:]], dtype=np.int64)
+CARD_INCOME = np.array([0] + [c.get_income_in_case_of_invoke(_probe_game) for c in _cards[1:]], dtype=np.int64)
+CARD_FIRES = np.zeros((MAX_DICE_VALUE + 1, CARD_COUNT), dtype=bool)  # [dice value, card id]
+for _card in _cards[1:]:
+    CARD_FIRES[max(_card.min_dice_value, 0):min(_card.max_dice_value, MAX_DICE_VALUE) + 1, _card.id] = True
+
+SAWMILL_ID = Sawmill().id
+BATHYSCAPHE_ID = Bathyscaphe().id
+DEVASTATION_SPHERE_ID = DevastationSphere().id
+MINES_ID = Mines().id
+SPHERE_IDS = [ExploitationSphere().id, ProfitMakingSphere().id, DevastationSphere().id, TransformationSphere().id]
+# Terrain and board dependent incomes are computed per roll
+CARD_INCOME[[SAWMILL_ID, BATHYSCAPHE_ID, DEVASTATION_SPHERE_ID]] = 0
+
+IS_RED = CARD_TYPE == BuildingType.RED.value
+IS_GREEN = CARD_TYPE == BuildingType.GREEN.value
+IS_BLUE = CARD_TYPE == BuildingType.BLUE.value
+# Cards that can move money on a single die; terrain based incomes count whatever the terrain
+CARD_PAYS = CARD_FIRES[1:7].any(0) & (CARD_INCOME > 0)
+CARD_PAYS[[SAWMILL_ID, BATHYSCAPHE_ID, DEVASTATION_SPHERE_ID]] = CARD_FIRES[1:7, [SAWMILL_ID, BATHYSCAPHE_ID, DEVASTATION_SPHERE_ID]].any(0)
+
+# Game pays red buildings one at a time: each firing first pays the enabled mines, then moves
+# the building's income from the roller to its owner, clamping the roller at zero. Owners and
+# mines are always paid in full; only the roller's balance depends on the order. With a single
+# die every red card that can fire pays the same amount c, and n steps of m -> max(m + a - c, 0)
+# end at max(m + n * (a - c), 0), so one clamp per roll gives the same balance. A card change
+# that breaks this needs per-building resolution, hence the check.
+SINGLE_DIE_RED_INCOMES = set(CARD_INCOME[CARD_FIRES[1:7].any(0) & IS_RED & (CARD_INCOME > 0)].tolist())
+if len(SINGLE_DIE_RED_INCOMES) > 1 or CARD_FIRES[1:7, DEVASTATION_SPHERE_ID].any():
+    raise RuntimeError("single-die red payments differ, the per-roll clamp no longer matches Game")
+
+# What one building contributes at each dice value: [card id, dice value, column].
+# Players keep the sum of these over their buildings, so a roll is a single gather.
+RED_FIRINGS, RED_INCOME, GREEN_INCOME, BLUE_INCOME, OWN_INVOKED, OWN_POSITIVE, OTHERS_POSITIVE = range(7)
+CARD_DICE_TABLE = np.stack([
+    CARD_FIRES & IS_RED,
+    (CARD_FIRES & IS_RED) * CARD_INCOME,
+    (CARD_FIRES & IS_GREEN) * CARD_INCOME,
+    (CARD_FIRES & IS_BLUE) * CARD_INCOME,
+    CARD_FIRES & ~IS_RED,
+    (CARD_FIRES & ~IS_RED) * (CARD_INCOME > 0),
+    (CARD_FIRES & ~IS_GREEN) * (CARD_INCOME > 0),
+], axis=-1).astype(np.int32).transpose(1, 0, 2)
+
+FLOOR_COUNT = len(MainBase().floors)
+COMMUNICATION_FLOOR = Floor.COMMUNICATION_FLOOR.value
+STRATEGIC_FLOOR = Floor.STRATEGIC_FLOOR.value
+NEVER = np.iinfo(np.int32).max
+
+# BatchEngine
+class BatchEngine:
+    def __init__(self, num_games, strategies=(1, 2, 3, 4), seed=None, map_size=None, rules=None, bot_options=None):
+        self.num_games = num_games
+        self.strategies = list(strategies)
+        self.num_players = len(self.strategies)
+        self.rules = rules if rules is not None else GameRules()
+        # bot_options as in simulation.create_game; only income_threshold is modelled
+        bot_options = dict(bot_options or {})
+        self.income_threshold = bot_options.pop('income_threshold', INCOME_THRESHOLD)
+        if bot_options:
+            raise ValueError(f"bot options not supported by the batch engine: {sorted(bot_options)}")
+        # an explicit map_size wins over rules.map_size, as in Game
+        self.map_size = tuple(map_size) if map_size is not None else self.rules.map_size
+        self.card_prices = np.array(self.rules.card_prices, dtype=np.int64)
+        self.card_prices[0] = 0  # "no card"
+        self.floor_prices = np.array(self.rules.floor_prices, dtype=np.int64)
+        self.rng = np.random.default_rng(seed)
+        self.winners = np.full(num_games, -1, dtype=np.int64)  # seat index of the winner
+        self.turn_counts = np.zeros(num_games, dtype=np.int64)
+        self.stalled = np.zeros(num_games, dtype=bool)
+        self.init_neighbours()
+        self.init_state()
+
+    def init_neighbours(self):
+        width, height = self.map_size
+        self.cell_count = width * height
+        self.neighbours = np.full((self.cell_count, 4), -1, dtype=np.int64)
+        for x in range(width):
+            for y in range(height):
+                for d, (nx, ny) in enumerate(((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1))):
+                    if 0 <= nx < width and 0 <= ny < height:
+                        self.neighbours[x * height + y, d] = nx * height + ny
+
+    def init_state(self):
+        n, p, c = self.num_games, self.num_players, self.cell_count
+        width, height = self.map_size
+        self.game_ids = np.arange(n)
+        self.finished = np.zeros(n, dtype=bool)
+        self.money = np.full((n, p), self.rules.starting_money, dtype=np.int64)
+        self.floors = np.zeros((n, p, FLOOR_COUNT), dtype=bool)
+        self.floors[:, :, Floor.FIRST_ENTRY_FLOOR.value] = True
+        self.counts = np.zeros((n, p, CARD_COUNT), dtype=np.int64)
+        self.dice_sums = np.zeros((n, MAX_DICE_VALUE + 1, p, CARD_DICE_TABLE.shape[-1]), dtype=np.int32)
+        self.floor_counts = np.ones((n, p), dtype=np.int64)
+        self.free_counts = np.zeros((n, p), dtype=np.int64)
+        self.hands = np.zeros((n, p, HAND_SIZE), dtype=np.int64)
+        self.replace_count = np.ones((n, p), dtype=np.int64)
+        self.owned_surface = np.zeros((n, p, len(SURFACES)), dtype=np.int64)
+        self.free_surface = np.zeros((n, p, len(SURFACES)), dtype=np.int64)
+        self.enabled_mines = np.zeros((n, p), dtype=np.int64)
+        self.own_turns = np.zeros((n, p), dtype=np.int64)
+        self.communication_start = np.full((n, p), NEVER, dtype=np.int64)
+        self.strategic_start = np.full((n, p), NEVER, dtype=np.int64)
+        self.queue_head_turn = np.zeros((n, p), dtype=np.int64)
+        self.queue_head_offset = np.zeros((n, p), dtype=np.int64)
+        self.surface = self.rng.integers(0, len(SURFACES), size=(n, c))
+        self.owner = np.full((n, c), -1, dtype=np.int64)
+        self.frontier = np.zeros((n, p, c), dtype=bool)
+
+        corners = [(0, 0), (0, height - 3), (width - 3, 0), (width - 3, height - 3)]
+        for seat in range(p):
+            px, py = corners[seat]
+            cells = [(px + dx) * height + (py + dy) for dx in range(3) for dy in range(3)]
+            self.owner[:, cells] = seat
+            self.surface[:, (px + 1) * height + (py + 1)] = SurfaceType.FIELD.value
+        for seat in range(p):
+            owned = self.owner == seat
+            for surface in range(len(SURFACES)):
+                self.owned_surface[:, seat, surface] = (owned & (self.surface == surface)).sum(1)
+            for d in range(4):
+                for cell in np.nonzero(owned[0])[0]:
+                    nb = self.neighbours[cell, d]
+                    if nb >= 0:
+                        self.frontier[:, seat, nb] |= self.owner[:, nb] == -1
+        self.free_surface[:] = self.owned_surface
+        self.free_counts[:] = self.free_surface.sum(-1)
+        self.all_players = np.ones(p, dtype=np.int64)
+        self.progress_key = self.get_progress_key()
+        self.unchanged_rounds = np.zeros(n, dtype=np.int64)
+        self.rich_rounds = np.zeros((n, p), dtype=np.int64)
+
+    def choose(self, mask):
+        keys = self.rng.random(mask.shape, dtype=np.float32)
+        keys[~mask] = -1.0
+        return keys.argmax(-1)
+
+    def run(self, max_turns=10000, stalemate_rounds=STALEMATE_ROUNDS):
+        turn = 0
+        while len(self.game_ids) and turn < max_turns:
+            seat = (1 + turn) % self.num_players  # GameMovesSystem.initialize already rotates once
+            self.play_turn(seat)
+            turn += 1
+            won = (self.floor_counts[:, seat] == FLOOR_COUNT) & ~self.finished  # only the current player can complete the base
+            if won.any():
+                ids = self.game_ids[won]
+                self.winners[ids] = seat
+                self.turn_counts[ids] = turn
+                self.finished |= won
+            if stalemate_rounds and turn % self.num_players == 0:
+                stalled = self.get_stalemates(stalemate_rounds) & ~self.finished
+                if stalled.any():
+                    ids = self.game_ids[stalled]
+                    self.stalled[ids] = True
+                    self.turn_counts[ids] = turn
+                    self.finished |= stalled
+            # Finished games keep being stepped until enough of them pile up to be worth dropping
+            if self.finished.any() and self.finished.sum() * 4 >= len(self.game_ids):
+                self.compact(~self.finished)
+        self.turn_counts[self.game_ids[~self.finished]] = turn
+        return self.winners
+
+    def get_outcomes(self):
+        return [OUTCOME_WIN if winner >= 0 else OUTCOME_STALEMATE if stalled else OUTCOME_TIMEOUT
+                for winner, stalled in zip(self.winners, self.stalled)]
+
+    def compact(self, keep):
+        for name in ('game_ids', 'finished', 'money', 'floors', 'floor_counts', 'counts', 'dice_sums', 'hands',
+                     'replace_count', 'owned_surface', 'free_surface', 'free_counts', 'enabled_mines', 'own_turns',
+                     'communication_start', 'strategic_start', 'queue_head_turn', 'queue_head_offset',
+                     'surface', 'owner', 'frontier', 'progress_key', 'unchanged_rounds', 'rich_rounds'):
+            setattr(self, name, getattr(self, name)[keep])
+
+    # Stalemates: the same rule as simulation.StalemateDetector, checked once per round.
+    # Money flow is judged from the cards a player owns, not from an exact income model, so
+    # the check errs towards "still flowing" and leaves some stalled games to the turn cap.
+    def get_progress_key(self):
+        n = len(self.game_ids)
+        return np.concatenate([self.floor_counts, self.counts.sum(-1), self.owned_surface.sum(-1),
+                               self.hands.reshape(n, -1)], axis=1)
+
+    def get_stalemates(self, stalemate_rounds):
+        key = self.get_progress_key()
+        unchanged = (key == self.progress_key).all(-1)
+        self.progress_key = key
+        self.unchanged_rounds = np.where(unchanged, self.unchanged_rounds + 1, 0)
+        max_price = np.maximum(np.where(self.floors, 0, self.floor_prices).max(-1), np.maximum(self.card_prices.max(), self.floor_counts))
+        is_rich = self.money >= max_price
+        self.rich_rounds = np.where(unchanged[:, None] & is_rich, self.rich_rounds + 1, 0)
+        checked = self.unchanged_rounds >= stalemate_rounds
+        self.unchanged_rounds[checked] = 0
+        frozen = (~self.get_money_flow() | (self.rich_rounds >= stalemate_rounds)).all(-1)
+        return checked & frozen
+
+    def get_money_flow(self):
+        owns_paying = (self.counts[:, :, CARD_PAYS] > 0).any(-1)
+        owns_red = (self.counts[:, :, CARD_PAYS & IS_RED] > 0).any(-1)
+        pays_red = (owns_red.sum(-1, keepdims=True) - owns_red) > 0
+        communication = self.floors[:, :, COMMUNICATION_FLOOR] & (self.floor_counts == self.floor_counts.max(-1, keepdims=True))
+        return owns_paying | pays_red | (self.money == 0) | communication
+
+    # Turn
+    def play_turn(self, seat):
+        self.give_cards(seat)
+        dice = self.rng.integers(1, 7, size=len(self.game_ids))
+        steps = np.full(len(self.game_ids), self.rules.max_player_step_count, dtype=np.int64)
+        self.invoke_all_buildings(seat, dice, steps)
+        self.play_bot_actions(seat, steps)
+        self.own_turns[:, seat] += 1
+
+    def give_cards(self, seat):
+        for slot in range(HAND_SIZE):
+            games = np.nonzero(self.hands[:, seat, slot] == 0)[0]
+            if len(games):
+                self.hands[games, seat, slot] = self.draw_cards(games, seat)
+
+    def draw_cards(self, games, seat):
+        drawable = np.ones((len(games), CARD_COUNT), dtype=bool)
+        drawable[:, 0] = False
+        np.put_along_axis(drawable, self.hands[games, seat], False, axis=1)
+        return self.choose(drawable)
+
+    def invoke_all_buildings(self, seat, dice, steps):
+        counts = self.counts
+        others = (np.arange(self.num_players) != seat).astype(np.int64)
+        forest = self.owned_surface[:, :, SurfaceType.FOREST.value]
+        water = self.owned_surface[:, :, SurfaceType.WATER.value]
+        roller_free = self.free_counts[:, seat]
+        sawmill_fired = CARD_FIRES[dice, SAWMILL_ID]
+        bathyscaphe_fired = CARD_FIRES[dice, BATHYSCAPHE_ID]
+        devastation_fired = CARD_FIRES[dice, DEVASTATION_SPHERE_ID]
+        rolled = self.dice_sums.reshape(-1, *self.dice_sums.shape[2:]).take(np.arange(len(dice)) * (MAX_DICE_VALUE + 1) + dice, axis=0)  # [games, player, column]
+
+        # Red: the roller pays every other player's red buildings; enabled mines pay out on each one.
+        # The roller's money never goes below zero, as in Game.player_give_money; one clamp per
+        # roll equals Game's clamp per building, see SINGLE_DIE_RED_INCOMES
+        red_firings = rolled[:, :, RED_FIRINGS] @ others
+        red_income = rolled[:, :, RED_INCOME] + counts[:, :, DEVASTATION_SPHERE_ID] * (devastation_fired * roller_free)[:, None]
+        red_income *= others
+        total_paid = red_income @ self.all_players
+        roller_mines = self.enabled_mines[:, seat]
+        mines_income = self.rules.mines_income
+        roller_money = np.maximum(self.money[:, seat] + mines_income * roller_mines * red_firings - total_paid, 0)
+        self.money += red_income + mines_income * self.enabled_mines * red_firings[:, None]
+        self.money[:, seat] = roller_money
+        # Green
+        self.money[:, seat] += rolled[:, seat, GREEN_INCOME] + counts[:, seat, SAWMILL_ID] * sawmill_fired * forest[:, seat]
+        # Blue
+        self.money += rolled[:, :, BLUE_INCOME] + counts[:, :, BATHYSCAPHE_ID] * bathyscaphe_fired[:, None] * water
+        # Grey
+        mines_fired = CARD_FIRES[dice, MINES_ID]
+        self.enabled_mines[mines_fired, seat] = counts[mines_fired, seat, MINES_ID]
+
+        # FirstEntryFloor looks at own non-red and others' non-green buildings invoked at this roll
+        own_invoked = rolled[:, seat, OWN_INVOKED]
+        player_income = rolled[:, seat, OWN_POSITIVE] + rolled[:, :, OTHERS_POSITIVE] @ others
+        player_income += counts[:, seat, SAWMILL_ID] * sawmill_fired * (forest[:, seat] > 0)
+        player_income += ((counts[:, :, BATHYSCAPHE_ID] * (water > 0)) @ self.all_players) * bathyscaphe_fired
+        player_income += (counts[:, :, DEVASTATION_SPHERE_ID] @ others) * devastation_fired * (roller_free > 0)
+        zero_all = (self.money[:, seat] == 0) & ((own_invoked == 0) | (player_income == 0))
+        # Main base
+        self.invoke_main_base(seat, zero_all, steps)
+
+    def invoke_main_base(self, seat, zero_all, steps):
+        # MainBase pops one floor per roll from a queue that receives [Communication, Strategic]
+        # at the start of each own turn and FirstEntry at the roll itself
+        j = self.queue_head_turn[:, seat]
+        offset = self.queue_head_offset[:, seat]
+        has_communication = j >= self.communication_start[:, seat]
+        has_strategic = j >= self.strategic_start[:, seat]
+        block_size = 1 + has_communication + has_strategic
+        is_communication = has_communication & (offset == 0)
+        is_strategic = has_strategic & (offset == has_communication.astype(np.int64))
+        is_first_entry = ~is_communication & ~is_strategic
+
+        self.money[:, seat] += FIRST_ENTRY_INCOME * (is_first_entry & zero_all)
+
+        floor_counts = self.floor_counts
+        is_rich = floor_counts[:, seat] == floor_counts.max(-1)
+        is_poor = floor_counts[:, seat] == floor_counts.min(-1)
+        self.money[:, seat] += is_communication & is_rich
+        steps += is_communication & ~is_rich & is_poor
+        all_spheres = (self.counts[:, seat][:, SPHERE_IDS] > 0).all(-1)
+        steps += is_strategic & all_spheres
+
+        offset = offset + 1
+        next_block = offset >= block_size
+        self.queue_head_turn[:, seat] = j + next_block
+        self.queue_head_offset[:, seat] = np.where(next_block, 0, offset)
+
+    # Bot actions
+    def play_bot_actions(self, seat, steps):
+        strategy = self.strategies[seat]
+        games = np.arange(len(self.game_ids))
+        action_count = 0
+        while len(games):
+            success = self.play_strategy(strategy, games, seat, action_count)
+            steps[games[success]] -= 1
+            games = games[success]
+            games = games[steps[games] > 0]
+            action_count += 1
+
+    def play_strategy(self, strategy, games, seat, action_count):
+        if strategy == 1:
+            return self.first_success(games, seat, [self.try_build_max_income, self.try_buy_floor, self.try_buy_tile])
+        if strategy == 2:
+            return self.try_buy_floor(games, seat)
+        if strategy == 3:
+            return self.random_action(games, seat)
+        if strategy == 4:
+            if action_count == 0:
+                return self.try_buy_floor(games, seat)
+            return self.first_success(games, seat, [self.try_build, self.try_buy_tile])
+        if strategy == 5:
+            if action_count == 0:
+                return self.first_success(games, seat, [self.try_build, self.try_buy_tile])
+            return self.first_success(games, seat, [self.try_buy_floor, self.try_buy_tile])
+        raise ValueError(f"Unknown strategy {strategy}")
+
+    def first_success(self, games, seat, actions):
+        success = np.zeros(len(games), dtype=bool)
+        remaining = np.arange(len(games))
+        for action in actions:
+            if not len(remaining):
+                break
+            ok = action(games[remaining], seat)
+            success[remaining[ok]] = True
+            remaining = remaining[~ok]
+        return success
+
+    def random_action(self, games, seat):
+        actions = [self.try_buy_floor, self.try_build, self.try_buy_tile, self.try_replace_card]
+        order = self.rng.random((len(games), len(actions))).argsort(-1)
+        success = np.zeros(len(games), dtype=bool)
+        for position in range(len(actions)):
+            for action_id, action in enumerate(actions):
+                idx = np.nonzero(~success & (order[:, position] == action_id))[0]
+                if len(idx):
+                    success[idx[action(games[idx], seat)]] = True
+        return success
+
+    def try_buy_floor(self, games, seat):
+        money = self.money[games, seat]
+        affordable = ~self.floors[games, seat] & (money[:, None] >= self.floor_prices)
+        ok = affordable.any(-1)
+        games, floor_ids = games[ok], self.choose(affordable[ok])
+        self.money[games, seat] -= self.floor_prices[floor_ids]
+        self.floors[games, seat, floor_ids] = True
+        self.floor_counts[games, seat] += 1
+        next_turn = self.own_turns[games, seat] + 1
+        communication = floor_ids == COMMUNICATION_FLOOR
+        self.communication_start[games[communication], seat] = next_turn[communication]
+        strategic = floor_ids == STRATEGIC_FLOOR
+        self.strategic_start[games[strategic], seat] = next_turn[strategic]
+        return ok
+
+    def get_build_candidates(self, games, seat):
+        hand = self.hands[games, seat]
+        free = np.take_along_axis(self.free_surface[games, seat], CARD_SURFACE[hand], axis=1)
+        return (hand > 0) & (self.card_prices[hand] <= self.money[games, seat][:, None]) & (free > 0)
+
+    def build(self, games, seat, slots):
+        cards = self.hands[games, seat, slots]
+        self.counts[games, seat, cards] += 1
+        self.dice_sums[games, :, seat] += CARD_DICE_TABLE[cards]
+        self.free_surface[games, seat, CARD_SURFACE[cards]] -= 1
+        self.free_counts[games, seat] -= 1
+        self.money[games, seat] -= self.card_prices[cards]
+        self.hands[games, seat, slots] = 0
+
+    def try_build(self, games, seat):
+        candidates = self.get_build_candidates(games, seat)
+        ok = candidates.any(-1)
+        self.build(games[ok], seat, self.choose(candidates[ok]))
+        return ok
+
+    def try_build_max_income(self, games, seat):
+        hand = self.hands[games, seat]
+        # Cards in hand have no owner yet, so terrain based incomes read as zero
+        income = CARD_INCOME[hand]
+        income = np.where(hand == DEVASTATION_SPHERE_ID, self.free_counts[games, seat][:, None], income)
+        candidates = self.get_build_candidates(games, seat) & (income > self.income_threshold)
+        ok = candidates.any(-1)
+        slots = np.where(candidates, income, -1).argmax(-1)
+        self.build(games[ok], seat, slots[ok])
+        return ok
+
+    def try_buy_tile(self, games, seat):
+        frontier = self.frontier[games, seat]
+        cost = self.floor_counts[games, seat]
+        ok = frontier.any(-1) & (self.money[games, seat] >= cost)
+        games, cells, cost = games[ok], self.choose(frontier[ok]), cost[ok]
+        surfaces = self.surface[games, cells]
+        self.owner[games, cells] = seat
+        self.owned_surface[games, seat, surfaces] += 1
+        self.free_surface[games, seat, surfaces] += 1
+        self.free_counts[games, seat] += 1
+        self.money[games, seat] -= cost
+        self.frontier[games, :, cells] = False
+        for d in range(4):
+            nb = self.neighbours[cells, d]
+            valid = nb >= 0
+            nb_games, nb = games[valid], nb[valid]
+            unowned = self.owner[nb_games, nb] == -1
+            self.frontier[nb_games[unowned], seat, nb[unowned]] = True
+        return ok
+
+    def try_replace_card(self, games, seat):
+        can_replace = self.replace_count[games, seat] > 0
+        games = games[can_replace]
+        slots = self.rng.integers(0, HAND_SIZE, size=len(games))
+        has_card = self.hands[games, seat, slots] > 0
+        games, slots = games[has_card], slots[has_card]
+        # The replaced card is still in hand while drawing, so it cannot come back
+        self.hands[games, seat, slots] = self.draw_cards(games, seat)
+        self.replace_count[games, seat] -= 1
+        ok = np.zeros(len(can_replace), dtype=bool)
+        ok[np.nonzero(can_replace)[0][has_card]] = True
+        return ok
+
+def run_batch_trials(num_games=10000, strategies=(1, 2, 3, 4), seed=None, batch_size=20000, map_size=None, max_turns=10000,
+                     rules=None, bot_options=None):
+    strategies = list(strategies)
+    batch_seeds = make_game_seeds((num_games + batch_size - 1) // batch_size, seed)
+    result = TournamentResult(strategies, seed, batch_seeds, num_games)
+    game_num = 0
+    for batch_seed in batch_seeds:
+        engine = BatchEngine(min(batch_size, num_games - game_num), strategies, batch_seed, map_size, rules, bot_options)
+        winners = engine.run(max_turns)
+        for winner, outcome, turns in zip(winners, engine.get_outcomes(), engine.turn_counts):
+            turns_saved = max_turns - turns if outcome == OUTCOME_STALEMATE else 0
+            result.add_game(game_num, strategies[winner] if winner >= 0 else None, outcome, int(turns_saved))
+            game_num += 1
+    return result
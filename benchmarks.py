@@ -0,0 +1,226 @@
+import argparse
+import copy
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import timeit
+
+from diceville_game import Game
+from simulation import Bot, make_game_seeds
+
+# Suite parameters: every benchmark runs at fixed seeds so two runs measure the same work
+LINEUPS = [(1, 2, 3, 4), (1, 2, 3, 5), (3, 3, 3, 3), (1, 1, 1, 1)]
+MAP_SIZES = [(10, 10), (16, 16), (24, 24)]
+GAME_LENGTHS = [20, 60, 120]
+MAX_TURNS = 10000
+# Every measurement runs once untimed to warm up, then REPEATS times; the best run is the
+# result and its spread (see get_spread) is kept as the noise level of the entry
+REPEATS = 5
+QUICK_REPEATS = 3
+
+def make_bots(game, strategies, seed):
+    return {p: Bot(strategies[i], p, random.Random(seed + i)) for i, p in enumerate(game.players)}
+
+def make_mid_game(seed=1, turns=60, strategies=(3, 4, 3, 4), map_size=(10, 10)):
+    # A game played for a number of turns, so there is state worth copying
+    game = Game(num_players=len(strategies), map_size=map_size, seed=seed)
+    bots = make_bots(game, strategies, seed)
+    for _ in range(turns):
+        if game.is_game_over:
+            break
+        player = game.game_moves_system.get_current_turn_player()
+        bots[player].play_turn(game)
+        game.game_moves_system.make_turn()
+    return game
+
+def get_spread(times):
+    # How much slower the median run was than the best one; unlike the slowest run,
+    # one stray pause does not make an entry look noisy
+    return statistics.median(times) / min(times) - 1
+
+def measure(function, number, repeats=REPEATS):
+    function()
+    times = timeit.repeat(function, number=number, repeat=repeats)
+    return number / min(times), get_spread(times)
+
+def measure_on_copies(game, operation, number, repeats=REPEATS):
+    # Times `operation` on fresh restores of one snapshot; the restore itself is not timed
+    snapshot = game.snapshot()
+    times = []
+    for repeat in range(repeats + 1):
+        elapsed = 0.0
+        for i in range(number):
+            target = Game.__new__(Game)
+            target.restore(snapshot)
+            start = time.perf_counter()
+            timed = operation(target, i)
+            # An operation with its own setup returns the time of the measured part
+            elapsed += timed if timed is not None else time.perf_counter() - start
+        if repeat > 0:  # the first pass is the warmup
+            times.append(elapsed)
+    return number / min(times), get_spread(times)
+
+# Whole games
+def play_lineup(strategies, game_seeds, map_size):
+    turns = 0
+    for game_seed in game_seeds:
+        game = Game(num_players=len(strategies), map_size=map_size, seed=game_seed)
+        bots = make_bots(game, strategies, game_seed)
+        turn_count = 0
+        while not game.is_game_over and turn_count < MAX_TURNS:
+            player = game.game_moves_system.get_current_turn_player()
+            bots[player].play_turn(game)
+            game.game_moves_system.make_turn()
+            turn_count += 1
+        turns += turn_count
+    return turns
+
+def benchmark_lineup(strategies, num_games, seed, map_size=(10, 10), repeats=REPEATS):
+    # The games are fixed by their seeds, so every repeat plays exactly the same turns
+    game_seeds = make_game_seeds(num_games, seed)
+    play_lineup(strategies, game_seeds[:1], map_size)
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        turns = play_lineup(strategies, game_seeds, map_size)
+        times.append(time.perf_counter() - start)
+    seconds = min(times)
+    return {'games_per_sec': num_games / seconds, 'turns_per_sec': turns / seconds, 'turns': turns,
+            'spread': get_spread(times)}
+
+# Micro-benchmarks on a fixed mid-game state
+def benchmark_engine_calls(game, number, repeats=REPEATS):
+    roller = game.game_moves_system.get_current_turn_player()
+    bot = Bot(3, roller, random.Random(0))
+
+    def throw_dice(target, i):
+        target.player_throw_dice()
+
+    def invoke_all_buildings(target, i):
+        target.invoke_all_buildings(roller, 1 + i % 6)
+
+    def refill_hand(target, i):
+        hand = target.player_hand_of_cards[roller]
+        for card_id in range(3):
+            hand.use_building(card_id)
+        start = time.perf_counter()
+        hand.add_buildings_to_full_hand()
+        return time.perf_counter() - start
+
+    def make_turn(target, i):
+        target.game_moves_system.make_turn()
+
+    return {
+        'player_throw_dice': measure_on_copies(game, throw_dice, number, repeats),
+        'invoke_all_buildings': measure_on_copies(game, invoke_all_buildings, number, repeats),
+        'add_buildings_to_full_hand': measure_on_copies(game, refill_hand, number, repeats),
+        'get_possible_buy_tiles': measure(lambda: bot.get_possible_buy_tiles(game, roller), number * 10, repeats),
+        'make_turn': measure_on_copies(game, make_turn, number, repeats),
+    }
+
+def benchmark_clone(game, number, repeats=REPEATS):
+    snapshot = game.snapshot()
+
+    def restore():
+        Game.__new__(Game).restore(snapshot)
+
+    return {
+        'deepcopy': measure(lambda: copy.deepcopy(game), max(1, number // 10), repeats),
+        'clone': measure(game.clone, number, repeats),
+        'snapshot': measure(game.snapshot, number, repeats),
+        'restore': measure(restore, number, repeats),
+    }
+
+def run_suite(seed=1, quick=False):
+    num_games = 5 if quick else 40
+    number = 50 if quick else 300
+    map_sizes = MAP_SIZES[:1] if quick else MAP_SIZES
+    game_lengths = GAME_LENGTHS[:1] if quick else GAME_LENGTHS
+    repeats = QUICK_REPEATS if quick else REPEATS
+    results = {}
+    for strategies in LINEUPS:
+        for map_size in map_sizes:
+            name = f"lineup/{''.join(map(str, strategies))}/{map_size[0]}x{map_size[1]}"
+            results[name] = benchmark_lineup(strategies, num_games, seed, map_size, repeats)
+    for map_size in map_sizes:
+        for turns in game_lengths:
+            game = make_mid_game(seed, turns, map_size=map_size)
+            suffix = f"{map_size[0]}x{map_size[1]}/turn{turns}"
+            for call, (ops, spread) in benchmark_engine_calls(game, number, repeats).items():
+                results[f"call/{call}/{suffix}"] = {'ops_per_sec': ops, 'spread': spread}
+            for call, (ops, spread) in benchmark_clone(game, number, repeats).items():
+                results[f"clone/{call}/{suffix}"] = {'ops_per_sec': ops, 'spread': spread}
+    return {
+        'meta': {
+            'seed': seed,
+            'quick': quick,
+            'repeats': repeats,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': results,
+    }
+
+# Comparison: every rate is higher-is-better, so a drop beyond the tolerance is a regression.
+# The tolerance is the threshold, widened to twice the noise the two runs measured for that entry.
+RATE_METRICS = ('games_per_sec', 'turns_per_sec', 'ops_per_sec')
+DEFAULT_THRESHOLD = 0.3
+
+def get_tolerance(base_metrics, metrics, threshold):
+    noise = base_metrics.get('spread', 0.0) + metrics.get('spread', 0.0)
+    return max(threshold, 2 * noise)
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD):
+    rows = []
+    for name, metrics in current['results'].items():
+        base_metrics = baseline['results'].get(name)
+        if base_metrics is None:
+            continue
+        tolerance = get_tolerance(base_metrics, metrics, threshold)
+        for metric in RATE_METRICS:
+            if metric in metrics and base_metrics.get(metric):
+                change = metrics[metric] / base_metrics[metric] - 1
+                rows.append((name, metric, base_metrics[metric], metrics[metric], change, tolerance, change < -tolerance))
+    return rows
+
+def print_results(report):
+    for name, metrics in report['results'].items():
+        values = ', '.join(f"{metric} {value:.1f}" for metric, value in metrics.items() if metric in RATE_METRICS)
+        print(f"{name:55} {values}")
+
+def print_comparison(rows):
+    for name, metric, base, value, change, tolerance, regressed in rows:
+        flag = "REGRESSION" if regressed else ""
+        print(f"{name:55} {metric:14} {base:12.1f} -> {value:12.1f} {change:+7.1%} (tolerance {tolerance:.0%}) {flag}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark suite for the game engine and bots")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--quick', action='store_true', help="one map size, one game length, fewer repeats")
+    parser.add_argument('--output', help="write results to this JSON file")
+    parser.add_argument('--compare', help="baseline JSON file to compare against")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="slowdown fraction reported as a regression; widened for noisy entries")
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.seed, args.quick)
+    print_results(report)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        rows = compare(baseline, report, args.threshold)
+        print()
+        print_comparison(rows)
+        if any(row[-1] for row in rows):
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
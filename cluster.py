@@ -0,0 +1,249 @@
+import argparse
+import multiprocessing
+import os
+import random
+import threading
+import time
+from collections import deque
+from multiprocessing.connection import Listener, Client
+
+from simulation import TournamentResult, make_game_seeds, play_game, parse_strategies
+
+# Protocol: a worker sends ('ready',) and gets back one of
+#   ('task', task_id, strategies, [(index, game_seed), ...], mcts_options)
+#   ('wait', seconds)  nothing to hand out now, but work held by other workers may come back
+#   ('stop',)          every game is done
+# While playing a task it sends ('record', task_id, index, record) per game, then ('done', task_id).
+# Connections use multiprocessing.connection with an authkey, so only holders of the key can join.
+# Messages are pickled, so anyone holding the key can run code on the coordinator and the workers:
+# there is no built-in key, and the coordinator listens on localhost unless told otherwise.
+DEFAULT_PORT = 47800
+DEFAULT_BIND = '127.0.0.1'
+AUTHKEY_ENV = 'DICEVILLE_CLUSTER_KEY'
+WAIT_SECONDS = 0.2
+
+def check_authkey(authkey):
+    if not authkey:
+        raise ValueError(f"an authkey is required: pass one or set {AUTHKEY_ENV}")
+    return authkey
+
+# Coordinator
+class Coordinator:
+    def __init__(self, lineups, game_seeds, chunk_size=25, mcts_options=None, task_timeout=None):
+        # Every lineup plays the same game seeds; results[lineup][i] is the record of game_seeds[i]
+        self.lineups = [list(strategies) for strategies in lineups]
+        self.game_seeds = game_seeds
+        self.mcts_options = mcts_options
+        self.task_timeout = task_timeout
+        self.results = [[None] * len(game_seeds) for _ in self.lineups]
+        self.remaining = len(self.lineups) * len(game_seeds)
+        self.pending = deque()
+        for lineup_index in range(len(self.lineups)):
+            for start in range(0, len(game_seeds), chunk_size):
+                self.pending.append((lineup_index, list(range(start, min(start + chunk_size, len(game_seeds))))))
+        self.next_task_id = 0
+        self.lock = threading.Lock()
+        self.finished = threading.Event()
+        if self.remaining == 0:
+            self.finished.set()  # no games or no lineups: nothing to hand out
+        self.reassigned = 0
+        self.listener = None
+
+    def is_done(self):
+        return self.remaining == 0
+
+    def take_task(self):
+        with self.lock:
+            if not self.pending:
+                return None
+            lineup_index, indices = self.pending.popleft()
+            task_id = self.next_task_id
+            self.next_task_id += 1
+            return task_id, lineup_index, indices
+
+    def add_record(self, lineup_index, index, record):
+        with self.lock:
+            if self.results[lineup_index][index] is None:
+                self.results[lineup_index][index] = record
+                self.remaining -= 1
+                if self.remaining == 0:
+                    self.finished.set()
+
+    def requeue(self, lineup_index, indices):
+        # Games of a lost task that never came back are handed out again
+        with self.lock:
+            missing = [i for i in indices if self.results[lineup_index][i] is None]
+            if missing:
+                self.pending.appendleft((lineup_index, missing))
+                self.reassigned += len(missing)
+
+    def serve_worker(self, conn):
+        task = None
+        try:
+            while True:
+                message = conn.recv()
+                if message[0] != 'ready':
+                    continue
+                if self.is_done():
+                    conn.send(('stop',))
+                    return
+                task = self.take_task()
+                if task is None:
+                    conn.send(('wait', WAIT_SECONDS))
+                    continue
+                task_id, lineup_index, indices = task
+                seeds = [(i, self.game_seeds[i]) for i in indices]
+                conn.send(('task', task_id, self.lineups[lineup_index], seeds, self.mcts_options))
+                while True:
+                    if self.task_timeout is not None and not conn.poll(self.task_timeout):
+                        raise TimeoutError(f"task {task_id} timed out")
+                    message = conn.recv()
+                    if message[0] == 'record':
+                        self.add_record(lineup_index, message[2], message[3])
+                    elif message[0] == 'done':
+                        break
+                task = None
+        except (EOFError, OSError, TimeoutError):
+            pass  # the worker died or hung; its unfinished games go back to the queue
+        finally:
+            if task is not None:
+                self.requeue(task[1], task[2])
+            conn.close()
+
+    def accept_workers(self):
+        while not self.finished.is_set():
+            try:
+                conn = self.listener.accept()
+            except (OSError, multiprocessing.AuthenticationError):
+                if self.finished.is_set():
+                    return
+                continue
+            threading.Thread(target=self.serve_worker, args=(conn,), daemon=True).start()
+
+    def run(self, address, authkey):
+        check_authkey(authkey)
+        if self.is_done():
+            return self.results
+        self.listener = Listener(address, authkey=authkey)
+        threading.Thread(target=self.accept_workers, daemon=True).start()
+        self.finished.wait()
+        # Workers still connected get 'stop' on their next request; the listener is closed last
+        time.sleep(WAIT_SECONDS)
+        self.listener.close()
+        return self.results
+
+# Worker
+def run_worker(address, authkey, connect_timeout=30.0):
+    check_authkey(authkey)
+    deadline = time.monotonic() + connect_timeout
+    while True:
+        try:
+            conn = Client(address, authkey=authkey)
+            break
+        except ConnectionRefusedError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(WAIT_SECONDS)
+    games = 0
+    with conn:
+        while True:
+            try:
+                conn.send(('ready',))
+                message = conn.recv()
+            except (EOFError, OSError):
+                break  # the coordinator is gone
+            if message[0] == 'stop':
+                break
+            if message[0] == 'wait':
+                time.sleep(message[1])
+                continue
+            _, task_id, strategies, seeds, mcts_options = message
+            for index, game_seed in seeds:
+                conn.send(('record', task_id, index, play_game(game_seed, strategies, mcts_options)))
+                games += 1
+            conn.send(('done', task_id))
+    return games
+
+def start_local_workers(num_workers, address, authkey):
+    processes = [multiprocessing.Process(target=run_worker, args=(address, authkey), daemon=True) for _ in range(num_workers)]
+    for process in processes:
+        process.start()
+    return processes
+
+# Tournament on top of the coordinator
+def run_cluster_trials(num_games=100, lineups=((1, 2, 3, 4),), seed=None, address=(DEFAULT_BIND, DEFAULT_PORT),
+                       authkey=None, local_workers=0, chunk_size=25, mcts_options=None,
+                       task_timeout=None, output=None, output_format=None):
+    # Returns one TournamentResult and one record list per lineup; records are in seed order,
+    # so a cluster run gives the same records as simulation.play_games on the same seeds
+    from results import ResultsWriter
+    check_authkey(authkey)
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(64)
+    game_seeds = make_game_seeds(num_games, seed)
+    coordinator = Coordinator(lineups, game_seeds, chunk_size, mcts_options, task_timeout)
+    processes = []
+    if local_workers and not coordinator.is_done():
+        # Workers retry until the listener is up
+        processes = start_local_workers(local_workers, address, authkey)
+    try:
+        results = coordinator.run(address, authkey)
+    finally:
+        for process in processes:
+            process.join(timeout=5)
+    tournaments = []
+    writer = ResultsWriter(output, output_format) if output is not None else None
+    try:
+        for strategies, records in zip(coordinator.lineups, results):
+            result = TournamentResult(strategies, seed, game_seeds, keep_games=output is None)
+            for game_num, record in enumerate(records):
+                result.add_game(game_num, record['winner'], record['outcome'], record['turns_saved'])
+                if writer is not None:
+                    writer.write(record)
+            tournaments.append(result)
+    finally:
+        if writer is not None:
+            writer.close()
+    return {'tournaments': tournaments, 'records': results, 'reassigned': coordinator.reassigned}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Distributed tournaments: one coordinator, workers on any host")
+    subparsers = parser.add_subparsers(dest='mode', required=True)
+    coordinator = subparsers.add_parser('coordinator')
+    coordinator.add_argument('-n', '--games', type=int, default=100)
+    coordinator.add_argument('-s', '--strategies', type=parse_strategies, action='append',
+                             help="lineup, may be repeated; default 1,2,3,4")
+    coordinator.add_argument('--seed', type=int)
+    coordinator.add_argument('--bind', default=DEFAULT_BIND, help="address to listen on; 0.0.0.0 to accept other hosts")
+    coordinator.add_argument('--chunk-size', type=int, default=25)
+    coordinator.add_argument('--task-timeout', type=float, help="seconds without a record before a task is reassigned")
+    coordinator.add_argument('--local-workers', type=int, default=0, help="also start this many workers here")
+    coordinator.add_argument('-o', '--output')
+    worker = subparsers.add_parser('worker')
+    worker.add_argument('--host', default='127.0.0.1')
+    worker.add_argument('-w', '--workers', type=int, default=1, help="worker processes on this host")
+    for sub in (coordinator, worker):
+        sub.add_argument('--port', type=int, default=DEFAULT_PORT)
+        sub.add_argument('--authkey', default=os.environ.get(AUTHKEY_ENV),
+                         help=f"shared secret of the cluster; defaults to ${AUTHKEY_ENV}")
+    args = parser.parse_args(argv)
+    if not args.authkey:
+        parser.error(f"an authkey is required: pass --authkey or set {AUTHKEY_ENV}")
+    authkey = args.authkey.encode()
+
+    if args.mode == 'worker':
+        processes = start_local_workers(args.workers, (args.host, args.port), authkey)
+        for process in processes:
+            process.join()
+        return 0
+    report = run_cluster_trials(
+        args.games, args.strategies or [(1, 2, 3, 4)], args.seed, (args.bind, args.port), authkey,
+        args.local_workers, args.chunk_size, task_timeout=args.task_timeout, output=args.output)
+    for result in report['tournaments']:
+        wins = ', '.join(f"{strategy}: {count}" for strategy, count in sorted(result.wins.items()))
+        print(f"Lineup {result.strategies}: {wins}")
+    print(f"Seed {report['tournaments'][0].seed}, games reassigned after lost workers: {report['reassigned']}")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
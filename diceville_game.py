@@ -1,30 +1,37 @@
 import random
+import hashlib
+from array import array
 from enum import Enum
 from collections import deque, defaultdict
 
 # Enums
-class BuildingType(Enum):
+class IdentityHashEnum(Enum):
+    # Members are singletons, so the identity hash agrees with ==; Enum's own __hash__
+    # hashes the member name in Python on every dict lookup
+    __hash__ = object.__hash__
+
+class BuildingType(IdentityHashEnum):
     MAIN_BASE = -1
     RED = 0
     GREEN = 1
     BLUE = 2
     GREY = 3
 
-class BuildingEmblem(Enum):
+class BuildingEmblem(IdentityHashEnum):
     NONE = 0
     FOOD = 1
     ENERGY = 2
     RUBY = 3
     SPHERE = 4
 
-class SurfaceType(Enum):
+class SurfaceType(IdentityHashEnum):
     ANY = -1
     FIELD = 0
     FOREST = 1
     WATER = 2
     MOUNTAIN = 3
 
-class Floor(Enum):
+class Floor(IdentityHashEnum):
     FIRST_ENTRY_FLOOR = 0
     SCIENCE_FLOOR = 1
     INNOVATIONS_FLOOR = 2
@@ -33,33 +40,118 @@ class Floor(Enum):
     EXCITEMENT_FLOOR = 5
     STRATEGIC_FLOOR = 6
 
-class Player(Enum):
+class Player(IdentityHashEnum):
     NULL = -1
     HOST = 0
     ENEMY1 = 1
     ENEMY2 = 2
     ENEMY3 = 3
 
+SURFACE_BY_VALUE = {s.value: s for s in SurfaceType}
+PLAYER_BY_VALUE = {p.value: p for p in Player}
+
+class GameEvent(IdentityHashEnum):
+    NEXT_TURN = 0
+    BUILDING_EFFECT = 1
+
+# EventBus
+class EventBus:
+    def __init__(self):
+        self.subscribers = {}  # event -> ordered set: callback -> None
+        self.dispatch_lists = {}  # event -> cached tuple of subscribers
+
+    def subscribe(self, event, callback):
+        callbacks = self.subscribers.setdefault(event, {})
+        if callback not in callbacks:
+            callbacks[callback] = None
+            self.dispatch_lists.pop(event, None)
+
+    def unsubscribe(self, event, callback):
+        callbacks = self.subscribers.get(event)
+        if callbacks and callback in callbacks:
+            del callbacks[callback]
+            self.dispatch_lists.pop(event, None)
+
+    def is_subscribed(self, event, callback):
+        return callback in self.subscribers.get(event, ())
+
+    def get_subscribers(self, event):
+        dispatch_list = self.dispatch_lists.get(event)
+        if dispatch_list is None:
+            dispatch_list = tuple(self.subscribers.get(event, ()))
+            self.dispatch_lists[event] = dispatch_list
+        return dispatch_list
+
+    def dispatch(self, event, *args):
+        for callback in self.get_subscribers(event):
+            callback(*args)
+
+# SeedStream
+class SeedStream:
+    def __init__(self, seed=None):
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(64)
+        self.seed = seed
+
+    def derive_seed(self, *keys):
+        data = repr((self.seed,) + keys).encode()
+        return int.from_bytes(hashlib.sha256(data).digest()[:8], 'big')
+
+    def child(self, *keys):
+        return SeedStream(self.derive_seed(*keys))
+
+    def rng(self, *keys):
+        return random.Random(self.derive_seed(*keys))
+
 # Tile
 class Tile:
-    def __init__(self, position, surface_type):
+    # A view over one cell of GameMap's arrays, created on first access
+    __slots__ = ('game_map', 'index', 'position')
+
+    def __init__(self, game_map, position):
+        self.game_map = game_map
         self.position = position  # tuple (x, y)
-        self.surface = surface_type
-        self.building = None
-        self.owner = Player.NULL
+        self.index = game_map.get_index(position)
+
+    @property
+    def surface(self):
+        return SURFACE_BY_VALUE[self.game_map.surfaces[self.index]]
+
+    @surface.setter
+    def surface(self, surface_type):
+        self.game_map.surfaces[self.index] = surface_type.value
+
+    @property
+    def owner(self):
+        return PLAYER_BY_VALUE[self.game_map.owners[self.index]]
+
+    @owner.setter
+    def owner(self, player):
+        self.game_map.owners[self.index] = player.value
+
+    @property
+    def building(self):
+        return self.game_map.buildings[self.index]
+
+    @building.setter
+    def building(self, building):
+        self.game_map.buildings[self.index] = building
 
 # Building
 class Building:
+    __slots__ = ('owner', 'tile')
+    id = 0
+    name_tag = ""
+    description_tag = ""
+    type = BuildingType.RED
+    min_dice_value = 0
+    max_dice_value = 0
+    requirement_tile_surface = SurfaceType.ANY
+    emblem = BuildingEmblem.NONE
+    price = 0
+    state_slots = ()  # mutable per-instance fields copied by Game.snapshot
+
     def __init__(self):
-        self.id = 0
-        self.name_tag = ""
-        self.description_tag = ""
-        self.type = BuildingType.RED
-        self.min_dice_value = 0
-        self.max_dice_value = 0
-        self.requirement_tile_surface = SurfaceType.ANY
-        self.emblem = BuildingEmblem.NONE
-        self.price = 0
         self.owner = None
         self.tile = None
 
@@ -75,8 +167,28 @@ class Building:
     def set_tile(self, tile):
         self.tile = tile
 
+    def get_state(self):
+        return tuple(getattr(self, name) for name in self.state_slots)
+
+    def set_state(self, state):
+        for name, value in zip(self.state_slots, state):
+            setattr(self, name, value)
+
+    def copy(self):
+        # Static card data lives on the class; only the mutable slots are copied.
+        # The tile and references to other objects are rebound by Game.clone
+        building = self.__class__.__new__(self.__class__)
+        building.owner = self.owner
+        building.tile = None
+        for name in self.state_slots:
+            setattr(building, name, getattr(self, name))
+        return building
+
 # EnableableBuilding
 class EnableableBuilding(Building):
+    __slots__ = ('is_building_enabled',)
+    state_slots = ('is_building_enabled',)
+
     def __init__(self):
         super().__init__()
         self.is_building_enabled = False
@@ -87,32 +199,41 @@ class EnableableBuilding(Building):
 
 # IInvokableInNextMove
 class IInvokableInNextMove:
+    __slots__ = ()
+
     def invoke(self, game):
         pass
 
 # IInvokableInDicesRoll
 class IInvokableInDicesRoll:
+    __slots__ = ()
+
     def invoke(self, game, sum_of_dices):
         pass
 
 # IInvokableInNextBuildingsEffect
 class IInvokableInNextBuildingsEffect:
+    __slots__ = ()
+
     def init(self, game):
         pass
 
 # MainBase
 class MainBase(Building):
+    __slots__ = ('floors', 'queue_of_floors_for_effect', 'game', 'activated_floor_count')
+    state_slots = ('activated_floor_count',)
+    id = 0
+    name_tag = "cards/mainBase"
+    description_tag = "cards/mainBaseDescription"
+    type = BuildingType.MAIN_BASE
+    min_dice_value = 0
+    max_dice_value = 0
+    requirement_tile_surface = SurfaceType.ANY
+    emblem = BuildingEmblem.NONE
+    price = 0
+
     def __init__(self):
         super().__init__()
-        self.id = 0
-        self.name_tag = "cards/mainBase"
-        self.description_tag = "cards/mainBaseDescription"
-        self.type = BuildingType.MAIN_BASE
-        self.min_dice_value = 0
-        self.max_dice_value = 0
-        self.requirement_tile_surface = SurfaceType.ANY
-        self.emblem = BuildingEmblem.NONE
-        self.price = 0
         self.floors = [
             FirstEntryFloor(),
             ScienceFloor(),
@@ -123,12 +244,18 @@ class MainBase(Building):
             StrategicFloor()
         ]
         self.queue_of_floors_for_effect = []
+        self.game = None
+        self.activated_floor_count = 0
         self.activate_floor(0)
 
     def activate_floor(self, floor_id):
-        self.floors[floor_id].initialize()
-        if self.get_count_of_activated_floors() == len(self.floors):
-            print(f"Player {self.owner} wins!")
+        floor = self.floors[floor_id]
+        if not floor.is_active:
+            self.activated_floor_count += 1
+        floor.initialize()
+        if self.game is not None:
+            self.game.floor_leaderboard.set_floor_count(self.owner, self.activated_floor_count)
+        if self.activated_floor_count == len(self.floors):
             self.game.is_game_over = True
 
     def floor_activate_effect(self, floor):
@@ -138,7 +265,7 @@ class MainBase(Building):
         return len(self.queue_of_floors_for_effect)
 
     def get_count_of_activated_floors(self):
-        return sum(1 for f in self.floors if f.is_active)
+        return self.activated_floor_count
 
     def get_income_in_case_of_invoke(self, game):
         if self.queue_of_floors_for_effect:
@@ -150,13 +277,36 @@ class MainBase(Building):
             self.queue_of_floors_for_effect[0].effect(game)
             del self.queue_of_floors_for_effect[0]
 
+    def copy(self):
+        main_base = super().copy()
+        main_base.floors = [floor.copy() for floor in self.floors]
+        main_base.queue_of_floors_for_effect = [main_base.floors[self.floors.index(floor)] for floor in self.queue_of_floors_for_effect]
+        main_base.game = None
+        return main_base
+
 # MainBaseFloor
 class MainBaseFloor:
+    __slots__ = ('is_active',)
+    id = Floor.FIRST_ENTRY_FLOOR
+    price = 0
+    state_slots = ('is_active',)
+
     def __init__(self):
-        self.id = Floor.FIRST_ENTRY_FLOOR
-        self.price = 0
         self.is_active = False
 
+    def get_state(self):
+        return tuple(getattr(self, name) for name in self.state_slots)
+
+    def set_state(self, state):
+        for name, value in zip(self.state_slots, state):
+            setattr(self, name, value)
+
+    def copy(self):
+        floor = self.__class__.__new__(self.__class__)
+        for name in self.state_slots:
+            setattr(floor, name, getattr(self, name))
+        return floor
+
     def initialize(self):
         self.is_active = True
 
@@ -167,12 +317,19 @@ class MainBaseFloor:
         pass
 
 class FirstEntryFloor(MainBaseFloor, IInvokableInDicesRoll):
+    __slots__ = ('buildings_for_invoke_effect',)
+    id = Floor.FIRST_ENTRY_FLOOR
+    price = 0
+
     def __init__(self):
         super().__init__()
-        self.id = Floor.FIRST_ENTRY_FLOOR
-        self.price = 0
         self.buildings_for_invoke_effect = []
 
+    def copy(self):
+        floor = super().copy()
+        floor.buildings_for_invoke_effect = []  # rebound by Game.clone
+        return floor
+
     def invoke(self, game, sum_of_dices):
         self.buildings_for_invoke_effect = game.get_all_buildings_that_will_be_invoked_at_dice_value(game.game_moves_system.get_current_turn_player(), sum_of_dices)
         game.get_main_building_for_current_player().floor_activate_effect(self)
@@ -195,31 +352,27 @@ class FirstEntryFloor(MainBaseFloor, IInvokableInDicesRoll):
         self.buildings_for_invoke_effect = []
 
 class ScienceFloor(MainBaseFloor):
-    def __init__(self):
-        super().__init__()
-        self.id = Floor.SCIENCE_FLOOR
-        self.price = 4
+    __slots__ = ()
+    id = Floor.SCIENCE_FLOOR
+    price = 4
 
 class InnovationsFloor(MainBaseFloor):
-    def __init__(self):
-        super().__init__()
-        self.id = Floor.INNOVATIONS_FLOOR
-        self.price = 15
+    __slots__ = ()
+    id = Floor.INNOVATIONS_FLOOR
+    price = 15
 
 class TradeFloor(MainBaseFloor):
-    def __init__(self):
-        super().__init__()
-        self.id = Floor.TRADE_FLOOR
-        self.price = 2
+    __slots__ = ()
+    id = Floor.TRADE_FLOOR
+    price = 2
 
 class CommunicationFloor(MainBaseFloor, IInvokableInNextMove):
-    def __init__(self):
-        super().__init__()
-        self.id = Floor.COMMUNICATION_FLOOR
-        self.price = 10
+    __slots__ = ()
+    id = Floor.COMMUNICATION_FLOOR
+    price = 10
 
     def get_income_in_case_of_invoke(self, game):
-        if game.game_moves_system.get_current_turn_player() in game.get_most_rich_players():
+        if game.is_player_most_rich(game.game_moves_system.get_current_turn_player()):
             return 1
         return -1
 
@@ -228,22 +381,24 @@ class CommunicationFloor(MainBaseFloor, IInvokableInNextMove):
 
     def effect(self, game):
         player = game.game_moves_system.get_current_turn_player()
-        if player in game.get_most_rich_players():
+        if game.is_player_most_rich(player):
             game.player_get_money(player, 1, False)
-        elif player in game.get_most_poor_players():
+        elif game.is_player_most_poor(player):
             game.game_moves_system.give_player_step()
 
 class ExcitementFloor(MainBaseFloor):
-    def __init__(self):
-        super().__init__()
-        self.id = Floor.EXCITEMENT_FLOOR
-        self.price = 22
+    __slots__ = ()
+    id = Floor.EXCITEMENT_FLOOR
+    price = 22
 
 class StrategicFloor(MainBaseFloor, IInvokableInNextMove):
+    __slots__ = ('is_all_spheres_built',)
+    id = Floor.STRATEGIC_FLOOR
+    price = 30
+    state_slots = ('is_active', 'is_all_spheres_built')
+
     def __init__(self):
         super().__init__()
-        self.id = Floor.STRATEGIC_FLOOR
-        self.price = 30
         self.is_all_spheres_built = False
 
     def invoke(self, game):
@@ -272,17 +427,16 @@ class StrategicFloor(MainBaseFloor, IInvokableInNextMove):
 
 # Buildings
 class QueenBurger(Building):
-    def __init__(self):
-        super().__init__()
-        self.id = 1
-        self.name_tag = "cards/queenBurger"
-        self.description_tag = "cards/queenBurgerDescription"
-        self.type = BuildingType.GREEN
-        self.min_dice_value = 1
-        self.max_dice_value = 1
-        self.requirement_tile_surface = SurfaceType.FIELD
-        self.emblem = BuildingEmblem.FOOD
-        self.price = 1
+    __slots__ = ()
+    id = 1
+    name_tag = "cards/queenBurger"
+    description_tag = "cards/queenBurgerDescription"
+    type = BuildingType.GREEN
+    min_dice_value = 1
+    max_dice_value = 1
+    requirement_tile_surface = SurfaceType.FIELD
+    emblem = BuildingEmblem.FOOD
+    price = 1
 
     def get_income_in_case_of_invoke(self, game):
         return 1
@@ -291,17 +445,16 @@ class QueenBurger(Building):
         game.player_get_money(self.owner, 1)
 
 class TidalPowerPlant(Building):
-    def __init__(self):
-        super().__init__()
-        self.id = 2
-        self.name_tag = "cards/tidalPowerPlant"
-        self.description_tag = "cards/tidalPowerPlantDescription"
-        self.type = BuildingType.BLUE
-        self.min_dice_value = 3
-        self.max_dice_value = 3
-        self.requirement_tile_surface = SurfaceType.WATER
-        self.emblem = BuildingEmblem.ENERGY
-        self.price = 2
+    __slots__ = ()
+    id = 2
+    name_tag = "cards/tidalPowerPlant"
+    description_tag = "cards/tidalPowerPlantDescription"
+    type = BuildingType.BLUE
+    min_dice_value = 3
+    max_dice_value = 3
+    requirement_tile_surface = SurfaceType.WATER
+    emblem = BuildingEmblem.ENERGY
+    price = 2
 
     def get_income_in_case_of_invoke(self, game):
         return 2
@@ -310,17 +463,16 @@ class TidalPowerPlant(Building):
         game.player_get_money(self.owner, 2)
 
 class Orchard(Building):
-    def __init__(self):
-        super().__init__()
-        self.id = 3
-        self.name_tag = "cards/orchard"
-        self.description_tag = "cards/orchardDescription"
-        self.type = BuildingType.GREEN
-        self.min_dice_value = 4
-        self.max_dice_value = 4
-        self.requirement_tile_surface = SurfaceType.FOREST
-        self.emblem = BuildingEmblem.FOOD
-        self.price = 2
+    __slots__ = ()
+    id = 3
+    name_tag = "cards/orchard"
+    description_tag = "cards/orchardDescription"
+    type = BuildingType.GREEN
+    min_dice_value = 4
+    max_dice_value = 4
+    requirement_tile_surface = SurfaceType.FOREST
+    emblem = BuildingEmblem.FOOD
+    price = 2
 
     def get_income_in_case_of_invoke(self, game):
         return 2
@@ -329,17 +481,16 @@ class Orchard(Building):
         game.player_get_money(self.owner, 2)
 
 class Trawler(Building):
-    def __init__(self):
-        super().__init__()
-        self.id = 4
-        self.name_tag = "cards/trawler"
-        self.description_tag = "cards/trawlerDescription"
-        self.type = BuildingType.BLUE
-        self.min_dice_value = 5
-        self.max_dice_value = 5
-        self.requirement_tile_surface = SurfaceType.WATER
-        self.emblem = BuildingEmblem.FOOD
-        self.price = 3
+    __slots__ = ()
+    id = 4
+    name_tag = "cards/trawler"
+    description_tag = "cards/trawlerDescription"
+    type = BuildingType.BLUE
+    min_dice_value = 5
+    max_dice_value = 5
+    requirement_tile_surface = SurfaceType.WATER
+    emblem = BuildingEmblem.FOOD
+    price = 3
 
     def get_income_in_case_of_invoke(self, game):
         return 3
@@ -348,17 +499,16 @@ class Trawler(Building):
         game.player_get_money(self.owner, 3)
 
 class WindPowerPlant(Building):
-    def __init__(self):
-        super().__init__()
-        self.id = 5
-        self.name_tag = "cards/windPowerPlant"
-        self.description_tag = "cards/windPowerPlantDescription"
-        self.type = BuildingType.GREEN
-        self.min_dice_value = 6
-        self.max_dice_value = 6
-        self.requirement_tile_surface = SurfaceType.FIELD
-        self.emblem = BuildingEmblem.ENERGY
-        self.price = 3
+    __slots__ = ()
+    id = 5
+    name_tag = "cards/windPowerPlant"
+    description_tag = "cards/windPowerPlantDescription"
+    type = BuildingType.GREEN
+    min_dice_value = 6
+    max_dice_value = 6
+    requirement_tile_surface = SurfaceType.FIELD
+    emblem = BuildingEmblem.ENERGY
+    price = 3
 
     def get_income_in_case_of_invoke(self, game):
         return 3
@@ -367,17 +517,16 @@ class WindPowerPlant(Building):
         game.player_get_money(self.owner, 3)
 
 class EBankOffice(Building):
-    def __init__(self):
-        super().__init__()
-        self.id = 6
-        self.name_tag = "cards/eBankOffice"
-        self.description_tag = "cards/eBankOfficeDescription"
-        self.type = BuildingType.RED
-        self.min_dice_value = 7
-        self.max_dice_value = 7
-        self.requirement_tile_surface = SurfaceType.FIELD
-        self.emblem = BuildingEmblem.RUBY
-        self.price = 4
+    __slots__ = ()
+    id = 6
+    name_tag = "cards/eBankOffice"
+    description_tag = "cards/eBankOfficeDescription"
+    type = BuildingType.RED
+    min_dice_value = 7
+    max_dice_value = 7
+    requirement_tile_surface = SurfaceType.FIELD
+    emblem = BuildingEmblem.RUBY
+    price = 4
 
     def get_income_in_case_of_invoke(self, game):
         return 1
@@ -387,17 +536,16 @@ class EBankOffice(Building):
         game.player_give_money(current_player, self.owner, 1)
 
 class OilRig(Building):
-    def __init__(self):
-        super().__init__()
-        self.id = 7
-        self.name_tag = "cards/oilRig"
-        self.description_tag = "cards/oilRigDescription"
-        self.type = BuildingType.BLUE
-        self.min_dice_value = 8
-        self.max_dice_value = 8
-        self.requirement_tile_surface = SurfaceType.WATER
-        self.emblem = BuildingEmblem.ENERGY
-        self.price = 4
+    __slots__ = ()
+    id = 7
+    name_tag = "cards/oilRig"
+    description_tag = "cards/oilRigDescription"
+    type = BuildingType.BLUE
+    min_dice_value = 8
+    max_dice_value = 8
+    requirement_tile_surface = SurfaceType.WATER
+    emblem = BuildingEmblem.ENERGY
+    price = 4
 
     def get_income_in_case_of_invoke(self, game):
         return 4
@@ -406,17 +554,16 @@ class OilRig(Building):
         game.player_get_money(self.owner, 4)
 
 class RiceField(Building):
-    def __init__(self):
-        super().__init__()
-        self.id = 8
-        self.name_tag = "cards/riceField"
-        self.description_tag = "cards/riceFieldDescription"
-        self.type = BuildingType.GREEN
-        self.min_dice_value = 9
-        self.max_dice_value = 9
-        self.requirement_tile_surface = SurfaceType.FIELD
-        self.emblem = BuildingEmblem.FOOD
-        self.price = 5
+    __slots__ = ()
+    id = 8
+    name_tag = "cards/riceField"
+    description_tag = "cards/riceFieldDescription"
+    type = BuildingType.GREEN
+    min_dice_value = 9
+    max_dice_value = 9
+    requirement_tile_surface = SurfaceType.FIELD
+    emblem = BuildingEmblem.FOOD
+    price = 5
 
     def get_income_in_case_of_invoke(self, game):
         return 3
@@ -425,17 +572,16 @@ class RiceField(Building):
         game.player_get_money(self.owner, 3)
 
 class StoragePowerPlant(Building):
-    def __init__(self):
-        super().__init__()
-        self.id = 9
-        self.name_tag = "cards/storagePowerPlant"
-        self.description_tag = "cards/storagePowerPlantDescription"
-        self.type = BuildingType.BLUE
-        self.min_dice_value = 10
-        self.max_dice_value = 10
-        self.requirement_tile_surface = SurfaceType.MOUNTAIN
-        self.emblem = BuildingEmblem.ENERGY
-        self.price = 5
+    __slots__ = ()
+    id = 9
+    name_tag = "cards/storagePowerPlant"
+    description_tag = "cards/storagePowerPlantDescription"
+    type = BuildingType.BLUE
+    min_dice_value = 10
+    max_dice_value = 10
+    requirement_tile_surface = SurfaceType.MOUNTAIN
+    emblem = BuildingEmblem.ENERGY
+    price = 5
 
     def get_income_in_case_of_invoke(self, game):
         return 5
@@ -444,36 +590,34 @@ class StoragePowerPlant(Building):
         game.player_get_money(self.owner, 5)
 
 class Sawmill(Building):
-    def __init__(self):
-        super().__init__()
-        self.id = 10
-        self.name_tag = "cards/sawmill"
-        self.description_tag = "cards/sawmillDescription"
-        self.type = BuildingType.GREEN
-        self.min_dice_value = 11
-        self.max_dice_value = 11
-        self.requirement_tile_surface = SurfaceType.FOREST
-        self.emblem = BuildingEmblem.RUBY
-        self.price = 6
+    __slots__ = ()
+    id = 10
+    name_tag = "cards/sawmill"
+    description_tag = "cards/sawmillDescription"
+    type = BuildingType.GREEN
+    min_dice_value = 11
+    max_dice_value = 11
+    requirement_tile_surface = SurfaceType.FOREST
+    emblem = BuildingEmblem.RUBY
+    price = 6
 
     def get_income_in_case_of_invoke(self, game):
-        return len([t for t in game.get_all_map_tiles_for_player(self.owner) if t.surface == SurfaceType.FOREST])
+        return game.get_count_of_map_tiles_for_player_with_surface(self.owner, SurfaceType.FOREST)
 
     def effect(self, game):
         game.player_get_money(self.owner, self.get_income_in_case_of_invoke(game))
 
 class WeaponsFactory(Building):
-    def __init__(self):
-        super().__init__()
-        self.id = 11
-        self.name_tag = "cards/weaponsFactory"
-        self.description_tag = "cards/weaponsFactoryDescription"
-        self.type = BuildingType.RED
-        self.min_dice_value = 12
-        self.max_dice_value = 12
-        self.requirement_tile_surface = SurfaceType.MOUNTAIN
-        self.emblem = BuildingEmblem.RUBY
-        self.price = 6
+    __slots__ = ()
+    id = 11
+    name_tag = "cards/weaponsFactory"
+    description_tag = "cards/weaponsFactoryDescription"
+    type = BuildingType.RED
+    min_dice_value = 12
+    max_dice_value = 12
+    requirement_tile_surface = SurfaceType.MOUNTAIN
+    emblem = BuildingEmblem.RUBY
+    price = 6
 
     def get_income_in_case_of_invoke(self, game):
         return 3
@@ -483,17 +627,16 @@ class WeaponsFactory(Building):
         game.player_give_money(current_player, self.owner, 3)
 
 class Jammer(EnableableBuilding):
-    def __init__(self):
-        super().__init__()
-        self.id = 12
-        self.name_tag = "cards/jammer"
-        self.description_tag = "cards/jammerDescription"
-        self.type = BuildingType.GREY
-        self.min_dice_value = 1
-        self.max_dice_value = 6
-        self.requirement_tile_surface = SurfaceType.FIELD
-        self.emblem = BuildingEmblem.NONE
-        self.price = 2
+    __slots__ = ()
+    id = 12
+    name_tag = "cards/jammer"
+    description_tag = "cards/jammerDescription"
+    type = BuildingType.GREY
+    min_dice_value = 1
+    max_dice_value = 6
+    requirement_tile_surface = SurfaceType.FIELD
+    emblem = BuildingEmblem.NONE
+    price = 2
 
     def get_income_in_case_of_invoke(self, game):
         return 0
@@ -503,17 +646,16 @@ class Jammer(EnableableBuilding):
         # game.is_jammer_active = True  # Skip since no use
 
 class MilitaryCamp(Building):
-    def __init__(self):
-        super().__init__()
-        self.id = 13
-        self.name_tag = "cards/militaryCamp"
-        self.description_tag = "cards/militaryCampDescription"
-        self.type = BuildingType.RED
-        self.min_dice_value = 2
-        self.max_dice_value = 3
-        self.requirement_tile_surface = SurfaceType.FIELD
-        self.emblem = BuildingEmblem.NONE
-        self.price = 3
+    __slots__ = ()
+    id = 13
+    name_tag = "cards/militaryCamp"
+    description_tag = "cards/militaryCampDescription"
+    type = BuildingType.RED
+    min_dice_value = 2
+    max_dice_value = 3
+    requirement_tile_surface = SurfaceType.FIELD
+    emblem = BuildingEmblem.NONE
+    price = 3
 
     def get_income_in_case_of_invoke(self, game):
         return 1
@@ -523,17 +665,16 @@ class MilitaryCamp(Building):
         game.player_give_money(current_player, self.owner, 1)
 
 class CentralBank(Building):
-    def __init__(self):
-        super().__init__()
-        self.id = 14
-        self.name_tag = "cards/centralBank"
-        self.description_tag = "cards/centralBankDescription"
-        self.type = BuildingType.GREEN
-        self.min_dice_value = 4
-        self.max_dice_value = 5
-        self.requirement_tile_surface = SurfaceType.FIELD
-        self.emblem = BuildingEmblem.RUBY
-        self.price = 4
+    __slots__ = ()
+    id = 14
+    name_tag = "cards/centralBank"
+    description_tag = "cards/centralBankDescription"
+    type = BuildingType.GREEN
+    min_dice_value = 4
+    max_dice_value = 5
+    requirement_tile_surface = SurfaceType.FIELD
+    emblem = BuildingEmblem.RUBY
+    price = 4
 
     def get_income_in_case_of_invoke(self, game):
         return 2
@@ -542,63 +683,64 @@ class CentralBank(Building):
         game.player_get_money(self.owner, 2)
 
 class Mines(EnableableBuilding, IInvokableInNextBuildingsEffect):
-    def __init__(self):
-        super().__init__()
-        self.id = 15
-        self.name_tag = "cards/mines"
-        self.description_tag = "cards/minesDescription"
-        self.type = BuildingType.GREY
-        self.min_dice_value = 6
-        self.max_dice_value = 6
-        self.requirement_tile_surface = SurfaceType.MOUNTAIN
-        self.emblem = BuildingEmblem.RUBY
-        self.price = 5
+    __slots__ = ()
+    id = 15
+    name_tag = "cards/mines"
+    description_tag = "cards/minesDescription"
+    type = BuildingType.GREY
+    min_dice_value = 6
+    max_dice_value = 6
+    requirement_tile_surface = SurfaceType.MOUNTAIN
+    emblem = BuildingEmblem.RUBY
+    price = 5
 
     def get_income_in_case_of_invoke(self, game):
         return 0
 
     def init(self, game):
-        game.on_buildings_effect.append(self.mines_effect)
+        game.event_bus.subscribe(GameEvent.BUILDING_EFFECT, self.mines_effect)
 
     def mines_effect(self, building, game):
         if self.is_building_enabled and building.type == BuildingType.RED:
-            game.player_get_money(self.owner, 5)
+            game.player_get_money(self.owner, game.rules.mines_income)
 
 class ControlCenter(EnableableBuilding, IInvokableInNextBuildingsEffect):
-    def __init__(self):
-        super().__init__()
-        self.id = 16
-        self.name_tag = "cards/controlCenter"
-        self.description_tag = "cards/controlCenterDescription"
-        self.type = BuildingType.GREY
-        self.min_dice_value = 7
-        self.max_dice_value = 8
-        self.requirement_tile_surface = SurfaceType.FIELD
-        self.emblem = BuildingEmblem.NONE
-        self.price = 7
+    __slots__ = ()
+    id = 16
+    name_tag = "cards/controlCenter"
+    description_tag = "cards/controlCenterDescription"
+    type = BuildingType.GREY
+    min_dice_value = 7
+    max_dice_value = 8
+    requirement_tile_surface = SurfaceType.FIELD
+    emblem = BuildingEmblem.NONE
+    price = 7
 
     def get_income_in_case_of_invoke(self, game):
         return 0
 
     def init(self, game):
-        game.on_buildings_effect.append(self.control_center_effect)
+        game.event_bus.subscribe(GameEvent.BUILDING_EFFECT, self.control_center_effect)
 
     def control_center_effect(self, building, game):
         if self.is_building_enabled and building.type == BuildingType.GREEN:
             game.game_moves_system.give_player_step()
 
 class Casino(Building):
+    __slots__ = ('multiplier',)
+    state_slots = ('multiplier',)
+    id = 17
+    name_tag = "cards/casino"
+    description_tag = "cards/casinoDescription"
+    type = BuildingType.RED
+    min_dice_value = 9
+    max_dice_value = 9
+    requirement_tile_surface = SurfaceType.FIELD
+    emblem = BuildingEmblem.NONE
+    price = 8
+
     def __init__(self):
         super().__init__()
-        self.id = 17
-        self.name_tag = "cards/casino"
-        self.description_tag = "cards/casinoDescription"
-        self.type = BuildingType.RED
-        self.min_dice_value = 9
-        self.max_dice_value = 9
-        self.requirement_tile_surface = SurfaceType.FIELD
-        self.emblem = BuildingEmblem.NONE
-        self.price = 8
         self.multiplier = 1
 
     def get_income_in_case_of_invoke(self, game):
@@ -611,17 +753,16 @@ class Casino(Building):
             self.multiplier += 1
 
 class ExploitationSphere(Building):
-    def __init__(self):
-        super().__init__()
-        self.id = 18
-        self.name_tag = "cards/exploitationSphere"
-        self.description_tag = "cards/exploitationSphereDescription"
-        self.type = BuildingType.BLUE
-        self.min_dice_value = 5
-        self.max_dice_value = 5
-        self.requirement_tile_surface = SurfaceType.FIELD
-        self.emblem = BuildingEmblem.SPHERE
-        self.price = 4
+    __slots__ = ()
+    id = 18
+    name_tag = "cards/exploitationSphere"
+    description_tag = "cards/exploitationSphereDescription"
+    type = BuildingType.BLUE
+    min_dice_value = 5
+    max_dice_value = 5
+    requirement_tile_surface = SurfaceType.FIELD
+    emblem = BuildingEmblem.SPHERE
+    price = 4
 
     def get_income_in_case_of_invoke(self, game):
         income = 0
@@ -642,17 +783,16 @@ class ExploitationSphere(Building):
             game.player_get_money(self.owner, 1)
 
 class ProfitMakingSphere(Building):
-    def __init__(self):
-        super().__init__()
-        self.id = 19
-        self.name_tag = "cards/profitMakingSphere"
-        self.description_tag = "cards/profitMakingSphereDescription"
-        self.type = BuildingType.BLUE
-        self.min_dice_value = 2
-        self.max_dice_value = 2
-        self.requirement_tile_surface = SurfaceType.FIELD
-        self.emblem = BuildingEmblem.SPHERE
-        self.price = 6
+    __slots__ = ()
+    id = 19
+    name_tag = "cards/profitMakingSphere"
+    description_tag = "cards/profitMakingSphereDescription"
+    type = BuildingType.BLUE
+    min_dice_value = 2
+    max_dice_value = 2
+    requirement_tile_surface = SurfaceType.FIELD
+    emblem = BuildingEmblem.SPHERE
+    price = 6
 
     def get_income_in_case_of_invoke(self, game):
         income = 0
@@ -673,38 +813,40 @@ class ProfitMakingSphere(Building):
             game.player_get_money(self.owner, 1)
 
 class DevastationSphere(Building):
-    def __init__(self):
-        super().__init__()
-        self.id = 20
-        self.name_tag = "cards/devastationSphere"
-        self.description_tag = "cards/devastationSphereDescription"
-        self.type = BuildingType.RED
-        self.min_dice_value = 10
-        self.max_dice_value = 10
-        self.requirement_tile_surface = SurfaceType.WATER
-        self.emblem = BuildingEmblem.SPHERE
-        self.price = 5
+    __slots__ = ()
+    id = 20
+    name_tag = "cards/devastationSphere"
+    description_tag = "cards/devastationSphereDescription"
+    type = BuildingType.RED
+    min_dice_value = 10
+    max_dice_value = 10
+    requirement_tile_surface = SurfaceType.WATER
+    emblem = BuildingEmblem.SPHERE
+    price = 5
 
     def get_income_in_case_of_invoke(self, game):
-        return len(game.get_all_available_for_build_map_tiles_for_player(game.game_moves_system.get_current_turn_player()))
+        return game.get_count_of_available_for_build_map_tiles_for_player(game.game_moves_system.get_current_turn_player())
 
     def effect(self, game):
         current_player = game.game_moves_system.get_current_turn_player()
-        amount = len(game.get_all_available_for_build_map_tiles_for_player(current_player))
+        amount = game.get_count_of_available_for_build_map_tiles_for_player(current_player)
         game.player_give_money(current_player, self.owner, amount)
 
 class TransformationSphere(EnableableBuilding, IInvokableInNextMove):
+    __slots__ = ('unused_step_count', 'is_owner_turn_passed', '_game')
+    state_slots = ('is_building_enabled', 'unused_step_count', 'is_owner_turn_passed')
+    id = 21
+    name_tag = "cards/transformationSphere"
+    description_tag = "cards/transformationSphereDescription"
+    type = BuildingType.GREY
+    min_dice_value = 12
+    max_dice_value = 14
+    requirement_tile_surface = SurfaceType.MOUNTAIN
+    emblem = BuildingEmblem.SPHERE
+    price = 6
+
     def __init__(self):
         super().__init__()
-        self.id = 21
-        self.name_tag = "cards/transformationSphere"
-        self.description_tag = "cards/transformationSphereDescription"
-        self.type = BuildingType.GREY
-        self.min_dice_value = 12
-        self.max_dice_value = 14
-        self.requirement_tile_surface = SurfaceType.MOUNTAIN
-        self.emblem = BuildingEmblem.SPHERE
-        self.price = 6
         self.unused_step_count = 0
         self.is_owner_turn_passed = False
         self._game = None
@@ -715,7 +857,7 @@ class TransformationSphere(EnableableBuilding, IInvokableInNextMove):
     def effect(self, game):
         super().effect(game)
         self._game = game
-        game.on_next_turn.append(self.get_current_player_step_count)
+        game.event_bus.subscribe(GameEvent.NEXT_TURN, self.get_current_player_step_count)
 
     def get_current_player_step_count(self, game):
         if not self.is_building_enabled:
@@ -732,29 +874,35 @@ class TransformationSphere(EnableableBuilding, IInvokableInNextMove):
             game.game_moves_system.give_player_step(self.unused_step_count)
             self.unused_step_count = 0
             self.is_owner_turn_passed = False
-            if self.get_current_player_step_count in game.on_next_turn:
-                game.on_next_turn.remove(self.get_current_player_step_count)
+            game.event_bus.unsubscribe(GameEvent.NEXT_TURN, self.get_current_player_step_count)
 
 class Bathyscaphe(Building):
-    def __init__(self):
-        super().__init__()
-        self.id = 22
-        self.name_tag = "cards/bathyscaphe"
-        self.description_tag = "cards/bathyscapheDescription"
-        self.type = BuildingType.BLUE
-        self.min_dice_value = 4
-        self.max_dice_value = 4
-        self.requirement_tile_surface = SurfaceType.WATER
-        self.emblem = BuildingEmblem.NONE
-        self.price = 3
+    __slots__ = ()
+    id = 22
+    name_tag = "cards/bathyscaphe"
+    description_tag = "cards/bathyscapheDescription"
+    type = BuildingType.BLUE
+    min_dice_value = 4
+    max_dice_value = 4
+    requirement_tile_surface = SurfaceType.WATER
+    emblem = BuildingEmblem.NONE
+    price = 3
 
     def get_income_in_case_of_invoke(self, game):
-        return len([t for t in game.get_all_map_tiles_for_player(self.owner) if t.surface == SurfaceType.WATER])
+        return game.get_count_of_map_tiles_for_player_with_surface(self.owner, SurfaceType.WATER)
 
     def effect(self, game):
         game.player_get_money(self.owner, self.get_income_in_case_of_invoke(game))
 
 # BuildingsObjectStorage
+BUILDING_CLASSES = (
+    MainBase, QueenBurger, TidalPowerPlant, Orchard, Trawler, WindPowerPlant,
+    EBankOffice, OilRig, RiceField, StoragePowerPlant, Sawmill, WeaponsFactory,
+    Jammer, MilitaryCamp, CentralBank, Mines, ControlCenter, Casino,
+    ExploitationSphere, ProfitMakingSphere, DevastationSphere, TransformationSphere,
+    Bathyscaphe
+)
+
 class BuildingsObjectStorage:
     def __init__(self):
         self.buildings_count = 22
@@ -762,38 +910,151 @@ class BuildingsObjectStorage:
     def get_buildings_count(self):
         return self.buildings_count
 
+    def get_default_distribution(self):
+        return {id: 1 for id in range(1, self.buildings_count + 1)}
+
     def get_building(self, id):
-        if id == 0: return MainBase()
-        if id == 1: return QueenBurger()
-        if id == 2: return TidalPowerPlant()
-        if id == 3: return Orchard()
-        if id == 4: return Trawler()
-        if id == 5: return WindPowerPlant()
-        if id == 6: return EBankOffice()
-        if id == 7: return OilRig()
-        if id == 8: return RiceField()
-        if id == 9: return StoragePowerPlant()
-        if id == 10: return Sawmill()
-        if id == 11: return WeaponsFactory()
-        if id == 12: return Jammer()
-        if id == 13: return MilitaryCamp()
-        if id == 14: return CentralBank()
-        if id == 15: return Mines()
-        if id == 16: return ControlCenter()
-        if id == 17: return Casino()
-        if id == 18: return ExploitationSphere()
-        if id == 19: return ProfitMakingSphere()
-        if id == 20: return DevastationSphere()
-        if id == 21: return TransformationSphere()
-        if id == 22: return Bathyscaphe()
+        if 0 <= id < len(BUILDING_CLASSES):
+            return BUILDING_CLASSES[id]()
         return MainBase()
 
+# GameRules
+FLOOR_CLASSES = (
+    FirstEntryFloor, ScienceFloor, InnovationsFloor, TradeFloor,
+    CommunicationFloor, ExcitementFloor, StrategicFloor
+)
+
+class GameRules:
+    # Rule constants of one game. Prices default to the card and floor classes;
+    # floor_prices and card_prices override them by floor id and card id.
+    def __init__(self, floor_prices=None, card_prices=None, max_player_step_count=2, starting_money=10, map_size=(10, 10),
+                 mines_income=5):
+        self.floor_prices = tuple(cls.price for cls in FLOOR_CLASSES)
+        self.card_prices = tuple(cls.price for cls in BUILDING_CLASSES)
+        if floor_prices:
+            self.floor_prices = tuple(floor_prices.get(i, price) for i, price in enumerate(self.floor_prices))
+        if card_prices:
+            self.card_prices = tuple(card_prices.get(i, price) for i, price in enumerate(self.card_prices))
+        self.max_player_step_count = max_player_step_count
+        self.starting_money = starting_money
+        self.map_size = tuple(map_size)
+        self.mines_income = mines_income
+
+    def get_floor_price(self, floor_id):
+        return self.floor_prices[floor_id]
+
+    def get_card_price(self, card_id):
+        return self.card_prices[card_id]
+
+    def to_dict(self):
+        # Only the values that differ from the defaults, so equal rules give equal dicts
+        default = GameRules()
+        return {
+            'floor_prices': {i: price for i, price in enumerate(self.floor_prices) if price != default.floor_prices[i]},
+            'card_prices': {i: price for i, price in enumerate(self.card_prices) if price != default.card_prices[i]},
+            'max_player_step_count': self.max_player_step_count,
+            'starting_money': self.starting_money,
+            'map_size': list(self.map_size),
+            'mines_income': self.mines_income,
+        }
+
+    @staticmethod
+    def from_dict(data):
+        return GameRules(
+            {int(i): price for i, price in data.get('floor_prices', {}).items()},
+            {int(i): price for i, price in data.get('card_prices', {}).items()},
+            data.get('max_player_step_count', 2),
+            data.get('starting_money', 10),
+            data.get('map_size', (10, 10)),
+            data.get('mines_income', 5),
+        )
+
+# CardDeck
+class CardDeck:
+    def __init__(self, distribution, rng, state=None):
+        # distribution: card id -> number of copies in the deck
+        self.rng = rng
+        self.copies = {id: count for id, count in distribution.items() if count > 0}
+        if state is not None:
+            self.set_state(state)
+            return
+        self.held = {id: 0 for id in self.copies}
+        self.pool = []  # card id per copy, order is irrelevant for drawing
+        self.positions = {id: [] for id in self.copies}  # card id -> indices of its copies in pool
+        for id, count in self.copies.items():
+            self.put_copies(id)
+
+    def put_copies(self, id):
+        positions = self.positions[id]
+        for _ in range(self.copies[id]):
+            positions.append(len(self.pool))
+            self.pool.append(id)
+
+    def remove_copies(self, id):
+        positions = self.positions[id]
+        while positions:
+            index = positions.pop()
+            last_id = self.pool.pop()
+            if index == len(self.pool):
+                continue
+            # Move the last copy into the freed slot
+            self.pool[index] = last_id
+            last_positions = self.positions[last_id]
+            last_positions[last_positions.index(len(self.pool))] = index
+
+    def get_pool_size(self):
+        return len(self.pool)
+
+    def get_state(self):
+        return (self.pool[:], dict(self.held), {id: positions[:] for id, positions in self.positions.items()})
+
+    def set_state(self, state):
+        pool, held, positions = state
+        self.pool = pool[:]
+        self.held = dict(held)
+        self.positions = {id: indices[:] for id, indices in positions.items()}
+
+    def copy(self, rng):
+        deck = CardDeck.__new__(CardDeck)
+        deck.rng = rng
+        deck.copies = self.copies  # never changes after construction
+        deck.pool = self.pool[:]
+        deck.held = dict(self.held)
+        deck.positions = {id: indices[:] for id, indices in self.positions.items()}
+        return deck
+
+    def draw(self):
+        if not self.pool:
+            return None
+        id = self.pool[self.rng.randrange(len(self.pool))]
+        self.take(id)
+        return id
+
+    def take(self, id):
+        if id not in self.held:
+            return
+        self.held[id] += 1
+        if self.held[id] == 1:
+            self.remove_copies(id)
+
+    def release(self, id):
+        if not self.held.get(id):
+            return
+        self.held[id] -= 1
+        if self.held[id] == 0:
+            self.put_copies(id)
+
 # PlayerHand
 class PlayerHand:
-    def __init__(self, game):
+    def __init__(self, game, rng=None, distribution=None, deck_state=None):
         self.hand = [None] * 6
         self.game = game
+        self.rng = rng if rng is not None else random.Random()
         self.buildings_object_storage = game.buildings_object_storage
+        if distribution is None:
+            distribution = self.buildings_object_storage.get_default_distribution()
+        self.deck = CardDeck(distribution, self.rng, deck_state)
+        self.distribution = distribution
         self.ability_to_replace_card_count = 1
         self.last_wasted_building = None
         self.last_wasted_building_id = 0
@@ -804,11 +1065,8 @@ class PlayerHand:
                 self.add_building(i)
 
     def add_building(self, card_id):
-        building = None
-        while True:
-            building = self.buildings_object_storage.get_building(random.randint(1, self.buildings_object_storage.get_buildings_count()))
-            if building.id not in [b.id for b in self.hand if b is not None]:
-                break
+        building_id = self.deck.draw()
+        building = self.buildings_object_storage.get_building(building_id) if building_id is not None else None
         self.hand[card_id] = building
         return building
 
@@ -818,25 +1076,197 @@ class PlayerHand:
             self.last_wasted_building = building
             self.last_wasted_building_id = card_id
             self.hand[card_id] = None
+            self.deck.release(building.id)
             return building
         return None
 
     def return_last_wasted_building(self):
         if self.last_wasted_building:
             self.hand[self.last_wasted_building_id] = self.last_wasted_building
+            self.deck.take(self.last_wasted_building.id)
             self.last_wasted_building = None
             self.last_wasted_building_id = 0
             self.game.game_moves_system.give_player_step()
 
+    def copy(self, game, rng, buildings):
+        # buildings: id of a built building -> its copy in `game`; cards in hand are unbuilt copies
+        hand = PlayerHand.__new__(PlayerHand)
+        storage = game.buildings_object_storage
+        hand.hand = [storage.get_building(card.id) if card is not None else None for card in self.hand]
+        hand.game = game
+        hand.rng = rng
+        hand.buildings_object_storage = storage
+        hand.deck = self.deck.copy(rng)
+        hand.distribution = self.distribution
+        hand.ability_to_replace_card_count = self.ability_to_replace_card_count
+        last_wasted = self.last_wasted_building
+        if last_wasted is not None:
+            last_wasted = buildings.get(id(last_wasted)) or storage.get_building(last_wasted.id)
+        hand.last_wasted_building = last_wasted
+        hand.last_wasted_building_id = self.last_wasted_building_id
+        return hand
+
     def replace_card(self, card_id):
-        if self.ability_to_replace_card_count > 0:
-            current_id = self.hand[card_id].id if self.hand[card_id] else 0
-            self.hand[card_id] = None
+        if self.ability_to_replace_card_count > 0 and self.deck.get_pool_size() > 0:
+            current = self.hand[card_id]
+            # Draw while the old card is still held so it cannot come back
             self.add_building(card_id)
-            while self.hand[card_id].id == current_id:
-                self.add_building(card_id)
+            if current is not None:
+                self.deck.release(current.id)
             self.ability_to_replace_card_count -= 1
 
+# PlayerRegistry
+class PlayerRegistry:
+    def __init__(self, players, game_map):
+        self.game_map = game_map
+        self.buildings = {p: [] for p in players}
+        self.main_bases = {}
+        self.tiles = {p: [] for p in players}
+        self.free_tiles = {p: {} for p in players}  # ordered set: tile -> None
+        self.free_tiles_by_surface = {p: {s: {} for s in SurfaceType if s != SurfaceType.ANY} for p in players}
+        self.frontiers = {p: set() for p in players}  # positions of unowned, unbuilt tiles next to the territory
+        self.surface_counts = {p: {s: 0 for s in SurfaceType} for p in players}
+
+    def add_building(self, player, building):
+        self.buildings[player].append(building)
+        if isinstance(building, MainBase):
+            self.main_bases[player] = building
+            if building.game is not None:
+                building.game.floor_leaderboard.set_floor_count(player, building.get_count_of_activated_floors())
+        if building.tile is not None:
+            self.occupy_tile(building.tile)
+
+    def add_tile(self, player, tile):
+        self.tiles[player].append(tile)
+        self.surface_counts[player][tile.surface] += 1
+        if tile.building is None:
+            self.free_tiles[player][tile] = None
+            self.free_tiles_by_surface[player][tile.surface][tile] = None
+        for frontier in self.frontiers.values():
+            frontier.discard(tile.position)
+        for position in self.get_neighbour_positions(tile.position):
+            if self.game_map.is_tile_free(position):
+                self.frontiers[player].add(position)
+
+    def occupy_tile(self, tile):
+        if tile.owner in self.free_tiles:
+            self.free_tiles[tile.owner].pop(tile, None)
+            self.free_tiles_by_surface[tile.owner][tile.surface].pop(tile, None)
+        elif tile.owner == Player.NULL:
+            for frontier in self.frontiers.values():
+                frontier.discard(tile.position)
+
+    def set_tile_surface(self, tile, surface):
+        if tile.owner in self.surface_counts and tile in self.tiles[tile.owner]:
+            counts = self.surface_counts[tile.owner]
+            counts[tile.surface] -= 1
+            counts[surface] += 1
+        tile.surface = surface
+        if tile.owner in self.free_tiles:
+            # Rebuild the owner's buckets so they keep the purchase order of free_tiles
+            buckets = self.free_tiles_by_surface[tile.owner]
+            for bucket in buckets.values():
+                bucket.clear()
+            for free_tile in self.free_tiles[tile.owner]:
+                buckets[free_tile.surface][free_tile] = None
+
+    def get_state(self):
+        # Buildings are restored by the game; everything else is kept as tile indices
+        return ({p: tuple(t.index for t in tiles) for p, tiles in self.tiles.items()},
+                {p: tuple(t.index for t in free) for p, free in self.free_tiles.items()},
+                {p: set(frontier) for p, frontier in self.frontiers.items()},
+                {p: dict(counts) for p, counts in self.surface_counts.items()})
+
+    def set_state(self, state):
+        tiles, free_tiles, frontiers, surface_counts = state
+        get_tile = self.game_map.get_tile_by_index
+        for p in self.tiles:
+            self.tiles[p] = [get_tile(i) for i in tiles[p]]
+            free = self.free_tiles[p] = dict.fromkeys(get_tile(i) for i in free_tiles[p])
+            buckets = self.free_tiles_by_surface[p]
+            for tile in free:
+                buckets[tile.surface][tile] = None
+            self.frontiers[p] = set(frontiers[p])
+            self.surface_counts[p] = dict(surface_counts[p])
+
+    def copy(self, game_map, buildings):
+        # game_map: the copy's map, whose tile views replace ours; buildings: id -> copy
+        registry = PlayerRegistry.__new__(PlayerRegistry)
+        registry.game_map = game_map
+        views = game_map.tiles  # made by GameMap.copy for every tile we hold
+        registry.buildings = {p: [buildings[id(b)] for b in built] for p, built in self.buildings.items()}
+        registry.main_bases = {p: buildings[id(b)] for p, b in self.main_bases.items()}
+        registry.tiles = {p: [views[t.index] for t in tiles] for p, tiles in self.tiles.items()}
+        registry.free_tiles = {p: dict.fromkeys(views[t.index] for t in free) for p, free in self.free_tiles.items()}
+        registry.free_tiles_by_surface = {p: {s: dict.fromkeys(views[t.index] for t in bucket) for s, bucket in buckets.items()}
+                                          for p, buckets in self.free_tiles_by_surface.items()}
+        registry.frontiers = {p: set(frontier) for p, frontier in self.frontiers.items()}
+        registry.surface_counts = {p: dict(counts) for p, counts in self.surface_counts.items()}
+        return registry
+
+    def get_neighbour_positions(self, position):
+        x, y = position
+        width, height = self.game_map.size
+        for nx, ny in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+            if 0 <= nx < width and 0 <= ny < height:
+                yield (nx, ny)
+
+# FloorLeaderboard
+class FloorLeaderboard:
+    def __init__(self, players, floors_to_win):
+        self.floors_to_win = floors_to_win
+        self.floor_counts = {p: 0 for p in players}
+        self.players_by_floor_count = [{} for _ in range(floors_to_win + 1)]  # ordered sets of players
+        for p in players:
+            self.players_by_floor_count[0][p] = None
+        self.max_floor_count = 0
+        self.min_floor_count = 0
+        self.winner = None
+
+    def set_floor_count(self, player, count):
+        old_count = self.floor_counts[player]
+        if count == old_count:
+            return
+        del self.players_by_floor_count[old_count][player]
+        self.players_by_floor_count[count][player] = None
+        self.floor_counts[player] = count
+        # Bounds only move one bucket at a time per change, so these loops are short
+        if count > self.max_floor_count:
+            self.max_floor_count = count
+        while not self.players_by_floor_count[self.max_floor_count]:
+            self.max_floor_count -= 1
+        if count < self.min_floor_count:
+            self.min_floor_count = count
+        while not self.players_by_floor_count[self.min_floor_count]:
+            self.min_floor_count += 1
+        if count == self.floors_to_win and self.winner is None:
+            self.winner = player
+
+    def get_floor_count(self, player):
+        return self.floor_counts[player]
+
+    def copy(self):
+        leaderboard = FloorLeaderboard.__new__(FloorLeaderboard)
+        leaderboard.floors_to_win = self.floors_to_win
+        leaderboard.floor_counts = dict(self.floor_counts)
+        leaderboard.players_by_floor_count = [dict(bucket) for bucket in self.players_by_floor_count]
+        leaderboard.max_floor_count = self.max_floor_count
+        leaderboard.min_floor_count = self.min_floor_count
+        leaderboard.winner = self.winner
+        return leaderboard
+
+    def get_richest_players(self):
+        return list(self.players_by_floor_count[self.max_floor_count])
+
+    def get_poorest_players(self):
+        return list(self.players_by_floor_count[self.min_floor_count])
+
+    def is_richest(self, player):
+        return self.floor_counts.get(player) == self.max_floor_count
+
+    def is_poorest(self, player):
+        return self.floor_counts.get(player) == self.min_floor_count
+
 # BuilderOnTile
 class BuilderOnTile:
     def __init__(self, game):
@@ -844,9 +1274,10 @@ class BuilderOnTile:
 
     def set_main_base_for_build_on_tile(self, building, tile, player, position):
         tile.owner = player
-        tile.surface = SurfaceType.FIELD
+        self.game.player_registry.set_tile_surface(tile, SurfaceType.FIELD)
         self.build(tile, building, player)
         self.game.player_buildings.append({'player': player, 'building': building})
+        self.game.player_registry.add_building(player, building)
         self.game.player_main_base_position[player] = position
 
     def set_building_for_build_on_tile(self, building, tile, player):
@@ -864,9 +1295,114 @@ class BuilderOnTile:
 
 # GameMap
 class GameMap:
-    def __init__(self, size=(10, 10)):
+    def __init__(self, size=(10, 10), rng=None):
+        self.size = size
+        rng = rng if rng is not None else random.Random()
+        surface_values = [s.value for s in SurfaceType if s != SurfaceType.ANY]
+        # Cells are stored x-major, in the same order the surfaces are drawn
+        self.surfaces = array('b', [rng.choice(surface_values) for _ in range(size[0] * size[1])])
+        self.owners = array('b', [Player.NULL.value]) * (size[0] * size[1])
+        self.buildings = [None] * (size[0] * size[1])
+        self.tiles = {}
+        self.map = GameMapColumns(self)
+
+    def get_state(self):
+        return (self.size, self.surfaces[:], self.owners[:])
+
+    def set_state(self, state):
+        size, surfaces, owners = state
+        self.buildings = [None] * len(surfaces)
+        if getattr(self, 'size', None) == size:
+            # Same board: overwrite the arrays in place and keep the tile views
+            self.surfaces[:] = surfaces
+            self.owners[:] = owners
+            return
         self.size = size
-        self.map = [[Tile((x, y), random.choice([s for s in SurfaceType if s != SurfaceType.ANY])) for y in range(size[1])] for x in range(size[0])]
+        self.surfaces = surfaces[:]
+        self.owners = owners[:]
+        self.tiles = {}
+        self.map = GameMapColumns(self)
+
+    def copy(self):
+        # Buildings are placed by Game.clone. Every tile view we have gets a twin up front,
+        # so the copies of the registry and the player tiles find theirs with a dict lookup
+        game_map = GameMap.__new__(GameMap)
+        game_map.size = self.size
+        game_map.surfaces = self.surfaces[:]
+        game_map.owners = self.owners[:]
+        game_map.buildings = [None] * len(self.buildings)
+        game_map.tiles = {}
+        for index, tile in self.tiles.items():
+            view = game_map.tiles[index] = Tile.__new__(Tile)
+            view.game_map = game_map
+            view.index = index
+            view.position = tile.position
+        game_map.map = GameMapColumns(game_map)
+        return game_map
+
+    def get_index(self, position):
+        return position[0] * self.size[1] + position[1]
+
+    def get_position(self, index):
+        return divmod(index, self.size[1])
+
+    def get_tile(self, position):
+        index = self.get_index(position)
+        tile = self.tiles.get(index)
+        if tile is None:
+            tile = Tile(self, (position[0], position[1]))
+            self.tiles[index] = tile
+        return tile
+
+    def get_tile_by_index(self, index):
+        tile = self.tiles.get(index)
+        if tile is None:
+            tile = Tile.__new__(Tile)  # the index is known, skip recomputing it from the position
+            tile.game_map = self
+            tile.index = index
+            tile.position = divmod(index, self.size[1])
+            self.tiles[index] = tile
+        return tile
+
+    def get_surface(self, position):
+        return SURFACE_BY_VALUE[self.surfaces[self.get_index(position)]]
+
+    def get_owner(self, position):
+        return PLAYER_BY_VALUE[self.owners[self.get_index(position)]]
+
+    def is_tile_free(self, position):
+        index = self.get_index(position)
+        return self.owners[index] == Player.NULL.value and self.buildings[index] is None
+
+# GameMapColumns: keeps game_map.map[x][y] working on top of the arrays
+class GameMapColumns:
+    def __init__(self, game_map):
+        self.game_map = game_map
+
+    def __len__(self):
+        return self.game_map.size[0]
+
+    def __getitem__(self, x):
+        if x < 0:
+            x += self.game_map.size[0]
+        if not 0 <= x < self.game_map.size[0]:
+            raise IndexError("map column out of range")
+        return GameMapColumn(self.game_map, x)
+
+class GameMapColumn:
+    def __init__(self, game_map, x):
+        self.game_map = game_map
+        self.x = x
+
+    def __len__(self):
+        return self.game_map.size[1]
+
+    def __getitem__(self, y):
+        if y < 0:
+            y += self.game_map.size[1]
+        if not 0 <= y < self.game_map.size[1]:
+            raise IndexError("map row out of range")
+        return self.game_map.get_tile((self.x, y))
 
 # GameMovesSystem
 class GameMovesSystem:
@@ -876,7 +1412,7 @@ class GameMovesSystem:
         self.previous_player_step_count = 0
         self.players_turn_order = deque()
         self.first_player = None
-        self.max_player_step_count = 2
+        self.max_player_step_count = game.rules.max_player_step_count
 
     def initialize(self):
         self.add_players_in_queue()
@@ -897,8 +1433,7 @@ class GameMovesSystem:
         self.reset_variables()
         self.give_cards()
         self.invoke_game_objects_in_next_move()
-        for callback in self.game.on_next_turn:
-            callback(self.game)
+        self.game.event_bus.dispatch(GameEvent.NEXT_TURN, self.game)
 
     def reset_variables(self):
         self.previous_player_step_count = self.current_player_step_count
@@ -938,30 +1473,334 @@ class GameMovesSystem:
 
 # Game
 class Game:
-    def __init__(self, num_players=2, map_size=(10,10)):
+    def __init__(self, num_players=2, map_size=None, seed=None, rng=None, card_distribution=None, rules=None):
+        # Константы правил (цены, число действий, стартовые деньги, размер карты) задаются через rules;
+        # явный map_size важнее rules.map_size
+        self.rules = rules if rules is not None else GameRules()
+        if map_size is None:
+            map_size = self.rules.map_size
+        # Все случайности игры берутся из независимых потоков, выведенных из сида игры
+        self.seed_stream = seed if isinstance(seed, SeedStream) else SeedStream(seed)
+        self.seed = self.seed_stream.seed
+        self.map_rng = rng if rng is not None else self.seed_stream.rng('map')
+        self.dice_rng = rng if rng is not None else self.seed_stream.rng('dice')
         self.player_main_base_position = {}
-        self.player_money = {list(Player)[i]: 10 for i in range(1, num_players+1)}
+        self.player_money = {list(Player)[i]: self.rules.starting_money for i in range(1, num_players+1)}
         self.player_buildings = []
+        self.buildings_by_dice_value = defaultdict(list)  # (type, dice value, owner) -> buildings
         self.player_grey_buildings = []
         self.player_tiles = []
-        self.game_map = GameMap(map_size)
+        self.game_map = GameMap(map_size, self.map_rng)
         self.game_moves_system = GameMovesSystem(self)
         self.buildings_object_storage = BuildingsObjectStorage()
-        self.player_hand_of_cards = {list(Player)[i]: PlayerHand(self) for i in range(1, num_players+1)}
+        self.player_hand_of_cards = {list(Player)[i]: PlayerHand(self, rng if rng is not None else self.seed_stream.rng('deck', list(Player)[i].name), card_distribution) for i in range(1, num_players+1)}
         self.players = list(Player)[1:num_players+1]
+        self.player_registry = PlayerRegistry(self.players, self.game_map)
+        self.floor_leaderboard = FloorLeaderboard(self.players, len(Floor))
         self.sum_of_thrown_dice = 0
         self.thrown_dice_values = []
         self.is_thrown_two_dice = False
         self.has_current_player_threw_dice = False
         self.is_game_over = False
-        self.on_next_turn = []
-        self.on_buildings_effect = []
+        self.event_bus = EventBus()
         self.init_game()
 
     def init_game(self):
         self.init_map()
         self.game_moves_system.initialize()
 
+    # Snapshot: a compact, picklable copy of the mutable state. Buildings are stored
+    # as (owner, card id, tile index, state) so static card data stays on the classes,
+    # and references between objects become indices that restore() rebinds.
+    def snapshot(self):
+        building_index = {}
+        for pb in self.player_buildings:
+            building_index.setdefault(id(pb['building']), len(building_index))
+        buildings = []
+        for pb in self.player_buildings:
+            building = pb['building']
+            extra = None
+            if isinstance(building, MainBase):
+                first_entry = building.floors[Floor.FIRST_ENTRY_FLOOR.value]
+                extra = (tuple(f.get_state() for f in building.floors),
+                         tuple(building.floors.index(f) for f in building.queue_of_floors_for_effect),
+                         tuple(building_index[id(b)] for b in first_entry.buildings_for_invoke_effect))
+            elif isinstance(building, TransformationSphere):
+                extra = building._game is not None
+            buildings.append((pb['player'], building.id, building.tile.index if building.tile is not None else None,
+                              building.get_state(), extra))
+        subscriptions = []
+        for event in GameEvent:
+            for callback in self.event_bus.get_subscribers(event):
+                owner = getattr(callback, '__self__', None)
+                if id(owner) in building_index:
+                    subscriptions.append((event, building_index[id(owner)], callback.__name__))
+                else:
+                    subscriptions.append((event, None, callback))
+        rngs = []
+        rng_slots = {}
+        for key, rng in [('map', self.map_rng), ('dice', self.dice_rng)] + [(p, h.rng) for p, h in self.player_hand_of_cards.items()]:
+            for i, known in enumerate(rngs):
+                if known is rng:
+                    rng_slots[key] = i
+                    break
+            else:
+                rng_slots[key] = len(rngs)
+                rngs.append(rng)
+        hands = {}
+        for player, hand in self.player_hand_of_cards.items():
+            last_wasted = hand.last_wasted_building
+            if last_wasted is not None and id(last_wasted) in building_index:
+                last_wasted = (True, building_index[id(last_wasted)])
+            elif last_wasted is not None:
+                last_wasted = (False, last_wasted.id)
+            hands[player] = (tuple(b.id if b is not None else None for b in hand.hand),
+                             hand.ability_to_replace_card_count, last_wasted, hand.last_wasted_building_id,
+                             hand.distribution, hand.deck.get_state())
+        moves = self.game_moves_system
+        return {
+            'seed_stream': self.seed_stream,
+            'rules': self.rules,
+            'players': tuple(self.players),
+            'player_money': dict(self.player_money),
+            'player_main_base_position': dict(self.player_main_base_position),
+            'map': self.game_map.get_state(),
+            'tiles': tuple((pt['player'], pt['tile'].index) for pt in self.player_tiles),
+            'registry': self.player_registry.get_state(),
+            'buildings': buildings,
+            'subscriptions': subscriptions,
+            'rng_states': [rng.getstate() for rng in rngs],
+            'rng_slots': rng_slots,
+            'hands': hands,
+            'moves': (moves.current_player_step_count, moves.previous_player_step_count,
+                      tuple(moves.players_turn_order), moves.first_player, moves.max_player_step_count),
+            'dice': (self.sum_of_thrown_dice, tuple(self.thrown_dice_values), self.is_thrown_two_dice,
+                     self.has_current_player_threw_dice),
+            'is_game_over': self.is_game_over,
+            'winner': self.floor_leaderboard.winner,
+        }
+
+    def restore(self, snapshot, seed=None):
+        # Restoring into a game that already holds objects (an earlier restore or clone of the
+        # same game) reuses them and only overwrites their mutable fields; a fresh
+        # Game.__new__(Game) builds them. A seed gives the copy fresh dice and deck streams.
+        players = list(snapshot['players'])
+        reuse = getattr(self, 'players', None) == players and self.game_map.size == snapshot['map'][0]
+        if seed is not None:
+            self.seed_stream = seed if isinstance(seed, SeedStream) else SeedStream(seed)
+        else:
+            self.seed_stream = snapshot['seed_stream']
+        self.seed = self.seed_stream.seed
+        self.rules = snapshot['rules']  # never mutated, so copies share it
+        rng_slots = snapshot['rng_slots']
+        old_rngs = {}
+        if reuse:
+            old_rngs = {'map': self.map_rng, 'dice': self.dice_rng}
+            old_rngs.update((p, h.rng) for p, h in self.player_hand_of_cards.items())
+        rngs = [None] * len(snapshot['rng_states'])
+        used = set()
+        for key, slot in rng_slots.items():
+            if seed is not None and key != 'map':
+                continue  # replaced by a fresh stream below
+            if rngs[slot] is None:
+                rng = old_rngs.get(key)
+                if rng is None or id(rng) in used:
+                    rng = random.Random.__new__(random.Random)  # skip seeding from the OS, the state is overwritten
+                used.add(id(rng))
+                rng.setstate(snapshot['rng_states'][slot])
+                rngs[slot] = rng
+
+        def fresh_rng(key, *keys):
+            rng = old_rngs.get(key)
+            if rng is None or id(rng) in used:
+                return self.seed_stream.rng(*keys)
+            used.add(id(rng))
+            rng.seed(self.seed_stream.derive_seed(*keys))
+            return rng
+
+        self.map_rng = rngs[rng_slots['map']]
+        self.dice_rng = rngs[rng_slots['dice']] if seed is None else fresh_rng('dice', 'dice')
+        old_buildings = [pb['building'] for pb in self.player_buildings] if reuse else []
+        old_hands = self.player_hand_of_cards if reuse else {}
+        self.players = players
+        self.player_money = dict(snapshot['player_money'])
+        self.player_main_base_position = dict(snapshot['player_main_base_position'])
+        self.player_buildings = []
+        self.buildings_by_dice_value = defaultdict(list)
+        self.player_grey_buildings = []
+        if not reuse:
+            self.game_map = GameMap.__new__(GameMap)
+            self.buildings_object_storage = BuildingsObjectStorage()
+        self.game_map.set_state(snapshot['map'])
+        self.game_moves_system = GameMovesSystem(self)
+        self.builder_on_tile = BuilderOnTile(self)
+        self.player_registry = PlayerRegistry(self.players, self.game_map)
+        self.floor_leaderboard = FloorLeaderboard(self.players, len(Floor))
+        self.event_bus = EventBus()
+
+        get_tile = self.game_map.get_tile_by_index
+        self.player_tiles = [{'player': player, 'tile': get_tile(index)} for player, index in snapshot['tiles']]
+        self.player_registry.set_state(snapshot['registry'])
+        buildings = []
+        for i, (player, building_id, tile_index, state, extra) in enumerate(snapshot['buildings']):
+            if i < len(old_buildings) and old_buildings[i].id == building_id:
+                building = old_buildings[i]
+            else:
+                building = self.buildings_object_storage.get_building(building_id)
+            building.owner = player
+            building.set_state(state)
+            if tile_index is not None:
+                tile = get_tile(tile_index)
+                tile.building = building
+                building.tile = tile
+            else:
+                building.tile = None
+            if isinstance(building, MainBase):
+                building.game = self
+                floor_states, queue, _ = extra
+                for floor, floor_state in zip(building.floors, floor_states):
+                    floor.set_state(floor_state)
+                building.queue_of_floors_for_effect = [building.floors[i] for i in queue]
+            elif isinstance(building, TransformationSphere):
+                building._game = self if extra else None
+            self.player_buildings.append({'player': player, 'building': building})
+            self.player_registry.buildings[player].append(building)
+            if isinstance(building, MainBase):
+                self.player_registry.main_bases[player] = building
+                self.floor_leaderboard.set_floor_count(player, building.get_count_of_activated_floors())
+            else:
+                self.index_building_by_dice_values(player, building)
+            buildings.append(building)
+        for building, (_, _, _, _, extra) in zip(buildings, snapshot['buildings']):
+            if isinstance(building, MainBase):
+                first_entry = building.floors[Floor.FIRST_ENTRY_FLOOR.value]
+                first_entry.buildings_for_invoke_effect = [buildings[i] for i in extra[2]]
+        self.floor_leaderboard.winner = snapshot['winner']
+        for event, index, callback in snapshot['subscriptions']:
+            self.event_bus.subscribe(event, getattr(buildings[index], callback) if index is not None else callback)
+
+        # Cards in hand are unowned copies; one is reused only if it did not become a building above
+        built = {id(building) for building in buildings}
+        self.player_hand_of_cards = {}
+        for player, (card_ids, replace_count, last_wasted, last_wasted_id, distribution, deck_state) in snapshot['hands'].items():
+            rng = rngs[rng_slots[player]] if seed is None else fresh_rng(player, 'deck', player.name)
+            hand = old_hands.get(player)
+            if hand is not None and (hand.distribution is distribution or hand.distribution == distribution):
+                old_cards = hand.hand
+                hand.rng = rng
+                hand.deck.rng = rng
+                hand.deck.set_state(deck_state)
+            else:
+                old_cards = [None] * len(card_ids)
+                hand = PlayerHand(self, rng, distribution, deck_state)
+            cards = []
+            for card, card_id in zip(old_cards, card_ids):
+                if card_id is None:
+                    card = None
+                elif card is None or card.id != card_id or id(card) in built or card.owner is not None:
+                    card = self.buildings_object_storage.get_building(card_id)
+                cards.append(card)
+            hand.hand = cards
+            hand.ability_to_replace_card_count = replace_count
+            hand.last_wasted_building = None
+            if last_wasted is not None:
+                is_built, value = last_wasted
+                hand.last_wasted_building = buildings[value] if is_built else self.buildings_object_storage.get_building(value)
+            hand.last_wasted_building_id = last_wasted_id
+            self.player_hand_of_cards[player] = hand
+
+        moves = self.game_moves_system
+        (moves.current_player_step_count, moves.previous_player_step_count, turn_order,
+         moves.first_player, moves.max_player_step_count) = snapshot['moves']
+        moves.players_turn_order = deque(turn_order)
+        sum_of_thrown_dice, thrown_dice_values, self.is_thrown_two_dice, self.has_current_player_threw_dice = snapshot['dice']
+        self.sum_of_thrown_dice = sum_of_thrown_dice
+        self.thrown_dice_values = list(thrown_dice_values)
+        self.is_game_over = snapshot['is_game_over']
+
+    def clone(self, seed=None):
+        # Copies the live objects directly, without a snapshot in between: buildings, floors,
+        # hands and decks get their mutable fields copied, references are rebound to the copies
+        game = Game.__new__(Game)
+        if seed is not None:
+            game.seed_stream = seed if isinstance(seed, SeedStream) else SeedStream(seed)
+        else:
+            game.seed_stream = self.seed_stream
+        game.seed = game.seed_stream.seed
+        game.rules = self.rules
+        rngs = {}
+
+        def copy_rng(rng):
+            if id(rng) not in rngs:
+                rngs[id(rng)] = random.Random.__new__(random.Random)  # skip seeding from the OS, the state is overwritten
+                rngs[id(rng)].setstate(rng.getstate())
+            return rngs[id(rng)]
+
+        game.map_rng = copy_rng(self.map_rng)
+        game.dice_rng = copy_rng(self.dice_rng) if seed is None else game.seed_stream.rng('dice')
+        game.players = list(self.players)
+        game.player_money = dict(self.player_money)
+        game.player_main_base_position = dict(self.player_main_base_position)
+        game.game_map = self.game_map.copy()
+        game.buildings_object_storage = BuildingsObjectStorage()
+        game.builder_on_tile = BuilderOnTile(game)
+        views = game.game_map.tiles
+
+        buildings = {}
+        game.player_buildings = []
+        for pb in self.player_buildings:
+            old = pb['building']
+            building = old.copy()
+            if old.tile is not None:
+                building.tile = views[old.tile.index]
+                game.game_map.buildings[old.tile.index] = building
+            if isinstance(building, MainBase):
+                building.game = game
+            elif isinstance(building, TransformationSphere):
+                building._game = game if old._game is not None else None
+            buildings[id(old)] = building
+            game.player_buildings.append({'player': pb['player'], 'building': building})
+        for pb in self.player_buildings:
+            old = pb['building']
+            if isinstance(old, MainBase):
+                first_entry = buildings[id(old)].floors[Floor.FIRST_ENTRY_FLOOR.value]
+                first_entry.buildings_for_invoke_effect = [buildings[id(b)] for b in old.floors[Floor.FIRST_ENTRY_FLOOR.value].buildings_for_invoke_effect]
+        game.buildings_by_dice_value = defaultdict(list)
+        for key, built in self.buildings_by_dice_value.items():
+            if built:
+                game.buildings_by_dice_value[key] = [buildings[id(b)] for b in built]
+        game.player_grey_buildings = []
+        game.player_tiles = [{'player': pt['player'], 'tile': views[pt['tile'].index]} for pt in self.player_tiles]
+        game.player_registry = self.player_registry.copy(game.game_map, buildings)
+        game.floor_leaderboard = self.floor_leaderboard.copy()
+        game.event_bus = EventBus()
+        for event in GameEvent:
+            for callback in self.event_bus.get_subscribers(event):
+                owner = getattr(callback, '__self__', None)
+                if id(owner) in buildings:
+                    callback = getattr(buildings[id(owner)], callback.__name__)
+                game.event_bus.subscribe(event, callback)
+
+        game.player_hand_of_cards = {}
+        for player, hand in self.player_hand_of_cards.items():
+            rng = copy_rng(hand.rng) if seed is None else game.seed_stream.rng('deck', player.name)
+            game.player_hand_of_cards[player] = hand.copy(game, rng, buildings)
+
+        moves = GameMovesSystem(game)
+        old_moves = self.game_moves_system
+        moves.current_player_step_count = old_moves.current_player_step_count
+        moves.previous_player_step_count = old_moves.previous_player_step_count
+        moves.players_turn_order = deque(old_moves.players_turn_order)
+        moves.first_player = old_moves.first_player
+        moves.max_player_step_count = old_moves.max_player_step_count
+        game.game_moves_system = moves
+        game.sum_of_thrown_dice = self.sum_of_thrown_dice
+        game.thrown_dice_values = list(self.thrown_dice_values)
+        game.is_thrown_two_dice = self.is_thrown_two_dice
+        game.has_current_player_threw_dice = self.has_current_player_threw_dice
+        game.is_game_over = self.is_game_over
+        return game
+
     def is_player_in_the_game(self, player):
         return player in self.players
 
@@ -972,11 +1811,11 @@ class Game:
                 for dx in range(3):
                     for dy in range(3):
                         tile_pos = (px + dx, py + dy)
-                        tile = self.game_map.map[tile_pos[0]][tile_pos[1]]
+                        tile = self.game_map.get_tile(tile_pos)
                         tile.owner = player
-                        self.player_tiles.append({'player': player, 'tile': tile})
+                        self.player_owns_new_tile(player, tile)
                 center_pos = (px + 1, py + 1)
-                center_tile = self.game_map.map[center_pos[0]][center_pos[1]]
+                center_tile = self.game_map.get_tile(center_pos)
                 main_base = MainBase()
                 main_base.game = self
                 self.builder_on_tile = BuilderOnTile(self)
@@ -984,13 +1823,13 @@ class Game:
 
     def player_throw_dice(self, two_dice=False):
         if two_dice:
-            d1 = random.randint(1,6)
-            d2 = random.randint(1,6)
+            d1 = self.dice_rng.randint(1,6)
+            d2 = self.dice_rng.randint(1,6)
             sum_d = d1 + d2
             self.thrown_dice_values = [d1, d2]
             self.is_thrown_two_dice = True
         else:
-            sum_d = random.randint(1,6)
+            sum_d = self.dice_rng.randint(1,6)
             self.thrown_dice_values = [sum_d]
             self.is_thrown_two_dice = False
         self.sum_of_thrown_dice = sum_d
@@ -1009,60 +1848,88 @@ class Game:
                 building.invoke(self, sum_d)
 
     def invoke_all_buildings(self, player, dice_value):
-        # Red
-        for pb in self.player_buildings:
-            b = pb['building']
-            if b.owner is not None and b.type == BuildingType.RED and b.min_dice_value <= dice_value <= b.max_dice_value and pb['player'] != player:
-                for callback in self.on_buildings_effect:
-                    callback(b, self)
-                b.effect(self)
-        # Green
-        for pb in self.player_buildings:
-            b = pb['building']
-            if b.owner is not None and b.type == BuildingType.GREEN and b.min_dice_value <= dice_value <= b.max_dice_value and pb['player'] == player:
-                for callback in self.on_buildings_effect:
-                    callback(b, self)
-                b.effect(self)
-        # Blue
-        for pb in self.player_buildings:
-            b = pb['building']
-            if b.owner is not None and b.type == BuildingType.BLUE and b.min_dice_value <= dice_value <= b.max_dice_value:
-                b.effect(self)
-        # Grey
-        for pb in self.player_buildings:
-            b = pb['building']
-            if b.owner is not None and b.type == BuildingType.GREY and b.min_dice_value <= dice_value <= b.max_dice_value and pb['player'] == player:
+        self.invoke_red_buildings(player, dice_value)
+        self.invoke_green_buildings(player, dice_value)
+        self.invoke_blue_buildings(player, dice_value)
+        self.invoke_grey_buildings(player, dice_value)
+        self.invoke_main_base(player)
+
+    def invoke_red_buildings(self, player, dice_value):
+        for owner in self.players:
+            if owner != player:
+                for b in self.get_buildings_at_dice_value(BuildingType.RED, dice_value, owner):
+                    self.event_bus.dispatch(GameEvent.BUILDING_EFFECT, b, self)
+                    b.effect(self)
+
+    def invoke_green_buildings(self, player, dice_value):
+        for b in self.get_buildings_at_dice_value(BuildingType.GREEN, dice_value, player):
+            self.event_bus.dispatch(GameEvent.BUILDING_EFFECT, b, self)
+            b.effect(self)
+
+    def invoke_blue_buildings(self, player, dice_value):
+        for owner in self.players:
+            for b in self.get_buildings_at_dice_value(BuildingType.BLUE, dice_value, owner):
                 b.effect(self)
-        # Main base
+
+    def invoke_grey_buildings(self, player, dice_value):
+        for b in self.get_buildings_at_dice_value(BuildingType.GREY, dice_value, player):
+            b.effect(self)
+
+    def invoke_main_base(self, player):
         main_base = self.get_main_building_for_player(player)
         main_base.effect(self)
 
+    def get_buildings_at_dice_value(self, building_type, dice_value, owner):
+        return self.buildings_by_dice_value.get((building_type, dice_value, owner), ())
+
+    def index_building_by_dice_values(self, player, building):
+        for dice_value in range(building.min_dice_value, building.max_dice_value + 1):
+            self.buildings_by_dice_value[(building.type, dice_value, player)].append(building)
+
     def get_all_buildings(self):
         return [pb['building'] for pb in self.player_buildings]
 
     def get_all_buildings_for_player(self, player):
-        return [pb['building'] for pb in self.player_buildings if pb['player'] == player]
+        return list(self.player_registry.buildings.get(player, ()))
 
     def get_all_buildings_for_current_player(self):
         return self.get_all_buildings_for_player(self.game_moves_system.get_current_turn_player())
 
     def get_all_buildings_except_player(self, player):
-        return [pb['building'] for pb in self.player_buildings if pb['player'] != player]
+        buildings = []
+        for owner in self.players:
+            if owner != player:
+                buildings.extend(self.player_registry.buildings[owner])
+        return buildings
 
     def get_main_building_for_player(self, player):
-        for pb in self.player_buildings:
-            if pb['player'] == player and isinstance(pb['building'], MainBase):
-                return pb['building']
-        return None
+        return self.player_registry.main_bases.get(player)
 
     def get_main_building_for_current_player(self):
         return self.get_main_building_for_player(self.game_moves_system.get_current_turn_player())
 
     def get_all_map_tiles_for_player(self, player):
-        return [pt['tile'] for pt in self.player_tiles if pt['player'] == player]
+        return list(self.player_registry.tiles.get(player, ()))
+
+    def get_count_of_map_tiles_for_player_with_surface(self, player, surface):
+        counts = self.player_registry.surface_counts.get(player)
+        return counts[surface] if counts is not None else 0
 
     def get_all_available_for_build_map_tiles_for_player(self, player):
-        return [pt['tile'] for pt in self.player_tiles if pt['player'] == player and pt['tile'].building is None]
+        return list(self.player_registry.free_tiles.get(player, ()))
+
+    def get_all_available_for_build_map_tiles_for_player_with_surface(self, player, surface):
+        if surface == SurfaceType.ANY:
+            return self.get_all_available_for_build_map_tiles_for_player(player)
+        buckets = self.player_registry.free_tiles_by_surface.get(player)
+        return list(buckets[surface]) if buckets else []
+
+    def get_all_purchasable_tile_positions_for_player(self, player):
+        # Sorted to match the x-then-y order of a full map scan
+        return sorted(self.player_registry.frontiers.get(player, ()))
+
+    def get_count_of_available_for_build_map_tiles_for_player(self, player):
+        return len(self.player_registry.free_tiles.get(player, ()))
 
     def get_all_buildings_that_will_be_invoked_at_dice_value(self, player, dice_value):
         buildings = []
@@ -1071,10 +1938,18 @@ class Game:
         return buildings
 
     def get_all_buildings_for_player_that_will_be_invoked_at_dice_value(self, player, dice_value):
-        return [b for b in self.get_all_buildings_for_player(player) if b.type != BuildingType.RED and b.min_dice_value <= dice_value <= b.max_dice_value]
+        buildings = []
+        for building_type in (BuildingType.GREEN, BuildingType.BLUE, BuildingType.GREY):
+            buildings.extend(self.get_buildings_at_dice_value(building_type, dice_value, player))
+        return buildings
 
     def get_all_buildings_except_player_that_will_be_invoked_at_dice_value(self, player, dice_value):
-        return [b for b in self.get_all_buildings_except_player(player) if b.type != BuildingType.GREEN and b.min_dice_value <= dice_value <= b.max_dice_value]
+        buildings = []
+        for owner in self.players:
+            if owner != player:
+                for building_type in (BuildingType.RED, BuildingType.BLUE, BuildingType.GREY):
+                    buildings.extend(self.get_buildings_at_dice_value(building_type, dice_value, owner))
+        return buildings
 
     def player_get_money(self, player, amount, is_from_building_income=True):
         self.player_money[player] += amount
@@ -1087,69 +1962,91 @@ class Game:
         if self.player_money[from_player] < 0:
             self.player_money[from_player] = 0
 
+    def get_building_price(self, building):
+        return self.rules.get_card_price(building.id)
+
+    def get_floor_price(self, floor_id):
+        return self.rules.get_floor_price(floor_id)
+
     def can_player_purchase_building(self, player, building):
-        return self.player_money[player] >= building.price
+        return self.player_money[player] >= self.get_building_price(building)
 
     def player_build_building(self, player, building):
         building.set_owner(player)
         self.player_buildings.append({'player': player, 'building': building})
-        self.player_money[player] -= building.price
+        self.player_registry.add_building(player, building)
+        self.index_building_by_dice_values(player, building)
+        self.player_money[player] -= self.get_building_price(building)
 
     def player_build_main_base(self, player, position):
         self.player_main_base_position[player] = position
         main_base = self.get_main_building_for_player(player)
         self.player_buildings.append({'player': player, 'building': main_base})
+        self.player_registry.add_building(player, main_base)
 
     def player_owns_new_tile(self, player, tile):
         self.player_tiles.append({'player': player, 'tile': tile})
+        self.player_registry.add_tile(player, tile)
 
     def buy_tile(self, player, position):
         if self.player_money[player] < self.get_buy_tile_cost(player):
             return False
-        tile = self.game_map.map[position[0]][position[1]]
-        if tile.owner != Player.NULL or tile.building is not None:
-            return False
-        adjacent = False
-        for pt in self.player_tiles:
-            if pt['player'] == player:
-                p = pt['tile'].position
-                if abs(p[0] - position[0]) + abs(p[1] - position[1]) == 1:
-                    adjacent = True
-                    break
-        if not adjacent:
+        if tuple(position) not in self.player_registry.frontiers.get(player, ()):
             return False
+        tile = self.game_map.get_tile(position)
         tile.owner = player
         self.player_owns_new_tile(player, tile)
         self.player_money[player] -= self.get_buy_tile_cost(player)
         return True
 
     def get_buy_tile_cost(self, player):
-        main_base = self.get_main_building_for_player(player)
-        return main_base.get_count_of_activated_floors()
+        return self.floor_leaderboard.get_floor_count(player)
 
     def buy_floor(self, player, floor_id):
         main_base = self.get_main_building_for_player(player)
         floor = main_base.floors[floor_id]
         if floor.is_active:
             return False
-        if self.player_money[player] < floor.price:
+        price = self.get_floor_price(floor_id)
+        if self.player_money[player] < price:
             return False
-        self.player_money[player] -= floor.price
+        self.player_money[player] -= price
         main_base.activate_floor(floor_id)
         return True
 
     def get_most_rich_players(self):
-        counts = {p: self.get_main_building_for_player(p).get_count_of_activated_floors() if self.is_player_in_the_game(p) else -10 for p in self.players}
-        max_count = max(counts.values())
-        return [p for p, c in counts.items() if c == max_count]
+        return self.floor_leaderboard.get_richest_players()
 
     def get_most_poor_players(self):
-        counts = {p: self.get_main_building_for_player(p).get_count_of_activated_floors() if self.is_player_in_the_game(p) else 10 for p in self.players}
-        min_count = min(counts.values())
-        return [p for p, c in counts.items() if c == min_count]
+        return self.floor_leaderboard.get_poorest_players()
+
+    def is_player_most_rich(self, player):
+        return self.floor_leaderboard.is_richest(player)
+
+    def is_player_most_poor(self, player):
+        return self.floor_leaderboard.is_poorest(player)
+
+    def get_winner(self):
+        return self.floor_leaderboard.winner
+
+    def get_max_price_for_player(self, player):
+        # The most the player could spend on one action: a floor, a card or a tile
+        main_base = self.get_main_building_for_player(player)
+        floor_prices = [self.get_floor_price(i) for i, floor in enumerate(main_base.floors) if not floor.is_active]
+        return max(floor_prices + list(self.rules.card_prices) + [self.get_buy_tile_cost(player)])
+
+    def get_progress_fingerprint(self):
+        # What the players' actions change: floors, buildings, tiles and hands. Money is left out,
+        # buildings move it every roll; two equal fingerprints a round apart mean nobody acted.
+        return (
+            tuple(self.floor_leaderboard.get_floor_count(p) for p in self.players),
+            len(self.player_buildings),
+            len(self.player_tiles),
+            tuple(tuple(card.id if card else 0 for card in self.player_hand_of_cards[p].hand) for p in self.players),
+        )
 
     def does_player_have_available_tile_for_build(self, player):
-        return len(self.get_all_available_for_build_map_tiles_for_player(player)) > 0
+        return self.get_count_of_available_for_build_map_tiles_for_player(player) > 0
 
 if __name__ == "__main__":
     game = Game(num_players=2)
@@ -0,0 +1,175 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from diceville_game import SeedStream
+from simulation import Bot, create_game, play_to_end, make_game_seeds
+
+# Genome: one float per gene, kept inside the gene's range
+#   *_weight             action priority; actions are tried from the highest weight down,
+#                        an action with weight below 0.1 is never tried
+#   income_threshold     build only cards whose income is above it
+#   floor_after_action   floors are bought only from this action of the turn on
+#   floor_min_money      floors are bought only with at least this much money
+GENES = (
+    ('floor_weight', 0.0, 1.0),
+    ('build_weight', 0.0, 1.0),
+    ('tile_weight', 0.0, 1.0),
+    ('replace_weight', 0.0, 1.0),
+    ('income_threshold', 0.0, 8.0),
+    ('floor_after_action', 0.0, 2.0),
+    ('floor_min_money', 0.0, 30.0),
+)
+ACTIONS = ('floor', 'build', 'tile', 'replace')
+MIN_WEIGHT = 0.1
+OPPONENTS = (1, 3, 4)
+
+def decode(genome):
+    return {name: value for (name, _, _), value in zip(GENES, genome)}
+
+def clip(genome):
+    return [min(high, max(low, value)) for (_, low, high), value in zip(GENES, genome)]
+
+# PolicyBot: a parameterized strategy over the Bot primitives
+class PolicyBot(Bot):
+    def __init__(self, player, genome, rng=None):
+        super().__init__('policy', player, rng)
+        self.genome = list(genome)
+        params = decode(genome)
+        weights = [params[f"{action}_weight"] for action in ACTIONS]
+        self.action_order = [action for weight, action in sorted(zip(weights, ACTIONS), reverse=True) if weight >= MIN_WEIGHT]
+        self.income_threshold = params['income_threshold']
+        self.floor_after_action = round(params['floor_after_action'])
+        self.floor_min_money = params['floor_min_money']
+
+    def take_action(self, game, action_count):
+        for action in self.action_order:
+            if action == 'floor':
+                if action_count >= self.floor_after_action and game.player_money[self.player] >= self.floor_min_money \
+                        and self.try_buy_floor(game):
+                    return True
+            elif action == 'build':
+                if game.does_player_have_available_tile_for_build(self.player) and \
+                        self.try_build_income(game, self.income_threshold):
+                    return True
+            elif action == 'tile':
+                if self.try_buy_tile(game):
+                    return True
+            elif self.try_replace_card(game):
+                return True
+        return False
+
+# Evaluation: every candidate plays the same (game seed, seat) tasks against the same opponents
+def play_candidate_game(task):
+    genome, game_seed, seat, opponents = task
+    strategies = list(opponents)
+    strategies.insert(seat, opponents[0])  # placeholder, replaced by the policy bot
+    game, bots = create_game(game_seed, strategies)
+    player = game.players[seat]
+    bots[player] = PolicyBot(player, genome, game.seed_stream.child('bot').rng(player.name))
+    record = play_to_end(game, bots)
+    return record['winner_seat'] == seat, record['floors'][seat]
+
+def make_tasks(population, game_seeds, opponents):
+    # The policy bot takes every seat in turn, so no candidate profits from the seat order
+    num_seats = len(opponents) + 1
+    return [(genome, game_seed, i % num_seats, opponents)
+            for genome in population for i, game_seed in enumerate(game_seeds)]
+
+def evaluate(population, game_seeds, opponents=OPPONENTS, executor=None, chunk_size=None):
+    # Fitness: winrate, with average floors as a small tie-breaker while nobody wins
+    tasks = make_tasks(population, game_seeds, opponents)
+    if executor is None:
+        outcomes = list(map(play_candidate_game, tasks))
+    else:
+        if chunk_size is None:
+            chunk_size = max(1, len(game_seeds) // 4)
+        outcomes = list(executor.map(play_candidate_game, tasks, chunksize=chunk_size))
+    num_games = len(game_seeds)
+    fitness = []
+    for i in range(len(population)):
+        games = outcomes[i * num_games:(i + 1) * num_games]
+        wins = sum(won for won, _ in games)
+        floors = sum(floor_count for _, floor_count in games)
+        fitness.append(wins / num_games + 0.01 * floors / num_games)
+    return fitness
+
+# Genetic algorithm
+def random_genome(rng):
+    return [rng.uniform(low, high) for _, low, high in GENES]
+
+def select(population, fitness, rng, size=3):
+    contestants = rng.sample(range(len(population)), size)
+    return population[max(contestants, key=lambda i: fitness[i])]
+
+def crossover(first, second, rng):
+    return [a if rng.random() < 0.5 else b for a, b in zip(first, second)]
+
+def mutate(genome, rng, rate=0.3, scale=0.15):
+    return clip([value + rng.gauss(0, scale * (high - low)) if rng.random() < rate else value
+                 for (_, low, high), value in zip(GENES, genome)])
+
+def next_population(population, fitness, rng, elite=2):
+    ranked = sorted(range(len(population)), key=lambda i: fitness[i], reverse=True)
+    children = [list(population[i]) for i in ranked[:elite]]
+    while len(children) < len(population):
+        children.append(mutate(crossover(select(population, fitness, rng), select(population, fitness, rng), rng), rng))
+    return children
+
+# Checkpoints: the state after every generation, enough to resume the search
+def save_checkpoint(path, state):
+    with open(path + '.tmp', 'w') as f:
+        json.dump(state, f, indent=2)
+    os.replace(path + '.tmp', path)
+
+def load_checkpoint(path):
+    with open(path) as f:
+        return json.load(f)
+
+def evolve(generations=10, population_size=16, games_per_candidate=40, seed=0, opponents=OPPONENTS,
+           workers=None, checkpoint=None, resume=False, hall_of_fame_size=5):
+    # Every generation draws fresh game seeds, shared by all its candidates; seeds and
+    # GA randomness derive from (seed, generation), so a resumed run continues the same way
+    seed_stream = SeedStream(seed)
+    if resume and checkpoint is not None and os.path.exists(checkpoint):
+        state = load_checkpoint(checkpoint)
+        start = state['generation'] + 1
+        population = next_population(state['population'], state['fitness'], seed_stream.rng('ga', state['generation']))
+        hall_of_fame = state['hall_of_fame']
+        history = state['history']
+    else:
+        rng = seed_stream.rng('init')
+        population = [random_genome(rng) for _ in range(population_size)]
+        start = 0
+        hall_of_fame = []
+        history = []
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        for generation in range(start, generations):
+            game_seeds = make_game_seeds(games_per_candidate, seed_stream.derive_seed('games', generation))
+            fitness = evaluate(population, game_seeds, opponents, executor)
+            best = max(range(len(population)), key=lambda i: fitness[i])
+            history.append({'generation': generation, 'best': fitness[best], 'mean': sum(fitness) / len(fitness)})
+            hall_of_fame.extend({'generation': generation, 'fitness': fitness[i], 'genome': population[i],
+                                 'params': decode(population[i])} for i in range(len(population)))
+            hall_of_fame = sorted(hall_of_fame, key=lambda entry: entry['fitness'], reverse=True)[:hall_of_fame_size]
+            if checkpoint is not None:
+                save_checkpoint(checkpoint, {
+                    'seed': seed, 'generation': generation, 'population': population, 'fitness': fitness,
+                    'opponents': list(opponents), 'games_per_candidate': games_per_candidate,
+                    'hall_of_fame': hall_of_fame, 'history': history,
+                })
+            print(f"generation {generation}: best {fitness[best]:.3f} mean {history[-1]['mean']:.3f}")
+            population = next_population(population, fitness, seed_stream.rng('ga', generation))
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return hall_of_fame
+
+if __name__ == "__main__":
+    best = evolve(generations=5, population_size=8, games_per_candidate=20, seed=1, checkpoint='evolution_checkpoint.json')
+    for entry in best:
+        print(f"{entry['fitness']:.3f}", {name: round(value, 2) for name, value in entry['params'].items()})
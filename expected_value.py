@@ -0,0 +1,151 @@
+import random
+from fractions import Fraction
+from itertools import product
+
+from diceville_game import Game, BuildingType, DevastationSphere, Mines, GameEvent
+
+# Dice tables: exact probability of every sum for one and two six-sided dice
+def build_dice_table(num_dice, sides=6):
+    counts = {}
+    for roll in product(range(1, sides + 1), repeat=num_dice):
+        counts[sum(roll)] = counts.get(sum(roll), 0) + 1
+    total = sides ** num_dice
+    return {value: Fraction(count, total) for value, count in sorted(counts.items())}
+
+DICE_TABLES = {1: build_dice_table(1), 2: build_dice_table(2)}
+
+def get_range_probability(num_dice, min_value, max_value):
+    table = DICE_TABLES[num_dice]
+    return sum((table.get(value, Fraction(0)) for value in range(min_value, max_value + 1)), Fraction(0))
+
+def does_building_fire(building, owner, roller):
+    # Red on opponents' rolls, green and grey on the owner's roll, blue on every roll
+    if building.type == BuildingType.RED:
+        return owner != roller
+    if building.type in (BuildingType.GREEN, BuildingType.GREY):
+        return owner == roller
+    return building.type == BuildingType.BLUE
+
+# IncomeContext: expected income for one board state and dice count
+class IncomeContext:
+    def __init__(self, game, num_dice=1):
+        self.game = game
+        self.num_dice = num_dice
+        self.range_probabilities = {}
+        # Each active Mines pays its owner whenever any red building fires
+        self.mines_income = {p: 0 for p in game.players}
+        for building in game.get_all_buildings():
+            if isinstance(building, Mines) and building.is_building_enabled and \
+                    game.event_bus.is_subscribed(GameEvent.BUILDING_EFFECT, building.mines_effect):
+                self.mines_income[building.owner] += game.rules.mines_income
+
+    def get_activation_probability(self, building):
+        key = (building.min_dice_value, building.max_dice_value)
+        probability = self.range_probabilities.get(key)
+        if probability is None:
+            probability = float(get_range_probability(self.num_dice, *key))
+            self.range_probabilities[key] = probability
+        return probability
+
+    def get_building_income(self, building, owner, roller):
+        # Income is read with the dice count of this context; hand cards are valued
+        # as if they were already owned by `owner`
+        if isinstance(building, DevastationSphere):
+            return self.game.get_count_of_available_for_build_map_tiles_for_player(roller)
+        old_owner, old_two_dice = building.owner, self.game.is_thrown_two_dice
+        building.owner = owner
+        self.game.is_thrown_two_dice = self.num_dice == 2
+        try:
+            return building.get_income_in_case_of_invoke(self.game)
+        finally:
+            building.owner = old_owner
+            self.game.is_thrown_two_dice = old_two_dice
+
+    def get_main_base_income(self, roller):
+        # Floor effects queued at the start of the current player's turn pay out on any roll;
+        # negative floor incomes stand for extra steps, not money
+        if roller != self.game.game_moves_system.get_current_turn_player():
+            return 0
+        return max(0, self.game.get_main_building_for_player(roller).get_income_in_case_of_invoke(self.game))
+
+    def get_expected_income_for_roll(self, roller):
+        # Expected money change of every player over one roll by `roller`. Red buildings
+        # move money from the roller to their owner; the zero-money floor is ignored.
+        income = {p: 0.0 for p in self.game.players}
+        income[roller] += self.get_main_base_income(roller)
+        for building in self.game.get_all_buildings():
+            if building.type == BuildingType.MAIN_BASE or not does_building_fire(building, building.owner, roller):
+                continue
+            probability = self.get_activation_probability(building)
+            if probability == 0:
+                continue
+            amount = probability * self.get_building_income(building, building.owner, roller)
+            income[building.owner] += amount
+            if building.type == BuildingType.RED:
+                income[roller] -= amount
+                for player, mines_income in self.mines_income.items():
+                    income[player] += probability * mines_income
+        return income
+
+    def get_expected_income_per_round(self):
+        # Every player rolls once per round
+        income = {p: 0.0 for p in self.game.players}
+        for roller in self.game.players:
+            for player, amount in self.get_expected_income_for_roll(roller).items():
+                income[player] += amount
+        return income
+
+    def get_expected_building_value(self, building, owner):
+        # Expected income per round that `building` brings to `owner`, built or in hand
+        probability = self.get_activation_probability(building)
+        if probability == 0:
+            return 0.0
+        value = 0.0
+        for roller in self.game.players:
+            if does_building_fire(building, owner, roller):
+                value += probability * self.get_building_income(building, owner, roller)
+                if building.type == BuildingType.RED:
+                    value += probability * self.mines_income[owner]
+        return value
+
+def get_expected_income_per_round(game, num_dice=1):
+    return IncomeContext(game, num_dice).get_expected_income_per_round()
+
+def get_expected_building_value(game, building, owner, num_dice=1):
+    return IncomeContext(game, num_dice).get_expected_building_value(building, owner)
+
+# Cross-check: average money change over sampled rolls of the current player
+def simulate_income_for_roll(game, samples=2000, num_dice=1, seed=None):
+    rng = random.Random(seed)
+    roller = game.game_moves_system.get_current_turn_player()
+    snapshot = game.snapshot()
+    totals = {p: 0 for p in game.players}
+    copy = Game.__new__(Game)
+    for _ in range(samples):
+        copy.restore(snapshot)
+        dice = [rng.randint(1, 6) for _ in range(num_dice)]
+        copy.thrown_dice_values = dice
+        copy.is_thrown_two_dice = num_dice == 2
+        copy.sum_of_thrown_dice = sum(dice)
+        copy.invoke_all_buildings(roller, sum(dice))
+        for player in game.players:
+            totals[player] += copy.player_money[player] - game.player_money[player]
+    return {p: total / samples for p, total in totals.items()}
+
+def cross_check(game, samples=2000, num_dice=1, seed=None):
+    roller = game.game_moves_system.get_current_turn_player()
+    analytic = IncomeContext(game, num_dice).get_expected_income_for_roll(roller)
+    simulated = simulate_income_for_roll(game, samples, num_dice, seed)
+    return {p: (analytic[p], simulated[p]) for p in game.players}
+
+if __name__ == "__main__":
+    from benchmarks import make_mid_game
+    game = make_mid_game(seed=3, turns=120)
+    # Enough money for every transfer, so the zero-money floor does not cut red income
+    for player in game.players:
+        game.player_money[player] += 1000
+    for num_dice in (1, 2):
+        print(f"{num_dice}d6, roller {game.game_moves_system.get_current_turn_player()}")
+        for player, (analytic, simulated) in cross_check(game, 4000, num_dice, seed=1).items():
+            print(f"  {player}: analytic {analytic:7.3f}  simulated {simulated:7.3f}")
+        print("  per round:", {p.name: round(v, 3) for p, v in get_expected_income_per_round(game, num_dice).items()})
@@ -0,0 +1,155 @@
+import json
+import os
+import random
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from time import perf_counter
+
+from simulation import create_game, play_to_end, make_game_seeds
+
+# Phases: method name -> phase label. Instrumentation replaces these methods on the
+# instances it is attached to, so objects that are not attached run the plain methods.
+GAME_PHASES = {
+    'player_throw_dice': 'throw_dice',
+    'invoke_dices_roll_invocables': 'dice_roll_floors',
+    'invoke_red_buildings': 'buildings/red',
+    'invoke_green_buildings': 'buildings/green',
+    'invoke_blue_buildings': 'buildings/blue',
+    'invoke_grey_buildings': 'buildings/grey',
+    'invoke_main_base': 'floor_effects',
+}
+MOVES_PHASES = {
+    'make_turn': 'make_turn',
+    'give_cards': 'card_refills',
+    'invoke_game_objects_in_next_move': 'next_move_invocations',
+}
+EVENT_BUS_PHASES = {
+    'dispatch': 'event_dispatch',
+}
+BOT_PHASES = {
+    'play_turn': 'bot/play_turn',
+    'max_income_strategy': 'bot/strategy_1',
+    'min_action_max_floor': 'bot/strategy_2',
+    'random_strategy': 'bot/strategy_3',
+    'min_money_start_floor': 'bot/strategy_4',
+    'min_money_second_floor': 'bot/strategy_5',
+    'mcts_strategy': 'bot/strategy_6',
+}
+
+# Profile
+class Profile:
+    def __init__(self):
+        self.calls = defaultdict(int)
+        self.seconds = defaultdict(float)
+
+    def merge(self, other):
+        for phase, calls in other.calls.items():
+            self.calls[phase] += calls
+        for phase, seconds in other.seconds.items():
+            self.seconds[phase] += seconds
+
+    def to_dict(self):
+        # Times are inclusive: a phase contains the phases it calls
+        return {phase: {'calls': self.calls[phase], 'seconds': self.seconds[phase]} for phase in sorted(self.calls)}
+
+    @staticmethod
+    def from_dict(data):
+        profile = Profile()
+        for phase, values in data.items():
+            profile.calls[phase] = values['calls']
+            profile.seconds[phase] = values['seconds']
+        return profile
+
+    def format(self):
+        lines = [f"{'phase':28} {'calls':>10} {'total s':>10} {'per call us':>12}"]
+        for phase in sorted(self.seconds, key=self.seconds.get, reverse=True):
+            calls = self.calls[phase]
+            per_call = self.seconds[phase] / calls * 1e6 if calls else 0.0
+            lines.append(f"{phase:28} {calls:10d} {self.seconds[phase]:10.3f} {per_call:12.1f}")
+        return "\n".join(lines)
+
+def make_timed(method, phase, profile):
+    calls = profile.calls
+    seconds = profile.seconds
+
+    def timed(*args, **kwargs):
+        start = perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            seconds[phase] += perf_counter() - start
+            calls[phase] += 1
+    return timed
+
+# Instrumentation
+class Instrumentation:
+    def __init__(self, profile=None):
+        self.profile = profile if profile is not None else Profile()
+        self.attached = []  # (object, method name)
+
+    def attach_object(self, obj, phases, prefix=''):
+        for name, phase in phases.items():
+            if name in vars(obj):
+                continue  # already wrapped
+            setattr(obj, name, make_timed(getattr(obj, name), prefix + phase, self.profile))
+            self.attached.append((obj, name))
+
+    def attach_game(self, game):
+        # Game.restore replaces the moves system and event bus, so attach after cloning
+        self.attach_object(game, GAME_PHASES)
+        self.attach_object(game.game_moves_system, MOVES_PHASES)
+        self.attach_object(game.event_bus, EVENT_BUS_PHASES)
+
+    def attach_bots(self, bots):
+        for bot in bots:
+            self.attach_object(bot, BOT_PHASES)
+
+    def detach(self):
+        for obj, name in self.attached:
+            vars(obj).pop(name, None)
+        self.attached = []
+
+def play_profiled_game(game_seed, strategies, mcts_options=None):
+    # Plays the same game as simulation.play_game and returns its record with its profile
+    game, bots = create_game(game_seed, strategies, mcts_options)
+    instrumentation = Instrumentation()
+    instrumentation.attach_game(game)
+    instrumentation.attach_bots(bots.values())
+    start = perf_counter()
+    record = play_to_end(game, bots)
+    instrumentation.profile.seconds['game'] += perf_counter() - start
+    instrumentation.profile.calls['game'] += 1
+    return record, instrumentation.profile.to_dict()
+
+def profile_tournament(num_games=10, strategies=(1, 2, 3, 4), seed=None, workers=1, per_game=False, mcts_options=None):
+    strategies = list(strategies)
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(64)
+    game_seeds = make_game_seeds(num_games, seed)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    play = partial(play_profiled_game, strategies=strategies, mcts_options=mcts_options)
+    if workers <= 1:
+        results = [play(game_seed) for game_seed in game_seeds]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(play, game_seeds, chunksize=max(1, num_games // (workers * 4))))
+    total = Profile()
+    games = []
+    for record, profile in results:
+        total.merge(Profile.from_dict(profile))
+        if per_game:
+            games.append({'seed': record['seed'], 'winner': record['winner'], 'turns': record['turns'], 'profile': profile})
+    report = {'strategies': strategies, 'seed': seed, 'num_games': num_games, 'total': total.to_dict()}
+    if per_game:
+        report['games'] = games
+    return report
+
+def write_profile(report, path):
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    report = profile_tournament(20, seed=1)
+    print(Profile.from_dict(report['total']).format())
@@ -0,0 +1,203 @@
+import atexit
+import itertools
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from diceville_game import Game
+
+# Search budget per decision; the time budget, when set, stops the search early.
+# rollouts=None leaves the time budget alone in charge.
+DEFAULT_ROLLOUTS = 64
+DEFAULT_TIME_BUDGET = None
+DEFAULT_ROLLOUT_TURNS = 16
+DEFAULT_ROLLOUT_STRATEGY = 3
+EXPLORATION = 1.4
+
+END_TURN = ('end',)
+
+# Actions
+def get_legal_actions(game, player):
+    # Tiles of the same surface are interchangeable for building, so one tile per
+    # surface is enough; the same goes for buying tiles with the same surface.
+    actions = [END_TURN]
+    money = game.player_money[player]
+    hand = game.player_hand_of_cards[player]
+    main_base = game.get_main_building_for_player(player)
+    for floor_id, floor in enumerate(main_base.floors):
+        if not floor.is_active and money >= game.get_floor_price(floor_id):
+            actions.append(('buy_floor', floor_id))
+    for card_id, card in enumerate(hand.hand):
+        if card and game.can_player_purchase_building(player, card):
+            if game.get_all_available_for_build_map_tiles_for_player_with_surface(player, card.requirement_tile_surface):
+                actions.append(('build', card_id, card.id))
+    if money >= game.get_buy_tile_cost(player):
+        seen_surfaces = set()
+        for position in game.get_all_purchasable_tile_positions_for_player(player):
+            surface = game.game_map.get_surface(position)
+            if surface not in seen_surfaces:
+                seen_surfaces.add(surface)
+                actions.append(('buy_tile', position))
+    if hand.ability_to_replace_card_count > 0 and hand.deck.get_pool_size() > 0:
+        for card_id, card in enumerate(hand.hand):
+            if card:
+                actions.append(('replace', card_id, card.id))
+    return actions
+
+def apply_action(game, player, action):
+    # Returns False when the action cannot be played in this state; the caller spends the step
+    kind = action[0]
+    if kind == 'end':
+        return False
+    hand = game.player_hand_of_cards[player]
+    if kind == 'buy_floor':
+        success = game.buy_floor(player, action[1])
+    elif kind == 'build':
+        card = hand.hand[action[1]]
+        if card is None or card.id != action[2] or not game.can_player_purchase_building(player, card):
+            return False
+        tiles = game.get_all_available_for_build_map_tiles_for_player_with_surface(player, card.requirement_tile_surface)
+        if not tiles:
+            return False
+        building = hand.use_building(action[1])
+        success = game.builder_on_tile.set_building_for_build_on_tile(building, tiles[0], player)
+    elif kind == 'buy_tile':
+        success = game.buy_tile(player, action[1])
+    elif kind == 'replace':
+        card = hand.hand[action[1]]
+        if card is None or card.id != action[2] or hand.ability_to_replace_card_count <= 0:
+            return False
+        hand.replace_card(action[1])
+        success = True
+    else:
+        return False
+    return success
+
+# Tree
+class Node:
+    def __init__(self, parent=None, action=None):
+        self.parent = parent
+        self.action = action
+        self.children = {}
+        self.untried_actions = None
+        self.visits = 0
+        self.value = 0.0
+
+    def select_child(self):
+        log_visits = math.log(self.visits)
+        return max(self.children.values(),
+                   key=lambda c: c.value / c.visits + EXPLORATION * math.sqrt(log_visits / c.visits))
+
+def evaluate(game, player):
+    # 1 for a win, 0 for a loss; unfinished games score by the share of progress,
+    # where progress is activated floors plus money towards the next one
+    winner = game.get_winner()
+    if winner is not None:
+        return 1.0 if winner == player else 0.0
+    progress = {p: game.floor_leaderboard.get_floor_count(p) + game.player_money[p] / 10 for p in game.players}
+    total = sum(progress.values())
+    return progress[player] / total if total > 0 else 1.0 / len(game.players)
+
+def rollout(game, player, rng, rollout_turns, rollout_strategy):
+    from simulation import Bot
+    # Finish the searched turn, then let policy bots play every seat
+    bots = {p: Bot(rollout_strategy, p, random.Random(rng.getrandbits(64))) for p in game.players}
+    game.game_moves_system.make_turn()
+    for _ in range(rollout_turns):
+        if game.is_game_over:
+            break
+        current = game.game_moves_system.get_current_turn_player()
+        bots[current].play_turn(game)
+        game.game_moves_system.make_turn()
+    return evaluate(game, player)
+
+def search(snapshot, player, seed, rollouts=DEFAULT_ROLLOUTS, time_budget=DEFAULT_TIME_BUDGET,
+           rollout_turns=DEFAULT_ROLLOUT_TURNS, rollout_strategy=DEFAULT_ROLLOUT_STRATEGY):
+    # Open-loop UCT over the rest of the current turn. Every iteration restores the
+    # snapshot with fresh dice and deck seeds, so the search cannot see future rolls.
+    if rollouts is None and time_budget is None:
+        raise ValueError("a search without a rollout count needs a time budget")
+    rng = random.Random(seed)
+    root = Node()
+    deadline = time.perf_counter() + time_budget if time_budget is not None else None
+    game = Game.__new__(Game)  # restored in place every iteration, reusing its objects
+    for _ in (itertools.count() if rollouts is None else range(rollouts)):
+        if deadline is not None and time.perf_counter() > deadline:
+            break
+        game.restore(snapshot, rng.getrandbits(64))
+        node = root
+        turn_over = False
+        while not turn_over:
+            if node.untried_actions is None:
+                node.untried_actions = get_legal_actions(game, player)
+                rng.shuffle(node.untried_actions)
+            if node.untried_actions:
+                action = node.untried_actions.pop()
+                child = node.children[action] = Node(node, action)
+            elif node.children:
+                child = node.select_child()
+                action = child.action
+            else:
+                break
+            node = child
+            if apply_action(game, player, action):
+                game.game_moves_system.make_move()
+                turn_over = not game.game_moves_system.can_make_move()
+            else:
+                turn_over = True
+            if child.visits == 0:
+                break
+        value = rollout(game, player, rng, rollout_turns, rollout_strategy)
+        while node is not None:
+            node.visits += 1
+            node.value += value
+            node = node.parent
+    return {action: (child.visits, child.value) for action, child in root.children.items()}
+
+# Root parallelization: independent trees per worker, merged by visit counts
+_executor = None
+_executor_workers = 0
+
+def get_executor(workers):
+    global _executor, _executor_workers
+    if _executor is None or _executor_workers != workers:
+        shutdown_executor()
+        _executor = ProcessPoolExecutor(max_workers=workers)
+        _executor_workers = workers
+    return _executor
+
+@atexit.register
+def shutdown_executor():
+    # The pool lives across decisions; close it when the searches are over, or at exit
+    global _executor, _executor_workers
+    if _executor is not None:
+        _executor.shutdown()
+        _executor = None
+        _executor_workers = 0
+
+def choose_action(game, player, rng, rollouts=DEFAULT_ROLLOUTS, time_budget=DEFAULT_TIME_BUDGET,
+                  rollout_turns=DEFAULT_ROLLOUT_TURNS, rollout_strategy=DEFAULT_ROLLOUT_STRATEGY, workers=1):
+    actions = get_legal_actions(game, player)
+    if len(actions) == 1:
+        return actions[0]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    snapshot = game.snapshot()
+    if workers <= 1:
+        stats = [search(snapshot, player, rng.getrandbits(64), rollouts, time_budget, rollout_turns, rollout_strategy)]
+    else:
+        share = None if rollouts is None else max(1, rollouts // workers)
+        executor = get_executor(workers)
+        futures = [executor.submit(search, snapshot, player, rng.getrandbits(64), share, time_budget, rollout_turns, rollout_strategy)
+                   for _ in range(workers)]
+        stats = [future.result() for future in futures]
+    totals = {}
+    for worker_stats in stats:
+        for action, (visits, value) in worker_stats.items():
+            total_visits, total_value = totals.get(action, (0, 0.0))
+            totals[action] = (total_visits + visits, total_value + value)
+    if not totals:
+        return END_TURN
+    return max(totals, key=lambda a: (totals[a][0], totals[a][1]))
@@ -0,0 +1,228 @@
+import struct
+
+from diceville_game import Game, GameRules
+
+# Log format: a header followed by fixed-width 10-byte events
+#   event: kind (uint8), seat (int8, -1 for none), a (int32), b (int32)
+# Version 2 widened the map size to uint16 and a, b to int32: version 1 could not hold
+# maps over 255 cells a side, tile indices over 65535 or large balances.
+HEADER = struct.Struct('<4sBBHHQ')  # magic, version, players, map width, map height, seed
+EVENT = struct.Struct('<Bbii')
+MAGIC = b'DVRL'
+VERSION = 2
+MAX_MAP_SIDE = 2 ** 16 - 1
+
+# Actions: replaying them drives the game
+TURN = 1        # a: 0, b: turn number
+THROW = 2       # a: number of dice
+STEP = 3        # a step spent by the current player
+BUILD = 4       # a: hand slot, b: tile index
+BUY_TILE = 5    # b: tile index
+BUY_FLOOR = 6   # a: floor id
+REPLACE = 7     # a: hand slot
+RETURN = 8      # the last used card goes back to the hand
+# Checks: produced by the engine, compared against the replayed game
+DICE = 16       # a: dice sum, b: first die * 8 + second die
+DRAW = 17       # a: hand slot, b: card id (0 for an empty draw)
+MONEY = 18      # a: change, b: new balance
+HAND = 19       # initial hand: a: slot, b: card id
+
+ACTIONS = {TURN, THROW, STEP, BUILD, BUY_TILE, BUY_FLOOR, REPLACE, RETURN}
+EVENT_NAMES = {TURN: 'turn', THROW: 'throw', STEP: 'step', BUILD: 'build', BUY_TILE: 'buy_tile',
+               BUY_FLOOR: 'buy_floor', REPLACE: 'replace', RETURN: 'return', DICE: 'dice', DRAW: 'draw', MONEY: 'money', HAND: 'hand'}
+
+# Recorder: wraps the methods of one game's objects and appends events to a bytearray.
+# Attach it right after the game is created: the replay starts from the seeded initial state.
+class Recorder:
+    def __init__(self, game):
+        if not 0 <= game.seed < 2 ** 64:
+            raise ValueError("only games with a 64-bit seed can be recorded")
+        if game.rules.to_dict() != GameRules(map_size=game.rules.map_size).to_dict():
+            raise ValueError("only games with the default rules can be recorded")
+        if max(game.game_map.size) > MAX_MAP_SIDE:
+            raise ValueError(f"only maps up to {MAX_MAP_SIDE} tiles a side can be recorded")
+        self.game = game
+        self.seats = {p: i for i, p in enumerate(game.players)}
+        self.money = dict(game.player_money)
+        self.turn = 0
+        self.data = bytearray(HEADER.pack(MAGIC, VERSION, len(game.players), game.game_map.size[0],
+                                          game.game_map.size[1], game.seed))
+        for player, hand in game.player_hand_of_cards.items():
+            for slot, card in enumerate(hand.hand):
+                self.emit(HAND, player, slot, card.id if card else 0)
+        for player in game.players:
+            self.emit(MONEY, player, 0, game.player_money[player])
+        self.attach()
+
+    def emit(self, kind, player=None, a=0, b=0):
+        seat = self.seats[player] if player in self.seats else -1
+        try:
+            self.data += EVENT.pack(kind, seat, a, b)
+        except struct.error:
+            raise ValueError(f"{EVENT_NAMES.get(kind, kind)} event does not fit the log: a={a} b={b}") from None
+
+    def check_money(self):
+        money = self.game.player_money
+        for player, balance in money.items():
+            if balance != self.money[player]:
+                self.emit(MONEY, player, balance - self.money[player], balance)
+                self.money[player] = balance
+
+    def wrap(self, obj, name, before=None, after=None):
+        method = getattr(obj, name)
+
+        def recorded(*args):
+            if before is not None:
+                before(*args)
+            result = method(*args)
+            if after is not None:
+                after(result, *args)
+            self.check_money()
+            return result
+        setattr(obj, name, recorded)
+
+    def attach(self):
+        game = self.game
+        moves = game.game_moves_system
+
+        def current_player():
+            return moves.get_current_turn_player()
+
+        def on_turn():
+            self.turn += 1
+            self.emit(TURN, None, 0, self.turn)
+
+        def on_throw(two_dice=False):
+            self.emit(THROW, current_player(), 2 if two_dice else 1)
+
+        def after_throw(result, two_dice=False):
+            values = game.thrown_dice_values
+            self.emit(DICE, current_player(), game.sum_of_thrown_dice, values[0] * 8 + (values[1] if len(values) > 1 else 0))
+
+        def on_build(building, tile, player):
+            hand = game.player_hand_of_cards[player]
+            self.emit(BUILD, player, hand.last_wasted_building_id, tile.index)
+
+        def on_buy_tile(player, position):
+            self.emit(BUY_TILE, player, 0, game.game_map.get_index(position))
+
+        def on_buy_floor(player, floor_id):
+            self.emit(BUY_FLOOR, player, floor_id)
+
+        self.wrap(moves, 'make_turn', on_turn)
+        self.wrap(moves, 'make_move', lambda: self.emit(STEP, current_player()))
+        self.wrap(game, 'player_throw_dice', on_throw, after_throw)
+        self.wrap(game.builder_on_tile, 'set_building_for_build_on_tile', on_build)
+        self.wrap(game, 'buy_tile', on_buy_tile)
+        self.wrap(game, 'buy_floor', on_buy_floor)
+        for player, hand in game.player_hand_of_cards.items():
+            self.wrap(hand, 'replace_card', lambda slot, player=player: self.emit(REPLACE, player, slot))
+            self.wrap(hand, 'return_last_wasted_building', lambda player=player: self.emit(RETURN, player))
+            self.wrap(hand, 'add_building', None,
+                      lambda building, slot, player=player: self.emit(DRAW, player, slot, building.id if building else 0))
+
+    def get_bytes(self):
+        return bytes(self.data)
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(self.data)
+
+# Reading
+def read_header(data):
+    if len(data) < 5 or data[:4] != MAGIC:
+        raise ValueError("not a replay log")
+    if data[4] != VERSION:
+        raise ValueError(f"unsupported replay log version {data[4]}, expected {VERSION}")
+    magic, version, num_players, width, height, seed = HEADER.unpack_from(data, 0)
+    return {'num_players': num_players, 'map_size': (width, height), 'seed': seed}
+
+def iter_events(data):
+    for offset in range(HEADER.size, len(data), EVENT.size):
+        yield EVENT.unpack_from(data, offset)
+
+def load(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+def describe_event(event):
+    kind, seat, a, b = event
+    return f"{EVENT_NAMES.get(kind, kind)} seat={seat} a={a} b={b}"
+
+# Replayer: rebuilds the game from its seed and re-executes the logged actions
+class Replayer:
+    def __init__(self, data):
+        self.data = data
+        header = read_header(data)
+        self.game = Game(num_players=header['num_players'], map_size=header['map_size'], seed=header['seed'])
+        self.recorder = Recorder(self.game)
+        self.events = list(iter_events(data))
+        self.position = 0
+        self.turn = 0
+
+    def apply(self, event):
+        kind, seat, a, b = event
+        game = self.game
+        player = game.players[seat] if seat >= 0 else None
+        if kind == TURN:
+            game.game_moves_system.make_turn()
+            self.turn += 1
+        elif kind == THROW:
+            game.player_throw_dice(a == 2)
+        elif kind == STEP:
+            game.game_moves_system.make_move()
+        elif kind == BUILD:
+            building = game.player_hand_of_cards[player].use_building(a)
+            tile = game.game_map.get_tile_by_index(b)
+            game.builder_on_tile.set_building_for_build_on_tile(building, tile, player)
+        elif kind == BUY_TILE:
+            game.buy_tile(player, game.game_map.get_position(b))
+        elif kind == BUY_FLOOR:
+            game.buy_floor(player, a)
+        elif kind == REPLACE:
+            game.player_hand_of_cards[player].replace_card(a)
+        elif kind == RETURN:
+            game.player_hand_of_cards[player].return_last_wasted_building()
+
+    def step_turn(self):
+        # Replays up to and including the next TURN event; False at the end of the log
+        while self.position < len(self.events):
+            event = self.events[self.position]
+            self.position += 1
+            if event[0] in ACTIONS:
+                self.apply(event)
+                if event[0] == TURN:
+                    return True
+        return False
+
+    def get_first_mismatch(self):
+        # Index of the first event where the replayed game differs from the log, or None
+        replayed = list(iter_events(self.recorder.get_bytes()))
+        for index, (original, event) in enumerate(zip(self.events, replayed)):
+            if original != event:
+                return index
+        if len(replayed) != len(self.events) and self.position >= len(self.events):
+            return min(len(replayed), len(self.events))
+        return None
+
+def replay_game(data):
+    # Replays the whole log and reports whether the engine reproduced every event
+    replayer = Replayer(data)
+    while replayer.step_turn():
+        pass
+    mismatch = replayer.get_first_mismatch()
+    return {
+        'turns': replayer.turn,
+        'events': len(replayer.events),
+        'matches': mismatch is None,
+        'first_mismatch': mismatch,
+        'expected': describe_event(replayer.events[mismatch]) if mismatch is not None and mismatch < len(replayer.events) else None,
+        'game': replayer.game,
+    }
+
+if __name__ == "__main__":
+    import sys
+    for path in sys.argv[1:]:
+        report = replay_game(load(path))
+        status = "ok" if report['matches'] else f"diverged at event {report['first_mismatch']} ({report['expected']})"
+        print(f"{path}: {report['turns']} turns, {report['events']} events, {status}")
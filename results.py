@@ -0,0 +1,149 @@
+import csv
+import json
+import os
+import time
+from collections import defaultdict
+
+from simulation import OUTCOME_WIN, OUTCOME_TIMEOUT
+
+# Per-game records as produced by simulation.play_game; CSV flattens the per-seat lists
+RECORD_FIELDS = ('seed', 'strategies', 'winner', 'winner_seat', 'outcome', 'turns', 'turns_saved', 'money', 'floors')
+SEAT_FIELDS = ('strategies', 'money', 'floors')
+
+def guess_format(path):
+    return 'csv' if path.endswith('.csv') else 'jsonl'
+
+def parse_optional_int(value):
+    return int(value) if value not in ('', None) else None
+
+def get_outcome(record):
+    # Files written before outcomes were recorded only tell a win from an unfinished game
+    if 'outcome' in record:
+        return record['outcome']
+    return OUTCOME_WIN if record['winner'] is not None else OUTCOME_TIMEOUT
+
+# ResultsWriter: append-only output, flushed in batches
+class ResultsWriter:
+    def __init__(self, path, output_format=None, batch_size=1000, flush_interval=5.0):
+        self.path = path
+        self.output_format = output_format or guess_format(path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.buffer = []
+        self.last_flush = time.monotonic()
+        self.file = open(path, 'a', newline='' if self.output_format == 'csv' else None)
+        self.csv_writer = None
+        self.is_new_file = self.file.tell() == 0
+
+    def write(self, record):
+        if self.output_format == 'csv' and self.csv_writer is None:
+            self.start_csv(record)
+        self.buffer.append(record)
+        if len(self.buffer) >= self.batch_size or time.monotonic() - self.last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            if self.output_format == 'csv':
+                self.write_csv_rows(self.buffer)
+            else:
+                self.file.write(''.join(json.dumps(record) + '\n' for record in self.buffer))
+            self.buffer = []
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.last_flush = time.monotonic()
+
+    def start_csv(self, record):
+        # The header follows the seat count of the first record; appended rows must match the file's header
+        num_seats = len(record['strategies'])
+        header = ['seed', 'winner', 'winner_seat', 'outcome', 'turns', 'turns_saved']
+        for field in SEAT_FIELDS:
+            header.extend(f"{field}_{seat}" for seat in range(num_seats))
+        if not self.is_new_file:
+            with open(self.path, newline='') as f:
+                existing = next(csv.reader(f), None)
+            if existing != header:
+                raise ValueError(f"{self.path}: existing CSV header {existing} does not match {header}")
+        self.csv_writer = csv.writer(self.file)
+        if self.is_new_file:
+            self.csv_writer.writerow(header)
+
+    def write_csv_rows(self, records):
+        for record in records:
+            row = [record['seed'], record['winner'], record['winner_seat'], record['outcome'], record['turns'], record['turns_saved']]
+            for field in SEAT_FIELDS:
+                row.extend(record[field])
+            self.csv_writer.writerow(['' if value is None else value for value in row])
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+# Reading: records are parsed lazily and handed out in chunks
+def iter_records(path, input_format=None):
+    input_format = input_format or guess_format(path)
+    with open(path, newline='' if input_format == 'csv' else None) as f:
+        if input_format == 'csv':
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                return
+            for row in reader:
+                if row == header:
+                    continue  # a header repeated by a writer that reopened the file
+                values = dict(zip(header, row))
+                record = {
+                    'seed': int(values['seed']),
+                    'winner': parse_optional_int(values['winner']),
+                    'winner_seat': parse_optional_int(values['winner_seat']),
+                    'turns': int(values['turns']),
+                    'turns_saved': int(values.get('turns_saved') or 0),
+                }
+                record['outcome'] = values.get('outcome') or get_outcome(record)
+                for field in SEAT_FIELDS:
+                    record[field] = [int(values[name]) for name in header if name.rsplit('_', 1)[0] == field]
+                yield record
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+def read_results(path, chunk_size=10000, input_format=None):
+    chunk = []
+    for record in iter_records(path, input_format):
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def summarize_results(path, chunk_size=10000, input_format=None):
+    # Win counts, outcomes and average game length, computed one chunk at a time
+    num_games = 0
+    total_turns = 0
+    turns_saved = 0
+    wins = defaultdict(int)
+    outcomes = defaultdict(int)
+    for chunk in read_results(path, chunk_size, input_format):
+        for record in chunk:
+            num_games += 1
+            total_turns += record['turns']
+            turns_saved += record.get('turns_saved', 0)
+            outcomes[get_outcome(record)] += 1
+            if record['winner'] is not None:
+                wins[record['winner']] += 1
+    return {
+        'num_games': num_games,
+        'wins': dict(wins),
+        'winrates': {strategy: count / num_games for strategy, count in wins.items()} if num_games else {},
+        'average_turns': total_turns / num_games if num_games else 0.0,
+        'outcomes': dict(outcomes),
+        'turns_saved': turns_saved,
+    }
@@ -1,12 +1,22 @@
+import os
 import random
 from collections import defaultdict
-import matplotlib.pyplot as plt
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from diceville_game import Game, Player, BuildingType, SurfaceType, Floor
 
+# Порог дохода стратегии 1 по умолчанию; batch_engine берёт его отсюда же
+INCOME_THRESHOLD = 3
+
 class Bot:
-    def __init__(self, strategy, player):
+    def __init__(self, strategy, player, rng=None, mcts_options=None, income_threshold=INCOME_THRESHOLD):
         self.strategy = strategy
         self.player = player
+        self.rng = rng if rng is not None else random.Random()
+        # Параметры поиска для стратегии 6 (rollouts, time_budget, rollout_turns, rollout_strategy, workers)
+        self.mcts_options = mcts_options or {}
+        # Стратегия 1 строит только здания с доходом выше порога
+        self.income_threshold = income_threshold
 
     def play_turn(self, game):
         game.player_throw_dice()
@@ -14,29 +24,34 @@ class Bot:
         action_count = 0
 
         while game.game_moves_system.can_make_move():
-            success = False
-            if self.strategy == 1:
-                success = self.max_income_strategy(game)
-            elif self.strategy == 2:
-                success = self.min_action_max_floor(game)
-            elif self.strategy == 3:
-                success = self.random_strategy(game)
-            elif self.strategy == 4:
-                success = self.min_money_start_floor(game, action_count)
-            elif self.strategy == 5:
-                success = self.min_money_second_floor(game, action_count)
-            if success:
+            if self.take_action(game, action_count):
                 game.game_moves_system.make_move()
             else:
                 break  # Действие не выполнено, завершить ход
             action_count += 1
 
+    def take_action(self, game, action_count):
+        # Одно действие выбранной стратегии; False - действий больше нет
+        if self.strategy == 1:
+            return self.max_income_strategy(game)
+        elif self.strategy == 2:
+            return self.min_action_max_floor(game)
+        elif self.strategy == 3:
+            return self.random_strategy(game)
+        elif self.strategy == 4:
+            return self.min_money_start_floor(game, action_count)
+        elif self.strategy == 5:
+            return self.min_money_second_floor(game, action_count)
+        elif self.strategy == 6:
+            return self.mcts_strategy(game)
+        return False
+
     def try_buy_floor(self, game):
         player = self.player
         main_base = game.get_main_building_for_player(player)
-        affordable_floors = [i for i in range(len(main_base.floors)) if not main_base.floors[i].is_active and game.player_money[player] >= main_base.floors[i].price]
+        affordable_floors = [i for i in range(len(main_base.floors)) if not main_base.floors[i].is_active and game.player_money[player] >= game.get_floor_price(i)]
         if affordable_floors:
-            floor_id = random.choice(affordable_floors)
+            floor_id = self.rng.choice(affordable_floors)
             game.buy_floor(player, floor_id)
             return True
         return False
@@ -44,18 +59,35 @@ class Bot:
     def try_build(self, game):
         player = self.player
         hand = game.player_hand_of_cards[player].hand
-        available_tiles = game.get_all_available_for_build_map_tiles_for_player(player)
-        if not available_tiles:
+        if not game.does_player_have_available_tile_for_build(player):
             return False
         candidates = []
         for card_id, card in enumerate(hand):
             if card and game.can_player_purchase_building(player, card):
-                suitable_tiles = [t for t in available_tiles if t.surface == card.requirement_tile_surface or card.requirement_tile_surface == SurfaceType.ANY]
+                suitable_tiles = game.get_all_available_for_build_map_tiles_for_player_with_surface(player, card.requirement_tile_surface)
                 if suitable_tiles:
                     candidates.append((card_id, card, suitable_tiles))
         if candidates:
-            card_id, card, suitable_tiles = random.choice(candidates)
-            tile = random.choice(suitable_tiles)
+            card_id, card, suitable_tiles = self.rng.choice(candidates)
+            tile = self.rng.choice(suitable_tiles)
+            building = game.player_hand_of_cards[player].use_building(card_id)
+            game.builder_on_tile.set_building_for_build_on_tile(building, tile, player)
+            return True
+        return False
+
+    def try_build_income(self, game, income_threshold):
+        # Построить самое доходное здание из руки, если его доход выше порога
+        player = self.player
+        hand = game.player_hand_of_cards[player].hand
+        candidates = []
+        for card_id, card in enumerate(hand):
+            if card and game.can_player_purchase_building(player, card) and card.get_income_in_case_of_invoke(game) > income_threshold:
+                suitable_tiles = game.get_all_available_for_build_map_tiles_for_player_with_surface(player, card.requirement_tile_surface)
+                if suitable_tiles:
+                    candidates.append((card_id, card, suitable_tiles))
+        if candidates:
+            card_id, card, suitable_tiles = max(candidates, key=lambda x: x[1].get_income_in_case_of_invoke(game))
+            tile = self.rng.choice(suitable_tiles)
             building = game.player_hand_of_cards[player].use_building(card_id)
             game.builder_on_tile.set_building_for_build_on_tile(building, tile, player)
             return True
@@ -65,7 +97,7 @@ class Bot:
         player = self.player
         possible_positions = self.get_possible_buy_tiles(game, player)
         if possible_positions and game.player_money[player] >= game.get_buy_tile_cost(player):
-            pos = random.choice(possible_positions)
+            pos = self.rng.choice(possible_positions)
             game.buy_tile(player, pos)
             return True
         return False
@@ -74,43 +106,23 @@ class Bot:
         player = self.player
         hand = game.player_hand_of_cards[player]
         if hand.ability_to_replace_card_count > 0:
-            card_id = random.randint(0, 5)
+            card_id = self.rng.randint(0, 5)
             if hand.hand[card_id]:
                 hand.replace_card(card_id)
                 return True
         return False
 
     def get_possible_buy_tiles(self, game, player):
-        own_positions = [t.position for t in game.get_all_map_tiles_for_player(player)]
-        possible = []
-        for x in range(game.game_map.size[0]):
-            for y in range(game.game_map.size[1]):
-                tile = game.game_map.map[x][y]
-                if tile.owner == Player.NULL and tile.building is None:
-                    for ox, oy in own_positions:
-                        if abs(x - ox) + abs(y - oy) == 1:
-                            possible.append((x, y))
-                            break
-        return possible
+        return game.get_all_purchasable_tile_positions_for_player(player)
+
+    def get_expected_card_income(self, game, card, num_dice=1):
+        # Ожидаемый доход карты за раунд по точным таблицам кубиков, без симуляции
+        import expected_value
+        return expected_value.get_expected_building_value(game, card, self.player, num_dice)
 
     def max_income_strategy(self, game):
-        # Стратегия 1: Строить здания с высоким доходом, если доход > 3
-        player = self.player
-        hand = game.player_hand_of_cards[player].hand
-        available_tiles = game.get_all_available_for_build_map_tiles_for_player(player)
-        if not available_tiles:
-            return self.try_buy_floor(game) or self.try_buy_tile(game)
-        candidates = []
-        for card_id, card in enumerate(hand):
-            if card and game.can_player_purchase_building(player, card) and card.get_income_in_case_of_invoke(game) > 3:
-                suitable_tiles = [t for t in available_tiles if t.surface == card.requirement_tile_surface or card.requirement_tile_surface == SurfaceType.ANY]
-                if suitable_tiles:
-                    candidates.append((card_id, card, suitable_tiles))
-        if candidates:
-            card_id, card, suitable_tiles = max(candidates, key=lambda x: x[1].get_income_in_case_of_invoke(game))
-            tile = random.choice(suitable_tiles)
-            building = game.player_hand_of_cards[player].use_building(card_id)
-            game.builder_on_tile.set_building_for_build_on_tile(building, tile, player)
+        # Стратегия 1: Строить здания с высоким доходом, если доход > income_threshold (по умолчанию 3)
+        if game.does_player_have_available_tile_for_build(self.player) and self.try_build_income(game, self.income_threshold):
             return True
         return self.try_buy_floor(game) or self.try_buy_tile(game)
 
@@ -123,7 +135,7 @@ class Bot:
     def random_strategy(self, game):
         # Стратегия 3: Случайное действие
         actions = [self.try_buy_floor, self.try_build, self.try_buy_tile, self.try_replace_card]
-        random.shuffle(actions)
+        self.rng.shuffle(actions)
         for action in actions:
             if action(game):
                 return True
@@ -143,38 +155,224 @@ class Bot:
         else:
             return self.try_buy_floor(game) or self.try_buy_tile(game)
 
-def run_trials(num_games=10):
-    strategies = [1, 2, 3, 4]  # Стратегии 1-4 для 4 игроков; для 5 заменить одну
-    wins = defaultdict(int)
-    game_winners = []
+    def mcts_strategy(self, game):
+        # Стратегия 6: Поиск по дереву Монте-Карло с розыгрышами из копий игры
+        import mcts
+        action = mcts.choose_action(game, self.player, self.rng, **self.mcts_options)
+        return mcts.apply_action(game, self.player, action)
 
-    for game_num in range(num_games):
-        game = Game(num_players=4)
-        bots = {game.players[i]: Bot(strategies[i], game.players[i]) for i in range(4)}
+# StalemateDetector
+MAX_TURNS = 10000
+STALEMATE_ROUNDS = 5
+OUTCOME_WIN = 'win'
+OUTCOME_STALEMATE = 'stalemate'
+OUTCOME_TIMEOUT = 'timeout'
 
-        turn_count = 0
-        while not game.is_game_over and turn_count < 10000:  # Предотвратить бесконечный цикл
-            player = game.game_moves_system.get_current_turn_player()
-            bots[player].play_turn(game)
-            game.game_moves_system.make_turn()
-            turn_count += 1
+class StalemateDetector:
+    # Тупик: stalemate_rounds полных кругов никто не купил этаж, не построил здание, не купил клетку
+    # и не сменил карту, и ни у кого деньги уже ничего не изменят: либо деньги игрока не меняются
+    # ни при каком броске того числа кубиков, что бросали в партии, либо всё это окно ему хватало
+    # на любую покупку. Тогда боты каждый ход принимают те же решения, и партия уже не сдвинется.
+    def __init__(self, game, stalemate_rounds=STALEMATE_ROUNDS):
+        self.game = game
+        self.stalemate_rounds = stalemate_rounds
+        self.fingerprint = None
+        self.unchanged_rounds = 0
+        self.rich_rounds = {p: 0 for p in game.players}
+        self.turn_count = 0
+        self.dice_counts = set()
 
-        # Найти победителя
+    def is_stalemate(self):
+        # Вызывается после каждого хода; состояние сравнивается раз в круг
+        self.dice_counts.add(2 if self.game.is_thrown_two_dice else 1)
+        self.turn_count += 1
+        if self.turn_count % len(self.game.players):
+            return False
+        game = self.game
+        fingerprint = game.get_progress_fingerprint()
+        if fingerprint != self.fingerprint:
+            self.fingerprint = fingerprint
+            self.unchanged_rounds = 0
+            self.rich_rounds = {p: 0 for p in game.players}
+            return False
+        self.unchanged_rounds += 1
         for player in game.players:
-            main_base = game.get_main_building_for_player(player)
-            if main_base.get_count_of_activated_floors() == 7:
-                winner_strategy = bots[player].strategy
-                wins[winner_strategy] += 1
-                game_winners.append((game_num + 1, winner_strategy))
-                break
+            is_rich = game.player_money[player] >= game.get_max_price_for_player(player)
+            self.rich_rounds[player] = self.rich_rounds[player] + 1 if is_rich else 0
+        if self.unchanged_rounds < self.stalemate_rounds:
+            return False
+        self.unchanged_rounds = 0  # если кто-то ещё копит, следующая проверка - через целое окно
+        flowing = self.get_players_with_money_flow()
+        return all(player not in flowing or self.rich_rounds[player] >= self.stalemate_rounds for player in game.players)
+
+    def get_players_with_money_flow(self):
+        import expected_value
+        game = self.game
+        flowing = set()
+        for num_dice in self.dice_counts:
+            context = expected_value.IncomeContext(game, num_dice)
+            for roller in game.players:
+                flowing.update(p for p, amount in context.get_expected_income_for_roll(roller).items() if amount != 0)
+        # Кто платит другим, может дойти до нуля и получить 2 от первого этажа, поэтому в счёт идёт
+        # любое движение денег. Этажи платят через очередь главного здания, которую IncomeContext видит
+        # только у текущего игрока: первый этаж даёт 2 игроку без денег, коммуникационный - 1 самому богатому
+        for player in game.players:
+            communication = game.get_main_building_for_player(player).floors[Floor.COMMUNICATION_FLOOR.value]
+            if game.player_money[player] == 0 or (communication.is_active and game.is_player_most_rich(player)):
+                flowing.add(player)
+        return flowing
+
+# TournamentResult
+class TournamentResult:
+    def __init__(self, strategies, seed, game_seeds, num_games=None, keep_games=True):
+        self.strategies = strategies
+        self.seed = seed
+        self.game_seeds = game_seeds
+        self.num_games = len(game_seeds) if num_games is None else num_games
+        self.wins = defaultdict(int)
+        # При записи результатов в файл список партий в памяти не хранится
+        self.keep_games = keep_games
+        self.game_winners = []
+        # Исходы партий (win/stalemate/timeout) и ходы, сэкономленные остановкой тупиков
+        self.outcomes = defaultdict(int)
+        self.turns_saved = 0
+
+    def add_game(self, game_num, winner_strategy, outcome=None, turns_saved=0):
+        if outcome is None:
+            outcome = OUTCOME_WIN if winner_strategy is not None else OUTCOME_TIMEOUT
+        self.outcomes[outcome] += 1
+        self.turns_saved += turns_saved
+        if winner_strategy is not None:
+            self.wins[winner_strategy] += 1
+            if self.keep_games:
+                self.game_winners.append((game_num + 1, winner_strategy))
+
+def make_game_seeds(num_games, seed=None):
+    seed_rng = random.Random(seed)
+    return [seed_rng.getrandbits(64) for _ in range(num_games)]
+
+def create_game(game_seed, strategies, mcts_options=None, rules=None, bot_options=None):
+    # Каждая игра полностью определяется своим сидом, поэтому её можно сыграть в любом процессе
+    # rules - GameRules партии, bot_options - параметры Bot для всех мест, например {'income_threshold': 2}
+    game = Game(num_players=len(strategies), seed=game_seed, rules=rules)
+    bot_seeds = game.seed_stream.child('bot')
+    bots = {game.players[i]: Bot(strategies[i], game.players[i], bot_seeds.rng(game.players[i].name), mcts_options, **(bot_options or {}))
+            for i in range(len(strategies))}
+    return game, bots
+
+def play_game(game_seed, strategies, mcts_options=None, replay_dir=None):
+    game, bots = create_game(game_seed, strategies, mcts_options)
+    if replay_dir is None:
+        return play_to_end(game, bots)
+    # Журнал партии для replay.replay_game пишется в <replay_dir>/<сид>.dvr
+    from replay import Recorder
+    recorder = Recorder(game)
+    record = play_to_end(game, bots)
+    recorder.save(os.path.join(replay_dir, f"{game_seed}.dvr"))
+    return record
 
-    print("Результаты игр:")
-    for game_num, winner in game_winners:
-        print(f"Игра {game_num}: Победила стратегия {winner}")
+def play_to_end(game, bots, max_turns=MAX_TURNS, stalemate_rounds=STALEMATE_ROUNDS):
+    # stalemate_rounds=None - играть до победы или предела ходов, как раньше
+    detector = StalemateDetector(game, stalemate_rounds) if stalemate_rounds else None
+    turn_count = 0
+    outcome = OUTCOME_TIMEOUT
+    while turn_count < max_turns:  # Предотвратить бесконечный цикл
+        if game.is_game_over:
+            outcome = OUTCOME_WIN
+            break
+        player = game.game_moves_system.get_current_turn_player()
+        bots[player].play_turn(game)
+        game.game_moves_system.make_turn()
+        turn_count += 1
+        if detector is not None and detector.is_stalemate():
+            outcome = OUTCOME_STALEMATE
+            break
+    else:
+        if game.is_game_over:
+            outcome = OUTCOME_WIN
+    turns_saved = max_turns - turn_count if outcome == OUTCOME_STALEMATE else 0
+    return make_game_record(game, bots, turn_count, outcome, turns_saved)
+
+def make_game_record(game, bots, turn_count, outcome=None, turns_saved=0):
+    # Одна запись на партию: сид, рассадка, победитель, исход (win/stalemate/timeout), число ходов,
+    # сколько ходов сэкономила остановка тупика, деньги и этажи по местам
+    winner = game.get_winner()
+    if outcome is None:
+        outcome = OUTCOME_WIN if winner is not None else OUTCOME_TIMEOUT
+    return {
+        'seed': game.seed,
+        'strategies': [bots[p].strategy for p in game.players],
+        'winner': bots[winner].strategy if winner is not None else None,
+        'winner_seat': game.players.index(winner) if winner is not None else None,
+        'outcome': outcome,
+        'turns': turn_count,
+        'turns_saved': turns_saved,
+        'money': [game.player_money[p] for p in game.players],
+        'floors': [game.floor_leaderboard.get_floor_count(p) for p in game.players],
+    }
+
+def iter_games(game_seeds, strategies, workers=1, chunk_size=None, mcts_options=None, replay_dir=None):
+    # Записи выдаются по порядку сидов; в пул отправляется только окно партий, а не весь турнир
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1:
+        for game_seed in game_seeds:
+            yield play_game(game_seed, strategies, mcts_options, replay_dir)
+        return
+    if chunk_size is None:
+        chunk_size = max(1, min(len(game_seeds) // (workers * 4), 1000))
+    window = chunk_size * workers * 4
+    play = partial(play_game, strategies=strategies, mcts_options=mcts_options, replay_dir=replay_dir)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for start in range(0, len(game_seeds), window):
+            yield from executor.map(play, game_seeds[start:start + window], chunksize=chunk_size)
+
+def play_games(game_seeds, strategies, workers=1, chunk_size=None, mcts_options=None, replay_dir=None):
+    return list(iter_games(game_seeds, strategies, workers, chunk_size, mcts_options, replay_dir))
+
+def run_trials(num_games=10, strategies=(1, 2, 3, 4), seed=None, workers=1, chunk_size=None, mcts_options=None,
+               output=None, output_format=None, replay_dir=None, plot=False, verbose=True):
+    # Стратегии 1-4 для 4 игроков; для 5 заменить одну, 6 - бот MCTS
+    # workers=None - по числу ядер, workers=1 - последовательный прогон с теми же результатами
+    # mcts_options - бюджет поиска для стратегии 6, например {'rollouts': 32} или {'time_budget': 0.05}
+    # output - файл .jsonl/.csv, куда партии дописываются по мере завершения
+    # replay_dir - каталог для бинарных журналов партий (см. replay.py), по одному файлу на сид
+    # plot - True или имя файла: диаграмма winrate (matplotlib импортируется только в этом случае)
+    from results import ResultsWriter
+    strategies = list(strategies)
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(64)
+    game_seeds = make_game_seeds(num_games, seed)
+    result = TournamentResult(strategies, seed, game_seeds, keep_games=output is None)
+    if replay_dir is not None:
+        os.makedirs(replay_dir, exist_ok=True)
+
+    writer = ResultsWriter(output, output_format) if output is not None else None
+    try:
+        for game_num, record in enumerate(iter_games(game_seeds, strategies, workers, chunk_size, mcts_options, replay_dir)):
+            result.add_game(game_num, record['winner'], record['outcome'], record['turns_saved'])
+            if writer is not None:
+                writer.write(record)
+    finally:
+        if writer is not None:
+            writer.close()
+    wins = result.wins
+    game_winners = result.game_winners
+
+    if game_winners and verbose:
+        print("Результаты игр:")
+        for game_num, winner in game_winners:
+            print(f"Игра {game_num}: Победила стратегия {winner}")
+    if output is not None:
+        print(f"Результаты партий записаны в {output}")
 
     print("\nИтог:")
     for strat, count in wins.items():
         print(f"Стратегия {strat}: {count} побед")
+    outcomes = result.outcomes
+    print(f"Исходы: победа {outcomes[OUTCOME_WIN]}, тупик {outcomes[OUTCOME_STALEMATE]}, предел ходов {outcomes[OUTCOME_TIMEOUT]}")
+    if result.turns_saved:
+        print(f"Остановка тупиков сэкономила {result.turns_saved} ходов")
 
     # Анализ: Winrate каждой стратегии
     winrates = {strat: (count / num_games * 100) for strat, count in wins.items()}
@@ -182,14 +380,88 @@ def run_trials(num_games=10):
     for strat, wr in winrates.items():
         print(f"Стратегия {strat}: {wr:.2f}%")
 
-    # Диаграмма
+    if plot:
+        plot_winrates(winrates, None if plot is True else plot)
+
+    return result
+
+def plot_winrates(winrates, path=None):
+    # Диаграмма; без path окно показывается через plt.show()
+    import matplotlib.pyplot as plt
     plt.figure(figsize=(8, 5))
     plt.bar(winrates.keys(), winrates.values())
     plt.xlabel('Стратегия')
     plt.ylabel('Winrate (%)')
     plt.title('Winrate стратегий ботов')
-    plt.xticks(range(1, len(winrates)+1))
-    plt.show()
+    plt.xticks(sorted(winrates))
+    if path is None:
+        plt.show()
+    else:
+        plt.savefig(path)
+        plt.close()
+
+def parse_strategies(value):
+    return [int(strategy) for strategy in value.replace(',', ' ').split()]
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(prog='python -m simulation', description="Турнир ботов Diceville")
+    parser.add_argument('-n', '--games', type=int, default=10, help="число партий")
+    parser.add_argument('-s', '--strategies', type=parse_strategies, default=[1, 2, 3, 4],
+                        help="стратегии по местам, например 1,2,3,5 (6 - MCTS)")
+    parser.add_argument('--seed', type=int, help="сид турнира; без него берётся случайный")
+    parser.add_argument('-w', '--workers', type=int, default=1, help="число процессов, 0 - по числу ядер")
+    parser.add_argument('--chunk-size', type=int, help="партий на одну задачу пула")
+    parser.add_argument('-o', '--output', help="файл .jsonl/.csv для записей партий")
+    parser.add_argument('--format', choices=('jsonl', 'csv'), help="формат output, по умолчанию по расширению")
+    parser.add_argument('--replay-dir', help="каталог для журналов партий")
+    parser.add_argument('--mcts-rollouts', type=int, help="число розыгрышей MCTS на ход")
+    parser.add_argument('--mcts-time', type=float, help="бюджет времени MCTS на ход, секунды; без --mcts-rollouts ограничивает только он")
+    parser.add_argument('--plot', nargs='?', const='', metavar='FILE',
+                        help="нарисовать диаграмму winrate (в FILE, если указан)")
+    parser.add_argument('-q', '--quiet', action='store_true', help="не печатать победителя каждой партии")
+    parser.add_argument('--until', choices=('best', 'pair'),
+                        help="адаптивный турнир: остановиться, когда ясна лучшая стратегия или исход пары (--games - предел)")
+    parser.add_argument('--pair', type=parse_strategies, default=None, help="две стратегии для --until pair, например 2,4")
+    parser.add_argument('--confidence', type=float, default=0.95)
+    parser.add_argument('--min-games', type=int, default=30, help="не останавливаться раньше этого числа партий")
+    args = parser.parse_args(argv)
+
+    mcts_options = {}
+    if args.mcts_rollouts is not None:
+        mcts_options['rollouts'] = args.mcts_rollouts
+    if args.mcts_time is not None:
+        mcts_options['time_budget'] = args.mcts_time
+        # Только время: число розыгрышей не ограничено
+        mcts_options.setdefault('rollouts', None)
+    if args.until is not None:
+        return run_adaptive(args, mcts_options or None)
+    plot = False if args.plot is None else args.plot or True
+    result = run_trials(args.games, args.strategies, args.seed, args.workers or None, args.chunk_size,
+                        mcts_options or None, args.output, args.format, args.replay_dir, plot, not args.quiet)
+    print(f"\nСид турнира: {result.seed}")
+    return 0
+
+def run_adaptive(args, mcts_options):
+    import adaptive
+    if args.until == 'pair':
+        if args.pair is None or len(args.pair) != 2:
+            raise SystemExit("--until pair требует --pair A,B")
+        missing = [strategy for strategy in args.pair if strategy not in args.strategies]
+        if missing:
+            raise SystemExit(f"стратегий {missing} нет в составе {args.strategies}")
+        if args.pair[0] == args.pair[1]:
+            raise SystemExit("--pair требует две разные стратегии")
+        rule = adaptive.PairRule(args.pair[0], args.pair[1], args.confidence)
+    else:
+        rule = adaptive.BestStrategyRule(args.strategies, args.confidence)
+    report = adaptive.run_adaptive_trials(args.games, args.strategies, rule, args.seed, args.workers or None,
+                                          args.min_games, chunk_size=args.chunk_size, mcts_options=mcts_options,
+                                          output=args.output, output_format=args.format)
+    adaptive.print_report(report)
+    print(f"\nСид турнира: {report['result'].seed}")
+    return 0
 
-# Запуск
-run_trials(10)
\ No newline at end of file
+# Запуск: python -m simulation --games 100 --strategies 1,2,3,5 --workers 0
+if __name__ == "__main__":
+    raise SystemExit(main())
\ No newline at end of file
@@ -0,0 +1,153 @@
+import hashlib
+import itertools
+import json
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from diceville_game import GameRules
+from simulation import create_game, play_to_end, make_game_seeds, OUTCOME_STALEMATE
+
+# A grid maps parameter paths to the values to try; every combination is one point.
+#   'strategies'                    lineup, e.g. [(1, 2, 3, 4), (1, 2, 3, 5)]
+#   'rules.<name>'                  a GameRules argument: starting_money, max_player_step_count, map_size, mines_income
+#   'rules.floor_prices.<floor id>' price of one floor
+#   'rules.card_prices.<card id>'   price of one card
+#   'bot.<name>'                    a Bot argument for every seat, e.g. income_threshold
+# Example: {'rules.starting_money': [5, 10, 15], 'bot.income_threshold': [2, 3, 4]}
+DEFAULT_STRATEGIES = (1, 2, 3, 4)
+# Bump when a change to the engine or the bots makes cached results stale
+CACHE_VERSION = 2
+
+def expand_grid(grid):
+    names = sorted(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+def make_point_config(point, num_games, seed):
+    # The full description of one tournament; its hash is the cache key
+    if num_games < 1:
+        raise ValueError(f"a sweep point needs at least one game, got {num_games}")
+    rule_args = {'floor_prices': {}, 'card_prices': {}}
+    bot_options = {}
+    strategies = DEFAULT_STRATEGIES
+    for path, value in point.items():
+        parts = path.split('.')
+        if parts == ['strategies']:
+            strategies = value
+        elif parts[0] == 'rules' and len(parts) == 3 and parts[1] in ('floor_prices', 'card_prices'):
+            rule_args[parts[1]][int(parts[2])] = value
+        elif parts[0] == 'rules' and len(parts) == 2:
+            rule_args[parts[1]] = value
+        elif parts[0] == 'bot' and len(parts) == 2:
+            bot_options[parts[1]] = value
+        else:
+            raise ValueError(f"unknown sweep parameter: {path}")
+    return {
+        'version': CACHE_VERSION,
+        'strategies': list(strategies),
+        'rules': GameRules(**rule_args).to_dict(),
+        'bot': bot_options,
+        'num_games': num_games,
+        'seed': seed,
+    }
+
+def get_config_key(config):
+    data = json.dumps(config, sort_keys=True).encode()
+    return hashlib.sha256(data).hexdigest()[:16]
+
+def play_sweep_game(task):
+    config, game_seed = task
+    game, bots = create_game(game_seed, config['strategies'], rules=GameRules.from_dict(config['rules']),
+                             bot_options=config['bot'])
+    return play_to_end(game, bots)
+
+def summarize_point(config, records):
+    wins = defaultdict(int)
+    seat_wins = [0] * len(config['strategies'])
+    for record in records:
+        if record['winner'] is not None:
+            wins[record['winner']] += 1
+            seat_wins[record['winner_seat']] += 1
+    num_games = len(records)
+    return {
+        'wins': {str(strategy): count for strategy, count in sorted(wins.items())},
+        'seat_wins': seat_wins,
+        'winrates': {str(strategy): count / num_games for strategy, count in sorted(wins.items())},
+        'unfinished': sum(record['winner'] is None for record in records),
+        'stalemates': sum(record['outcome'] == OUTCOME_STALEMATE for record in records),
+        'average_turns': sum(record['turns'] for record in records) / num_games,
+    }
+
+# Cache: one JSON file per point, named by its key
+def get_cache_path(cache_dir, key):
+    return os.path.join(cache_dir, f"{key}.json")
+
+def load_point(cache_dir, key):
+    path = get_cache_path(cache_dir, key)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+def save_point(cache_dir, key, entry):
+    # Written to a temporary file first, so an interrupted sweep never leaves half an entry
+    path = get_cache_path(cache_dir, key)
+    with open(path + '.tmp', 'w') as f:
+        json.dump(entry, f, indent=2)
+    os.replace(path + '.tmp', path)
+
+def run_sweep(grid, num_games=100, seed=0, cache_dir='sweep_cache', workers=None, chunk_size=None):
+    # Every point plays the same game seeds (common random numbers), so differences between
+    # points come from the settings, not from the draws. Points already in the cache are skipped.
+    os.makedirs(cache_dir, exist_ok=True)
+    game_seeds = make_game_seeds(num_games, seed)
+    results = []
+    pending = []
+    for point in expand_grid(grid):
+        config = make_point_config(point, num_games, seed)
+        key = get_config_key(config)
+        entry = load_point(cache_dir, key)
+        results.append({'point': point, 'key': key, 'cached': entry is not None,
+                        'summary': entry['summary'] if entry is not None else None})
+        if entry is None:
+            pending.append((len(results) - 1, config, key))
+
+    if pending:
+        tasks = [(config, game_seed) for _, config, _ in pending for game_seed in game_seeds]
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers <= 1:
+            records = map(play_sweep_game, tasks)
+            executor = None
+        else:
+            executor = ProcessPoolExecutor(max_workers=workers)
+            if chunk_size is None:
+                chunk_size = max(1, min(num_games // 4, len(tasks) // (workers * 4)))
+            records = executor.map(play_sweep_game, tasks, chunksize=chunk_size)
+        try:
+            # Results arrive in task order, so each point is saved as soon as its last game is in
+            for index, config, key in pending:
+                point_records = list(itertools.islice(records, num_games))
+                summary = summarize_point(config, point_records)
+                save_point(cache_dir, key, {'config': config, 'point': results[index]['point'], 'summary': summary})
+                results[index]['summary'] = summary
+        finally:
+            if executor is not None:
+                executor.shutdown()
+    return results
+
+def print_sweep(results):
+    for result in results:
+        point = ', '.join(f"{name}={value}" for name, value in result['point'].items())
+        summary = result['summary']
+        winrates = ' '.join(f"{strategy}:{rate:.0%}" for strategy, rate in summary['winrates'].items())
+        source = 'cached' if result['cached'] else 'new'
+        print(f"{point:50} {winrates:30} turns {summary['average_turns']:7.1f} unfinished {summary['unfinished']:3d}"
+              f" (stalemates {summary['stalemates']:3d}) [{source}]")
+
+if __name__ == "__main__":
+    grid = {
+        'rules.starting_money': [5, 10, 15],
+        'bot.income_threshold': [2, 3],
+    }
+    print_sweep(run_sweep(grid, num_games=20, seed=1))
@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+import adaptive
+import simulation
+from simulation import TournamentResult
+
+def make_result(wins):
+    result = TournamentResult(sorted(wins), 0, [])
+    for strategy, count in wins.items():
+        for _ in range(count):
+            result.add_game(0, strategy)
+    return result
+
+def test_confidence_sequence_narrows_and_contains_the_rate():
+    assert adaptive.confidence_sequence(0, 0) == (0.0, 1.0)
+    widths = []
+    for games in (50, 200, 1000):
+        low, high = adaptive.confidence_sequence(games // 4, games)
+        assert low <= 0.25 <= high
+        widths.append(high - low)
+    assert widths == sorted(widths, reverse=True)
+    # Anytime-valid intervals are wider than a fixed-sample one at the same confidence
+    assert widths[-1] / 2 > 1.96 * (0.25 * 0.75 / 1000) ** 0.5
+
+def test_best_strategy_rule():
+    with pytest.raises(ValueError):
+        adaptive.BestStrategyRule([3, 3])
+    rule = adaptive.BestStrategyRule([1, 2, 3, 4], confidence=0.95)
+    assert rule.get_error() == pytest.approx(0.05 / 3)
+    assert rule.check(make_result({1: 120, 2: 20, 3: 20, 4: 40}), 200) == {'best': 1}
+    # A clear leader over two strategies is not enough while the third is close
+    assert rule.check(make_result({1: 100, 2: 20, 3: 20, 4: 60}), 200) is None
+
+def test_best_strategy_rule_rarely_picks_among_equals():
+    rng = random.Random(0)
+    rule = adaptive.BestStrategyRule([1, 2, 3, 4])
+    false_decisions = 0
+    for _ in range(100):
+        result = TournamentResult([1, 2, 3, 4], 0, [])
+        for games in range(1, 401):
+            result.add_game(games, rng.choice([1, 2, 3, 4, None]))
+            if games >= 30 and rule.check(result, games):
+                false_decisions += 1
+                break
+    assert false_decisions <= 5
+
+def test_pair_rule():
+    with pytest.raises(ValueError):
+        adaptive.PairRule(2, 2)
+    rule = adaptive.PairRule(2, 4)
+    assert rule.check(make_result({2: 40, 4: 40}), 80) is None
+    assert rule.check(make_result({2: 80, 4: 40}), 120) == {'better': 2, 'worse': 4}
+    assert rule.check(make_result({2: 40, 4: 80}), 120) == {'better': 4, 'worse': 2}
+
+def test_pair_outside_the_lineup_is_rejected():
+    with pytest.raises(ValueError, match="not in the lineup"):
+        adaptive.run_adaptive_trials(10, [1, 2, 3, 4], adaptive.PairRule(2, 5), seed=1)
+    with pytest.raises(SystemExit):
+        simulation.main(['--until', 'pair', '--pair', '2,5', '-s', '1,2,3,4', '-n', '10'])
+
+def test_serial_and_parallel_runs_stop_after_the_same_game():
+    rule = adaptive.BestStrategyRule([3, 3, 3, 1])
+    serial = adaptive.run_adaptive_trials(60, [3, 3, 3, 1], rule, seed=4, min_games=10)
+    parallel = adaptive.run_adaptive_trials(60, [3, 3, 3, 1], rule, seed=4, workers=2, min_games=10)
+    assert serial['games'] == parallel['games'] <= 60
+    assert serial['decision'] == parallel['decision']
+    assert dict(serial['result'].wins) == dict(parallel['result'].wins)
+    assert parallel['games_played'] >= parallel['games']
+
+def test_parallel_run_uses_one_pool(monkeypatch):
+    pools = []
+    class CountingExecutor(adaptive.ProcessPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            pools.append(self)
+            super().__init__(*args, **kwargs)
+    monkeypatch.setattr(adaptive, 'ProcessPoolExecutor', CountingExecutor)
+    rule = adaptive.BestStrategyRule([3, 3, 3, 1])
+    report = adaptive.run_adaptive_trials(200, [3, 3, 3, 1], rule, seed=4, workers=2, min_games=10, batch_size=8)
+    assert len(pools) == 1
+    assert report['decision'] is not None
+    assert report['games'] <= report['games_played'] <= report['games'] + 8
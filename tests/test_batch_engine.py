@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from diceville_game import GameRules
+from batch_engine import BatchEngine, run_batch_trials, FLOOR_COUNT
+from simulation import run_trials, INCOME_THRESHOLD
+
+def test_seeded_batches_are_reproducible():
+    first = run_batch_trials(120, (1, 2, 3, 4), seed=4, batch_size=64)
+    second = run_batch_trials(120, (1, 2, 3, 4), seed=4, batch_size=64)
+    assert first.num_games == 120
+    assert dict(first.wins) == dict(second.wins)
+    assert dict(first.outcomes) == dict(second.outcomes)
+    assert sum(first.outcomes.values()) == 120
+
+def test_rule_constants_come_from_game_rules():
+    rules = GameRules(floor_prices={1: 3}, card_prices={1: 7}, starting_money=25, map_size=(12, 9))
+    engine = BatchEngine(4, rules=rules)
+    assert (engine.money == 25).all()
+    assert engine.map_size == (12, 9) and engine.cell_count == 108
+    assert engine.floor_prices[1] == 3 and engine.card_prices[1] == 7
+    assert engine.card_prices[0] == 0
+    assert BatchEngine(4, rules=rules, map_size=(10, 10)).map_size == (10, 10)
+
+def test_money_never_goes_negative():
+    # A large Mines income makes the clamp in the Mines branch matter
+    engine = BatchEngine(200, (1, 2, 3, 4), seed=8, rules=GameRules(mines_income=50))
+    for turn in range(400):
+        engine.play_turn((1 + turn) % engine.num_players)
+        assert (engine.money >= 0).all(), turn
+    assert np.isin(engine.floor_counts, range(1, FLOOR_COUNT + 1)).all()
+
+def test_winrates_match_object_engine():
+    # Both engines play the same rules, so on a fixed seed set the winrates agree within sampling noise
+    trials = run_trials(200, (1, 2, 3, 4), seed=11, verbose=False)
+    batch = run_batch_trials(2000, (1, 2, 3, 4), seed=11, batch_size=2000)
+    for strategy in (1, 2, 3, 4):
+        assert abs(trials.wins[strategy] / 200 - batch.wins[strategy] / 2000) < 0.1, strategy
+
+def test_income_threshold_comes_from_bot_options():
+    assert BatchEngine(4).income_threshold == INCOME_THRESHOLD
+    assert BatchEngine(4, bot_options={'income_threshold': 0}).income_threshold == 0
+    default = run_batch_trials(300, (1, 2, 3, 4), seed=5, batch_size=300)
+    eager = run_batch_trials(300, (1, 2, 3, 4), seed=5, batch_size=300, bot_options={'income_threshold': 0})
+    assert eager.wins[1] > default.wins[1]
+    with pytest.raises(ValueError):
+        BatchEngine(4, bot_options={'unknown': 1})
@@ -0,0 +1,32 @@
+import pytest
+
+import benchmarks
+
+def make_report(**results):
+    return {'meta': {}, 'results': results}
+
+def test_spread_is_median_over_best():
+    assert benchmarks.get_spread([1.0, 1.0, 1.0]) == 0
+    assert benchmarks.get_spread([1.0, 1.2, 5.0]) == pytest.approx(0.2)
+
+def test_compare_flags_drops_beyond_the_tolerance():
+    baseline = make_report(fast={'ops_per_sec': 1000.0, 'spread': 0.0}, slow={'ops_per_sec': 1000.0, 'spread': 0.0})
+    current = make_report(fast={'ops_per_sec': 800.0, 'spread': 0.0}, slow={'ops_per_sec': 500.0, 'spread': 0.0},
+                          new={'ops_per_sec': 1.0})
+    rows = {row[0]: row for row in benchmarks.compare(baseline, current, threshold=0.3)}
+    assert set(rows) == {'fast', 'slow'}  # entries missing from the baseline are skipped
+    assert not rows['fast'][-1]
+    assert rows['slow'][-1] and rows['slow'][4] == pytest.approx(-0.5)
+
+def test_noisy_entries_get_a_wider_tolerance():
+    baseline = make_report(noisy={'games_per_sec': 100.0, 'turns_per_sec': 1000.0, 'spread': 0.2})
+    current = make_report(noisy={'games_per_sec': 55.0, 'turns_per_sec': 550.0, 'spread': 0.1})
+    rows = benchmarks.compare(baseline, current, threshold=0.3)
+    assert [row[1] for row in rows] == ['games_per_sec', 'turns_per_sec']
+    assert all(row[5] == pytest.approx(0.6) and not row[-1] for row in rows)
+
+def test_lineup_benchmark_plays_the_same_turns_every_run():
+    first = benchmarks.benchmark_lineup((1, 2, 3, 4), 2, seed=1, repeats=2)
+    second = benchmarks.benchmark_lineup((1, 2, 3, 4), 2, seed=1, repeats=2)
+    assert first['turns'] == second['turns'] > 0
+    assert first['spread'] >= 0
@@ -0,0 +1,27 @@
+from diceville_game import BuildingsObjectStorage, MainBase, Casino, Mines
+
+def test_buildings_have_no_instance_dict():
+    storage = BuildingsObjectStorage()
+    for id in range(1, storage.get_buildings_count() + 1):
+        building = storage.get_building(id)
+        assert not hasattr(building, '__dict__'), type(building).__name__
+        assert building.id == id
+    assert not hasattr(MainBase(), '__dict__')
+    for floor in MainBase().floors:
+        assert not hasattr(floor, '__dict__'), type(floor).__name__
+
+def test_card_data_lives_on_the_class():
+    first, second = Casino(), Casino()
+    assert 'price' not in Casino.__slots__ and first.price == second.price == Casino.price
+    assert first.get_state() == second.get_state()
+    first.owner = 'someone'
+    assert second.owner is None
+
+def test_copy_keeps_mutable_slots_only():
+    mines = Mines()
+    mines.owner = 'owner'
+    mines.is_building_enabled = not mines.is_building_enabled
+    twin = mines.copy()
+    assert type(twin) is Mines and twin is not mines
+    assert twin.owner == 'owner' and twin.tile is None
+    assert twin.get_state() == mines.get_state()
@@ -0,0 +1,49 @@
+import random
+from collections import Counter
+
+from diceville_game import CardDeck
+from simulation import create_game
+
+def check_deck(deck):
+    # Every card id is either held (no copies in the pool) or has all its copies in the pool
+    pool = Counter(deck.pool)
+    for id, copies in deck.copies.items():
+        assert pool[id] == (0 if deck.held[id] else copies), id
+        assert sorted(deck.positions[id]) == sorted(i for i, card in enumerate(deck.pool) if card == id)
+
+def test_held_cards_leave_the_pool_until_released():
+    deck = CardDeck({1: 2, 2: 3, 3: 1}, random.Random(5))
+    assert deck.get_pool_size() == 6
+    drawn = [deck.draw() for _ in range(3)]
+    assert len(set(drawn)) == 3 and deck.get_pool_size() == 0 and deck.draw() is None
+    deck.take(drawn[0])  # a second copy in play
+    deck.release(drawn[0])
+    check_deck(deck)
+    assert deck.get_pool_size() == 0
+    deck.release(drawn[0])
+    deck.release(drawn[1])
+    check_deck(deck)
+    assert deck.get_pool_size() == deck.copies[drawn[0]] + deck.copies[drawn[1]]
+
+def test_deck_state_round_trip():
+    deck = CardDeck({id: 1 + id % 3 for id in range(1, 12)}, random.Random(2))
+    for _ in range(4):
+        deck.draw()
+    twin = CardDeck(deck.copies, random.Random(2), deck.get_state())
+    check_deck(twin)
+    deck.rng.seed(9)
+    twin.rng.seed(9)
+    assert [deck.draw() for _ in range(5)] == [twin.draw() for _ in range(5)]
+
+def test_hands_never_hold_a_card_twice():
+    game, bots = create_game(17, [1, 2, 3, 5])
+    for _ in range(300):
+        if game.is_game_over:
+            break
+        bots[game.game_moves_system.get_current_turn_player()].play_turn(game)
+        game.game_moves_system.make_turn()
+        for hand in game.player_hand_of_cards.values():
+            ids = [card.id for card in hand.hand if card is not None]
+            assert len(ids) == len(set(ids))
+            assert all(hand.deck.held[id] for id in ids)
+            check_deck(hand.deck)
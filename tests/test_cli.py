@@ -0,0 +1,34 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import simulation
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_headless_run_does_not_import_matplotlib():
+    code = ("import sys, simulation; simulation.main(['-n', '2', '--seed', '1', '-q']); "
+            "sys.exit('matplotlib' in sys.modules)")
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert "Сид турнира: 1" in result.stdout
+
+def test_module_entry_point():
+    result = subprocess.run([sys.executable, '-m', 'simulation', '-n', '2', '-s', '1,2,3,5', '--seed', '3', '-q'],
+                            cwd=ROOT, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert "Winrate" in result.stdout
+
+def test_plot_to_file(tmp_path, capsys, monkeypatch):
+    monkeypatch.setenv('MPLBACKEND', 'Agg')
+    pytest.importorskip('matplotlib')
+    path = tmp_path / "winrates.png"
+    assert simulation.main(['-n', '2', '--seed', '1', '-q', '--plot', str(path)]) == 0
+    assert path.stat().st_size > 0
+
+def test_output_file(tmp_path, capsys):
+    path = tmp_path / "games.csv"
+    assert simulation.main(['-n', '3', '--seed', '2', '-q', '-o', str(path)]) == 0
+    assert len(path.read_text().splitlines()) == 4
@@ -0,0 +1,86 @@
+import multiprocessing
+import socket
+import threading
+import time
+from collections import Counter
+from multiprocessing.connection import Client
+
+import pytest
+
+import cluster
+from simulation import play_games, make_game_seeds
+
+AUTHKEY = b'test-key'
+
+def get_free_address():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()
+
+def connect(address, attempts=100):
+    # The coordinator thread may not be listening yet
+    for _ in range(attempts):
+        try:
+            return Client(address, authkey=AUTHKEY)
+        except ConnectionRefusedError:
+            time.sleep(0.05)
+    raise ConnectionRefusedError(address)
+
+def run_in_thread(function, *args):
+    results = []
+    thread = threading.Thread(target=lambda: results.append(function(*args)), daemon=True)
+    thread.start()
+    return thread, results
+
+def test_cluster_records_match_play_games():
+    lineups = [(1, 2, 3, 4), (3, 3, 4, 4)]
+    report = cluster.run_cluster_trials(12, lineups, seed=7, address=get_free_address(), authkey=AUTHKEY,
+                                        local_workers=2, chunk_size=3)
+    game_seeds = make_game_seeds(12, 7)
+    assert report['records'] == [play_games(game_seeds, list(lineup)) for lineup in lineups]
+    for records, result in zip(report['records'], report['tournaments']):
+        assert dict(result.wins) == dict(Counter(r['winner'] for r in records if r['winner'] is not None))
+
+def test_games_of_a_lost_worker_are_reassigned():
+    game_seeds = make_game_seeds(6, 3)
+    coordinator = cluster.Coordinator([(1, 2, 3, 4)], game_seeds, chunk_size=3)
+    address = get_free_address()
+    thread, results = run_in_thread(coordinator.run, address, AUTHKEY)
+    conn = connect(address)
+    conn.send(('ready',))
+    assert conn.recv()[0] == 'task'
+    conn.close()  # the worker dies holding its task
+    assert cluster.run_worker(address, AUTHKEY) == 6
+    thread.join(10)
+    assert results[0] == [play_games(game_seeds, [1, 2, 3, 4])]
+    assert coordinator.reassigned == 3
+
+def test_a_wrong_key_cannot_join():
+    coordinator = cluster.Coordinator([(1, 2, 3, 4)], make_game_seeds(2, 1))
+    address = get_free_address()
+    thread, results = run_in_thread(coordinator.run, address, AUTHKEY)
+    with pytest.raises(multiprocessing.AuthenticationError):
+        cluster.run_worker(address, b'wrong-key')
+    cluster.run_worker(address, AUTHKEY)
+    thread.join(10)
+    assert results and all(record is not None for record in results[0][0])
+
+def test_an_authkey_is_required(monkeypatch, capsys):
+    monkeypatch.delenv(cluster.AUTHKEY_ENV, raising=False)
+    with pytest.raises(ValueError, match="authkey is required"):
+        cluster.run_cluster_trials(2, authkey=None)
+    with pytest.raises(ValueError, match="authkey is required"):
+        cluster.run_worker(('127.0.0.1', cluster.DEFAULT_PORT), b'')
+    with pytest.raises(SystemExit):
+        cluster.main(['coordinator', '-n', '2'])
+    assert cluster.AUTHKEY_ENV in capsys.readouterr().err
+    assert cluster.DEFAULT_BIND == '127.0.0.1'
+
+def test_empty_runs_return_at_once():
+    address = get_free_address()
+    report = cluster.run_cluster_trials(0, seed=1, address=address, authkey=AUTHKEY, local_workers=1)
+    assert report['records'] == [[]]
+    assert [result.num_games for result in report['tournaments']] == [0]
+    report = cluster.run_cluster_trials(5, [], seed=1, address=address, authkey=AUTHKEY, local_workers=1)
+    assert report['records'] == [] and report['tournaments'] == []
+    assert cluster.Coordinator([(1, 2, 3, 4)], []).run(address, AUTHKEY) == [[]]
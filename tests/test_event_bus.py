@@ -0,0 +1,46 @@
+from diceville_game import EventBus, GameEvent, Game
+
+def test_subscribing_twice_dispatches_once():
+    bus = EventBus()
+    calls = []
+    bus.subscribe(GameEvent.NEXT_TURN, calls.append)
+    bus.subscribe(GameEvent.NEXT_TURN, calls.append)
+    bus.dispatch(GameEvent.NEXT_TURN, 'turn')
+    assert calls == ['turn']
+    assert bus.is_subscribed(GameEvent.NEXT_TURN, calls.append)
+    assert not bus.is_subscribed(GameEvent.BUILDING_EFFECT, calls.append)
+
+def test_subscribers_keep_order_and_unsubscribe():
+    bus = EventBus()
+    calls = []
+    first, second = (lambda: calls.append(1)), (lambda: calls.append(2))
+    bus.subscribe(GameEvent.BUILDING_EFFECT, first)
+    bus.subscribe(GameEvent.BUILDING_EFFECT, second)
+    bus.dispatch(GameEvent.BUILDING_EFFECT)
+    bus.unsubscribe(GameEvent.BUILDING_EFFECT, first)
+    bus.unsubscribe(GameEvent.BUILDING_EFFECT, first)  # unknown callbacks are ignored
+    bus.dispatch(GameEvent.BUILDING_EFFECT)
+    assert calls == [1, 2, 2]
+    assert bus.get_subscribers(GameEvent.BUILDING_EFFECT) == (second,)
+
+def test_unsubscribing_during_dispatch_finishes_the_round():
+    # Dispatch walks a cached tuple, so a callback may unsubscribe itself safely
+    bus = EventBus()
+    calls = []
+    def once():
+        calls.append('once')
+        bus.unsubscribe(GameEvent.NEXT_TURN, once)
+    bus.subscribe(GameEvent.NEXT_TURN, once)
+    bus.subscribe(GameEvent.NEXT_TURN, lambda: calls.append('always'))
+    bus.dispatch(GameEvent.NEXT_TURN)
+    bus.dispatch(GameEvent.NEXT_TURN)
+    assert calls == ['once', 'always', 'always']
+
+def test_game_listeners_register_through_the_bus():
+    # The old list properties are gone, so appending to them fails instead of doing nothing
+    game = Game(num_players=2, seed=3)
+    assert not hasattr(game, 'on_next_turn') and not hasattr(game, 'on_buildings_effect')
+    turns = []
+    game.event_bus.subscribe(GameEvent.NEXT_TURN, turns.append)
+    game.game_moves_system.make_turn()
+    assert turns == [game]
@@ -0,0 +1,31 @@
+import random
+
+import evolution
+from simulation import Bot
+
+def test_mutated_genomes_stay_in_range():
+    rng = random.Random(1)
+    genome = evolution.random_genome(rng)
+    for _ in range(50):
+        genome = evolution.mutate(genome, rng, rate=1.0, scale=1.0)
+        assert all(low <= value <= high for (_, low, high), value in zip(evolution.GENES, genome))
+
+def test_policy_bot_orders_actions_by_weight():
+    genome = [0.9, 0.05, 0.5, 0.2, 3.0, 1.4, 12.0]
+    bot = evolution.PolicyBot(None, genome)
+    assert isinstance(bot, Bot)
+    assert bot.action_order == ['floor', 'tile', 'replace']  # build is below the minimum weight
+    assert bot.floor_after_action == 1 and bot.income_threshold == 3.0
+
+def test_candidates_play_every_seat():
+    tasks = evolution.make_tasks([[0.5] * len(evolution.GENES)], [11, 12, 13, 14, 15], (1, 3, 4))
+    assert [seat for _, _, seat, _ in tasks] == [0, 1, 2, 3, 0]
+
+def test_resumed_search_matches_an_uninterrupted_one(tmp_path, capsys):
+    options = {'population_size': 4, 'games_per_candidate': 3, 'seed': 2, 'workers': 1}
+    full = evolution.evolve(generations=2, **options)
+    checkpoint = str(tmp_path / "checkpoint.json")
+    evolution.evolve(generations=1, checkpoint=checkpoint, **options)
+    resumed = evolution.evolve(generations=2, checkpoint=checkpoint, resume=True, **options)
+    assert resumed == full
+    assert evolution.load_checkpoint(checkpoint)['generation'] == 1
@@ -0,0 +1,32 @@
+from fractions import Fraction
+
+import pytest
+
+import expected_value
+from benchmarks import make_mid_game
+
+def test_dice_tables_are_exact():
+    assert sum(expected_value.DICE_TABLES[1].values()) == 1
+    assert sum(expected_value.DICE_TABLES[2].values()) == 1
+    assert expected_value.DICE_TABLES[2][7] == Fraction(1, 6)
+    assert expected_value.get_range_probability(1, 5, 6) == Fraction(1, 3)
+    assert expected_value.get_range_probability(2, 2, 3) == Fraction(1, 12)
+    assert expected_value.get_range_probability(1, 7, 12) == 0
+
+@pytest.mark.parametrize('seed', [3, 5])
+@pytest.mark.parametrize('num_dice', [1, 2])
+def test_analytic_income_matches_sampled_rolls(seed, num_dice):
+    game = make_mid_game(seed=seed, turns=120)
+    # Enough money for every transfer, so the zero-money floor does not cut red income
+    for player in game.players:
+        game.player_money[player] += 1000
+    for player, (analytic, simulated) in expected_value.cross_check(game, 2000, num_dice, seed=1).items():
+        assert analytic == pytest.approx(simulated, abs=0.2), player
+
+def test_round_income_sums_every_roller():
+    game = make_mid_game(seed=3, turns=120)
+    context = expected_value.IncomeContext(game)
+    per_round = context.get_expected_income_per_round()
+    for player in game.players:
+        assert per_round[player] == pytest.approx(sum(context.get_expected_income_for_roll(roller)[player]
+                                                      for roller in game.players))
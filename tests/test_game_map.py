@@ -0,0 +1,29 @@
+import random
+
+import pytest
+
+from diceville_game import GameMap, GameRules, Player, SurfaceType
+from simulation import create_game
+
+def test_tile_views_share_the_map_arrays():
+    game_map = GameMap((7, 5), random.Random(1))
+    tile = game_map.map[3][4]
+    assert tile is game_map.get_tile((3, 4)) is game_map.get_tile_by_index(game_map.get_index((3, 4)))
+    assert game_map.get_position(tile.index) == (3, 4)
+    tile.owner = Player.ENEMY2
+    tile.surface = SurfaceType.WATER
+    assert game_map.get_owner((3, 4)) == Player.ENEMY2
+    assert game_map.get_surface((3, 4)) == SurfaceType.WATER
+    assert not game_map.is_tile_free((3, 4))
+    assert len(game_map.map) == 7 and len(game_map.map[0]) == 5
+    assert game_map.map[-1][-1].position == (6, 4)
+    with pytest.raises(IndexError):
+        game_map.map[7]
+
+def test_large_map_only_creates_the_tiles_it_touches():
+    game, bots = create_game(3, [1, 2, 3, 4], rules=GameRules(map_size=(400, 400)))
+    for _ in range(40):
+        bots[game.game_moves_system.get_current_turn_player()].play_turn(game)
+        game.game_moves_system.make_turn()
+    assert len(game.game_map.surfaces) == 400 * 400
+    assert len(game.game_map.tiles) < 1000
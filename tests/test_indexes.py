@@ -0,0 +1,83 @@
+from collections import Counter, defaultdict
+
+from diceville_game import BuildingType, FloorLeaderboard, MainBase, SurfaceType
+from simulation import create_game
+
+# The engine keeps incremental indexes next to the plain lists it had before;
+# after any number of turns they must match a rebuild from those lists.
+def iter_game_states(seeds=range(6), strategies=(1, 2, 3, 5), max_turns=400, every=25):
+    for seed in seeds:
+        game, bots = create_game(seed, list(strategies))
+        for turn in range(max_turns):
+            if game.is_game_over:
+                break
+            bots[game.game_moves_system.get_current_turn_player()].play_turn(game)
+            game.game_moves_system.make_turn()
+            if turn % every == 0:
+                yield game
+        yield game
+
+def test_buildings_by_dice_value_matches_built_buildings():
+    for game in iter_game_states():
+        expected = defaultdict(list)
+        for pb in game.player_buildings:
+            building = pb['building']
+            if building.type == BuildingType.MAIN_BASE:
+                continue  # the main base is invoked on every roll, not through the index
+            for dice_value in range(building.min_dice_value, building.max_dice_value + 1):
+                expected[(building.type, dice_value, pb['player'])].append(building)
+        assert {key: built for key, built in game.buildings_by_dice_value.items() if built} == dict(expected)
+
+def test_player_registry_matches_building_and_tile_lists():
+    for game in iter_game_states():
+        registry = game.player_registry
+        for player in game.players:
+            assert registry.buildings[player] == [pb['building'] for pb in game.player_buildings if pb['player'] == player]
+            assert isinstance(registry.main_bases[player], MainBase)
+            tiles = [pt['tile'].index for pt in game.player_tiles if pt['player'] == player]
+            assert [tile.index for tile in registry.tiles[player]] == tiles
+            free = [index for index in tiles if game.game_map.get_tile_by_index(index).building is None]
+            assert [tile.index for tile in registry.free_tiles[player]] == free
+
+def test_purchasable_frontier_matches_a_map_scan():
+    for game in iter_game_states():
+        game_map = game.game_map
+        width, height = game_map.size
+        for player in game.players:
+            owned = {pt['tile'].position for pt in game.player_tiles if pt['player'] == player}
+            expected = sorted((x, y) for x in range(width) for y in range(height)
+                              if game_map.is_tile_free((x, y)) and
+                              any(n in owned for n in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1))))
+            assert game.get_all_purchasable_tile_positions_for_player(player) == expected
+            free = game.get_all_available_for_build_map_tiles_for_player(player)
+            for surface, bucket in game.player_registry.free_tiles_by_surface[player].items():
+                assert list(bucket) == [tile for tile in free if tile.surface == surface]
+
+def test_surface_counts_match_owned_tiles():
+    for game in iter_game_states():
+        for player in game.players:
+            owned = Counter(pt['tile'].surface for pt in game.player_tiles if pt['player'] == player)
+            for surface in SurfaceType:
+                assert game.get_count_of_map_tiles_for_player_with_surface(player, surface) == owned[surface]
+
+def test_floor_leaderboard_matches_main_bases():
+    for game in iter_game_states():
+        counts = {p: game.get_main_building_for_player(p).get_count_of_activated_floors() for p in game.players}
+        assert {p: game.floor_leaderboard.get_floor_count(p) for p in game.players} == counts
+        assert set(game.floor_leaderboard.get_richest_players()) == {p for p in counts if counts[p] == max(counts.values())}
+        assert set(game.floor_leaderboard.get_poorest_players()) == {p for p in counts if counts[p] == min(counts.values())}
+        assert all(game.is_player_most_rich(p) == (counts[p] == max(counts.values())) for p in game.players)
+        if game.is_game_over:
+            assert counts[game.get_winner()] == len(game.get_main_building_for_player(game.get_winner()).floors)
+
+def test_floor_leaderboard_bounds():
+    leaderboard = FloorLeaderboard(['a', 'b', 'c'], 3)
+    leaderboard.set_floor_count('a', 1)
+    leaderboard.set_floor_count('b', 2)
+    assert leaderboard.get_richest_players() == ['b'] and leaderboard.get_poorest_players() == ['c']
+    leaderboard.set_floor_count('b', 0)
+    assert leaderboard.get_richest_players() == ['a'] and set(leaderboard.get_poorest_players()) == {'b', 'c'}
+    leaderboard.set_floor_count('c', 3)
+    assert leaderboard.winner == 'c'
+    leaderboard.set_floor_count('a', 3)
+    assert leaderboard.winner == 'c'
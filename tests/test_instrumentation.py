@@ -0,0 +1,29 @@
+from instrumentation import Instrumentation, Profile, play_profiled_game, profile_tournament
+from simulation import create_game, play_game
+
+def test_profiled_game_plays_the_same_game():
+    record, profile = play_profiled_game(5, [1, 2, 3, 4])
+    assert record == play_game(5, [1, 2, 3, 4])
+    assert profile['game']['calls'] == 1
+    assert profile['make_turn']['calls'] == record['turns']
+    assert profile['throw_dice']['calls'] == record['turns']
+    assert profile['bot/play_turn']['seconds'] <= profile['game']['seconds']
+
+def test_detach_restores_the_plain_methods():
+    game, bots = create_game(1, [1, 2, 3, 4])
+    instrumentation = Instrumentation()
+    instrumentation.attach_game(game)
+    instrumentation.attach_game(game)  # attaching twice does not wrap twice
+    assert 'player_throw_dice' in vars(game)
+    game.player_throw_dice()
+    assert instrumentation.profile.calls['throw_dice'] == 1
+    instrumentation.detach()
+    assert 'player_throw_dice' not in vars(game)
+    game.player_throw_dice()
+    assert instrumentation.profile.calls['throw_dice'] == 1
+
+def test_profiles_merge_across_games():
+    report = profile_tournament(3, seed=2, per_game=True)
+    total = Profile.from_dict(report['total'])
+    assert total.calls['game'] == 3
+    assert sum(game['turns'] for game in report['games']) == total.calls['make_turn']
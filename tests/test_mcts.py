@@ -0,0 +1,61 @@
+import random
+import time
+
+import pytest
+
+import mcts
+from simulation import create_game, play_game
+
+def get_mid_game(seed=2, turns=30):
+    game, bots = create_game(seed, [1, 2, 3, 4])
+    for _ in range(turns):
+        bots[game.game_moves_system.get_current_turn_player()].play_turn(game)
+        game.game_moves_system.make_turn()
+    game.player_throw_dice()
+    return game
+
+def test_every_legal_action_can_be_played():
+    game = get_mid_game()
+    player = game.game_moves_system.get_current_turn_player()
+    game.player_money[player] += 50  # afford floors, cards and tiles
+    actions = mcts.get_legal_actions(game, player)
+    assert actions[0] == mcts.END_TURN and len(actions) > 1
+    for action in actions[1:]:
+        assert mcts.apply_action(game.clone(), player, action), action
+    assert not mcts.apply_action(game.clone(), player, mcts.END_TURN)
+
+def test_search_leaves_the_game_untouched_and_is_seeded():
+    game = get_mid_game()
+    player = game.game_moves_system.get_current_turn_player()
+    money = dict(game.player_money)
+    first = mcts.choose_action(game, player, random.Random(3), rollouts=16)
+    assert game.player_money == money
+    assert mcts.choose_action(game, player, random.Random(3), rollouts=16) == first
+    assert first in mcts.get_legal_actions(game, player)
+
+def test_mcts_games_are_reproducible():
+    options = {'rollouts': 8}
+    assert play_game(1, [6, 1, 3, 4], options) == play_game(1, [6, 1, 3, 4], options)
+
+def test_time_budget_alone_bounds_the_search():
+    game = get_mid_game()
+    player = game.game_moves_system.get_current_turn_player()
+    snapshot = game.snapshot()
+    with pytest.raises(ValueError):
+        mcts.search(snapshot, player, 1, rollouts=None)
+    start = time.perf_counter()
+    stats = mcts.search(snapshot, player, 1, rollouts=None, time_budget=0.2)
+    assert time.perf_counter() - start < 2
+    assert sum(visits for visits, _ in stats.values()) > 0
+
+def test_parallel_search_pool_is_shut_down():
+    game = get_mid_game()
+    player = game.game_moves_system.get_current_turn_player()
+    try:
+        action = mcts.choose_action(game, player, random.Random(3), rollouts=None, time_budget=0.05, workers=2)
+        assert action in mcts.get_legal_actions(game, player)
+        assert mcts._executor is not None
+    finally:
+        mcts.shutdown_executor()
+    assert mcts._executor is None
+    mcts.shutdown_executor()  # a second call is harmless
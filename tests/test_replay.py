@@ -0,0 +1,54 @@
+import pytest
+
+import replay
+from diceville_game import Game, GameRules
+from simulation import create_game, play_to_end, make_game_seeds, play_game
+
+def record_game(game_seed, strategies=(1, 2, 3, 4), rules=None):
+    game, bots = create_game(game_seed, list(strategies), rules=rules)
+    recorder = replay.Recorder(game)
+    record = play_to_end(game, bots)
+    return game, record, recorder.get_bytes()
+
+def test_replay_reproduces_recorded_games():
+    for game_seed in make_game_seeds(5, 2):
+        game, record, data = record_game(game_seed, (1, 2, 3, 5))
+        report = replay.replay_game(data)
+        assert report['matches'], report['expected']
+        assert report['turns'] == record['turns']
+        assert report['game'].player_money == game.player_money
+
+def test_large_map_round_trip():
+    game, record, data = record_game(7, rules=GameRules(map_size=(300, 300)))
+    assert replay.read_header(data)['map_size'] == (300, 300)
+    assert replay.replay_game(data)['matches']
+
+def test_tampered_log_reports_the_first_mismatch():
+    game, record, data = record_game(4)
+    events = list(replay.iter_events(data))
+    index = next(i for i, event in enumerate(events) if event[0] == replay.DICE)
+    kind, seat, a, b = events[index]
+    offset = replay.HEADER.size + index * replay.EVENT.size
+    tampered = data[:offset] + replay.EVENT.pack(kind, seat, a % 6 + 1, b) + data[offset + replay.EVENT.size:]
+    report = replay.replay_game(tampered)
+    assert not report['matches'] and report['first_mismatch'] == index
+
+def test_header_checks():
+    with pytest.raises(ValueError, match="not a replay log"):
+        replay.read_header(b'nope')
+    old = replay.HEADER.pack(replay.MAGIC, 1, 4, 10, 10, 0)
+    with pytest.raises(ValueError, match="unsupported replay log version 1"):
+        replay.read_header(old)
+
+def test_values_that_do_not_fit_raise():
+    game = Game(num_players=2, seed=1)
+    recorder = replay.Recorder(game)
+    with pytest.raises(ValueError, match="does not fit"):
+        recorder.emit(replay.MONEY, game.players[0], 0, 2 ** 40)
+    with pytest.raises(ValueError, match="tiles a side"):
+        replay.Recorder(Game(num_players=2, map_size=(replay.MAX_MAP_SIDE + 1, 4), seed=1))
+
+def test_play_game_writes_replay_files(tmp_path):
+    record = play_game(11, [1, 2, 3, 4], replay_dir=str(tmp_path))
+    report = replay.replay_game(replay.load(str(tmp_path / "11.dvr")))
+    assert report['matches'] and report['turns'] == record['turns']
@@ -0,0 +1,62 @@
+import pytest
+
+from results import ResultsWriter, iter_records, read_results, summarize_results
+from simulation import play_games, make_game_seeds, run_trials
+
+@pytest.fixture(scope='module')
+def records():
+    # Two games that end without a winner cover the optional fields
+    records = play_games(make_game_seeds(6, 3), [1, 2, 3, 4])
+    unfinished = dict(records[0], winner=None, winner_seat=None, outcome='timeout', turns=10000)
+    stalled = dict(records[1], winner=None, winner_seat=None, outcome='stalemate', turns_saved=9000)
+    return records + [unfinished, stalled]
+
+@pytest.mark.parametrize('suffix', ['jsonl', 'csv'])
+def test_round_trip(tmp_path, records, suffix):
+    path = str(tmp_path / f"games.{suffix}")
+    with ResultsWriter(path, batch_size=3) as writer:
+        for record in records[:5]:
+            writer.write(record)
+    with ResultsWriter(path) as writer:  # reopening appends
+        for record in records[5:]:
+            writer.write(record)
+    assert list(iter_records(path)) == records
+    chunks = list(read_results(path, chunk_size=3))
+    assert [len(chunk) for chunk in chunks] == [3, 3, 2]
+
+def test_summary(tmp_path, records):
+    path = str(tmp_path / "games.csv")
+    with ResultsWriter(path) as writer:
+        for record in records:
+            writer.write(record)
+    summary = summarize_results(path, chunk_size=2)
+    assert summary['num_games'] == len(records)
+    assert sum(summary['wins'].values()) == len(records) - 2
+    assert summary['outcomes'] == {'win': len(records) - 2, 'timeout': 1, 'stalemate': 1}
+    assert summary['turns_saved'] == 9000
+    assert summary['average_turns'] == pytest.approx(sum(r['turns'] for r in records) / len(records))
+
+def test_legacy_records_get_an_outcome(tmp_path):
+    path = tmp_path / "old.jsonl"
+    path.write_text('{"seed": 1, "winner": 2, "turns": 50}\n{"seed": 2, "winner": null, "turns": 10000}\n')
+    assert summarize_results(str(path))['outcomes'] == {'win': 1, 'timeout': 1}
+
+def test_run_trials_streams_to_a_file(tmp_path):
+    path = str(tmp_path / "games.jsonl")
+    result = run_trials(4, seed=9, output=path, verbose=False)
+    assert result.game_winners == []  # not kept in memory
+    assert summarize_results(path)['wins'] == dict(result.wins)
+
+def test_appending_to_a_different_csv_layout_fails(tmp_path, records):
+    path = str(tmp_path / "games.csv")
+    with ResultsWriter(path) as writer:
+        writer.write(records[0])
+    five_seats = dict(records[1], strategies=[1, 2, 3, 4, 5], money=[0] * 5, floors=[1] * 5)
+    with ResultsWriter(path) as writer:
+        with pytest.raises(ValueError, match="header"):
+            writer.write(five_seats)
+    (tmp_path / "other.csv").write_text("seed,winner\n1,2\n")
+    with ResultsWriter(str(tmp_path / "other.csv")) as writer:
+        with pytest.raises(ValueError, match="header"):
+            writer.write(records[0])
+    assert list(iter_records(path)) == records[:1]
@@ -0,0 +1,29 @@
+from diceville_game import Game, SeedStream
+from simulation import play_game, make_game_seeds
+
+# Games pinned by seed: engine refactors must not change how a seeded game plays out
+PINNED_GAMES = [
+    (0, [1, 2, 3, 5], 525, [2, 0, 1, 1], [3, 7, 3, 2]),
+    (1, [1, 2, 3, 4], 122, [2, 2, 8, 2], [3, 3, 7, 3]),
+    (2, [1, 2, 3, 5], 98, [0, 2, 10, 11], [2, 3, 7, 6]),
+    (3, [1, 2, 3, 4], 158, [1, 4, 25, 10], [3, 3, 7, 4]),
+]
+
+def test_seed_stream_is_deterministic_and_keyed():
+    stream = SeedStream(42)
+    assert stream.derive_seed('dice') == SeedStream(42).derive_seed('dice')
+    assert stream.derive_seed('dice') != stream.derive_seed('map')
+    assert stream.child('bot').rng('RED').random() == SeedStream(42).child('bot').rng('RED').random()
+    assert make_game_seeds(5, 7) == make_game_seeds(5, 7)
+    assert make_game_seeds(5, 7) != make_game_seeds(5, 8)
+
+def test_same_seed_same_game():
+    first = Game(num_players=4, seed=123)
+    second = Game(num_players=4, seed=123)
+    assert first.game_map.get_state() == second.game_map.get_state()
+    assert play_game(99, [1, 2, 3, 4]) == play_game(99, [1, 2, 3, 4])
+
+def test_pinned_games():
+    for seed, strategies, turns, money, floors in PINNED_GAMES:
+        record = play_game(seed, strategies)
+        assert (record['turns'], record['money'], record['floors']) == (turns, money, floors), seed
@@ -0,0 +1,74 @@
+import pickle
+
+from diceville_game import Game
+from simulation import create_game
+
+def play(game, bots, max_turns=10000):
+    turns = 0
+    while not game.is_game_over and turns < max_turns:
+        bots[game.game_moves_system.get_current_turn_player()].play_turn(game)
+        game.game_moves_system.make_turn()
+        turns += 1
+    return turns, dict(game.player_money), game.get_winner()
+
+def get_state(game):
+    registry = game.player_registry
+    return (dict(game.player_money),
+            game.game_map.get_state(),
+            registry.get_state(),
+            [(b.id, b.owner, b.tile.index if b.tile is not None else None, b.get_state()) for b in game.get_all_buildings()],
+            {key: [b.id for b in built] for key, built in game.buildings_by_dice_value.items() if built},
+            {p: [card.id if card else None for card in hand.hand] for p, hand in game.player_hand_of_cards.items()},
+            {p: hand.deck.get_state() for p, hand in game.player_hand_of_cards.items()},
+            {p: game.floor_leaderboard.get_floor_count(p) for p in game.players})
+
+def start_game(seed, turns):
+    game, bots = create_game(seed, [1 + (seed + i) % 5 for i in range(4)])
+    play(game, bots, turns)
+    return game, bots
+
+def replay_from(game, bots, bot_states):
+    for player, bot in bots.items():
+        bot.rng.setstate(bot_states[player])
+    return play(game, bots)
+
+def test_restore_and_clone_play_out_like_the_original():
+    for seed in range(8):
+        game, bots = start_game(seed, 20 + 7 * seed)
+        bot_states = {p: bot.rng.getstate() for p, bot in bots.items()}
+        snapshot = pickle.loads(pickle.dumps(game.snapshot()))
+        restored = Game.__new__(Game)
+        restored.restore(snapshot)
+        clone = game.clone()
+        assert get_state(restored) == get_state(game) == get_state(clone)
+        original = replay_from(game, bots, bot_states)
+        assert replay_from(restored, bots, bot_states) == original, seed
+        assert replay_from(clone, bots, bot_states) == original, seed
+
+def test_restore_in_place_reuses_objects():
+    game, bots = start_game(4, 60)
+    bot_states = {p: bot.rng.getstate() for p, bot in bots.items()}
+    snapshot = game.snapshot()
+    copy = game.clone()
+    game_map, hands = copy.game_map, dict(copy.player_hand_of_cards)
+    main_bases = [copy.get_main_building_for_player(p) for p in copy.players]
+    play(copy, bots, 50)  # move the copy away from the snapshot
+    copy.restore(snapshot)
+    assert copy.game_map is game_map
+    assert copy.player_hand_of_cards == hands
+    assert [copy.get_main_building_for_player(p) for p in copy.players] == main_bases
+    assert get_state(copy) == get_state(game)
+    first = replay_from(copy, bots, bot_states)
+    copy.restore(snapshot)
+    assert replay_from(copy, bots, bot_states) == first == replay_from(game, bots, bot_states)
+
+def test_seeded_restore_is_reproducible():
+    game, bots = start_game(6, 45)
+    bot_states = {p: bot.rng.getstate() for p, bot in bots.items()}
+    snapshot = game.snapshot()
+    fresh = Game.__new__(Game)
+    fresh.restore(snapshot, 99)
+    first = replay_from(fresh, bots, bot_states)
+    fresh.restore(snapshot, 99)
+    assert replay_from(fresh, bots, bot_states) == first
+    assert replay_from(game.clone(99), bots, bot_states) == first
@@ -0,0 +1,39 @@
+from batch_engine import run_batch_trials
+from simulation import (create_game, play_to_end, play_game, make_game_seeds, run_trials, MAX_TURNS,
+                        OUTCOME_WIN, OUTCOME_STALEMATE, OUTCOME_TIMEOUT)
+
+STALLED_SEED = 6  # with strategies 1, 2, 3, 4 nobody can move after a few rounds
+
+def play(game_seed, strategies, **options):
+    game, bots = create_game(game_seed, strategies)
+    return play_to_end(game, bots, **options)
+
+def test_stalled_game_is_stopped_early():
+    record = play_game(STALLED_SEED, [1, 2, 3, 4])
+    assert record['outcome'] == OUTCOME_STALEMATE and record['winner'] is None
+    assert record['turns'] < 100
+    assert record['turns_saved'] == MAX_TURNS - record['turns']
+    # Without the detector the same game runs into the turn cap
+    undetected = play(STALLED_SEED, [1, 2, 3, 4], max_turns=1500, stalemate_rounds=None)
+    assert undetected['outcome'] == OUTCOME_TIMEOUT and undetected['winner'] is None
+    assert undetected['money'] == record['money'] and undetected['floors'] == record['floors']
+
+def test_detection_never_cuts_a_game_that_would_be_won():
+    for game_seed in make_game_seeds(30, 12):
+        detected = play(game_seed, [1, 2, 3, 4], max_turns=1500)
+        undetected = play(game_seed, [1, 2, 3, 4], max_turns=1500, stalemate_rounds=None)
+        assert detected['winner'] == undetected['winner'], game_seed
+        if detected['outcome'] == OUTCOME_WIN:
+            assert detected == undetected
+
+def test_outcomes_are_counted():
+    result = run_trials(12, seed=3, verbose=False)
+    assert sum(result.outcomes.values()) == 12
+    assert result.outcomes[OUTCOME_WIN] == sum(result.wins.values())
+    assert result.turns_saved == 0 or result.outcomes[OUTCOME_STALEMATE] > 0
+
+def test_batch_engine_reports_outcomes():
+    result = run_batch_trials(120, (1, 2, 3, 4), seed=4, batch_size=64)
+    assert result.outcomes[OUTCOME_STALEMATE] > 0
+    assert result.outcomes[OUTCOME_WIN] == sum(result.wins.values())
+    assert result.turns_saved > 0
@@ -0,0 +1,48 @@
+import os
+
+import pytest
+
+import sweep
+
+def test_grid_expands_to_every_combination():
+    points = sweep.expand_grid({'rules.starting_money': [5, 10], 'bot.income_threshold': [2, 3, 4]})
+    assert len(points) == 6
+    assert {'bot.income_threshold': 2, 'rules.starting_money': 5} in points
+
+def test_cache_key_is_stable():
+    point = {'rules.starting_money': 5, 'rules.card_prices.3': 4, 'strategies': (1, 2, 3, 5)}
+    key = sweep.get_config_key(sweep.make_point_config(point, 20, 1))
+    reordered = dict(reversed(list(point.items())))
+    assert sweep.get_config_key(sweep.make_point_config(reordered, 20, 1)) == key
+    assert sweep.get_config_key(sweep.make_point_config(point, 21, 1)) != key
+    assert sweep.get_config_key(sweep.make_point_config(point, 20, 2)) != key
+    assert sweep.get_config_key(sweep.make_point_config(dict(point, **{'rules.starting_money': 6}), 20, 1)) != key
+
+def test_defaults_spelled_out_share_a_key():
+    # Rules are keyed by their differences from the defaults
+    config = sweep.make_point_config({}, 20, 1)
+    default_price = sweep.GameRules().card_prices[1]
+    explicit = sweep.make_point_config({'rules.starting_money': 10, 'rules.card_prices.1': default_price}, 20, 1)
+    assert sweep.get_config_key(explicit) == sweep.get_config_key(config)
+
+def test_unknown_parameters_are_rejected():
+    with pytest.raises(ValueError, match="unknown sweep parameter"):
+        sweep.make_point_config({'rule.starting_money': 5}, 20, 1)
+
+def test_points_need_games(tmp_path):
+    with pytest.raises(ValueError, match="at least one game"):
+        sweep.make_point_config({}, 0, 1)
+    with pytest.raises(ValueError, match="at least one game"):
+        sweep.run_sweep({'rules.starting_money': [5]}, num_games=0, cache_dir=str(tmp_path), workers=1)
+    assert os.listdir(tmp_path) == []
+
+def test_points_are_cached(tmp_path):
+    grid = {'rules.starting_money': [5, 15]}
+    first = sweep.run_sweep(grid, num_games=4, seed=3, cache_dir=str(tmp_path), workers=1)
+    assert not any(point['cached'] for point in first)
+    assert len(os.listdir(tmp_path)) == 2
+    second = sweep.run_sweep(dict(grid, **{'rules.starting_money': [5, 15, 25]}), num_games=4, seed=3,
+                             cache_dir=str(tmp_path), workers=1)
+    assert [point['cached'] for point in second] == [True, True, False]
+    assert [point['summary'] for point in second[:2]] == [point['summary'] for point in first]
+    assert sum(second[2]['summary']['seat_wins']) + second[2]['summary']['unfinished'] == 4
@@ -0,0 +1,19 @@
+from simulation import run_trials, play_games, make_game_seeds
+
+def test_process_pool_gives_the_same_tournament():
+    serial = run_trials(12, (1, 2, 3, 4), seed=5, workers=1, verbose=False)
+    parallel = run_trials(12, (1, 2, 3, 4), seed=5, workers=2, chunk_size=2, verbose=False)
+    assert parallel.game_seeds == serial.game_seeds
+    assert parallel.game_winners == serial.game_winners
+    assert dict(parallel.wins) == dict(serial.wins)
+
+def test_records_come_back_in_seed_order():
+    game_seeds = make_game_seeds(8, 11)
+    records = play_games(game_seeds, [1, 2, 3, 5], workers=2, chunk_size=1)
+    assert [record['seed'] for record in records] == game_seeds
+    assert records == play_games(game_seeds, [1, 2, 3, 5])
+
+def test_games_print_nothing(capsys):
+    records = play_games(make_game_seeds(3, 2), (1, 2, 3, 4))
+    assert any(record['outcome'] == 'win' for record in records)
+    assert capsys.readouterr().out == ""